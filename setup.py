@@ -14,5 +14,6 @@ setuptools.setup(
 	url="https://www.github.com/charon25/ShuntingYard",
 	license="MIT",
 	packages=['shunting_yard'],
+	extras_require={'numpy': ['numpy']},
 	download_url="https://github.com/charon25/ShuntingYard/archive/refs/tags/v1.0.12.tar.gz"
 )
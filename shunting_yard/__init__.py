@@ -1,19 +1,95 @@
-from typing import Optional
+from importlib import import_module
+from typing import Any, Mapping, Optional, Sequence, Union
 
-from shunting_yard.rpn import compute_rpn, FunctionDictionary, Number, WrongExpressionError
-from shunting_yard.shunting_yard import MismatchedBracketsError, shunting_yard
+from shunting_yard.cache import clear_parse_cache, parse_cache_info, set_parse_cache_size
+from shunting_yard.program import NumberType, RPNProgram
+from shunting_yard.profiling import profile, ProfileCollector, ProfileHook, set_profile_hook
+from shunting_yard.registry import FunctionRegistry, VARIADIC
+from shunting_yard.rpn import as_registry, Bindings, BUILTIN_FUNCTIONS, compute_rpn, FunctionDictionary, Functions, Number, WrongExpressionError
+from shunting_yard.shunting_yard import bound_names, lowercase_bindings, MismatchedBracketsError, shunting_yard
 from shunting_yard.tokenize import tokenize
 
 
-def compute(expression: str, case_sensitive: bool = True, additional_functions: Optional[FunctionDictionary] = None) -> Number:
-    """Compute the value of a mathematical expression. Equivalent to compute_rpn(shunting_yard(expression), additional_functions).
+# Names imported from their module the first time they are used, so that importing the package only imports the parsing and the computation
+_LAZY_NAMES = {
+    'DERIVATIVES': 'shunting_yard.autodiff',
+    'DerivativeRule': 'shunting_yard.autodiff',
+    'DifferentiableExpression': 'shunting_yard.autodiff',
+    'gradient': 'shunting_yard.autodiff',
+    'AsyncExpression': 'shunting_yard.asynchronous',
+    'compute_async': 'shunting_yard.asynchronous',
+    'compute_rpn_async': 'shunting_yard.asynchronous',
+    'BatchResult': 'shunting_yard.batch',
+    'compute_many': 'shunting_yard.batch',
+    'WorkerError': 'shunting_yard.batch',
+    'to_python_function': 'shunting_yard.codegen',
+    'to_python_source': 'shunting_yard.codegen',
+    'parse': 'shunting_yard.incremental',
+    'ParseState': 'shunting_yard.incremental',
+    'compile': 'shunting_yard.compiler',
+    'CompiledExpression': 'shunting_yard.compiler',
+    'CompiledBundle': 'shunting_yard.compiler',
+    'compile_many': 'shunting_yard.compiler',
+    'optimize': 'shunting_yard.optimizer',
+    'ProgramCache': 'shunting_yard.program_cache',
+    'ProgramCacheError': 'shunting_yard.program_cache',
+    'shunting_yard_stream': 'shunting_yard.stream',
+    'tokenize_stream': 'shunting_yard.stream',
+    'build_tree': 'shunting_yard.tree',
+    'ExpressionTree': 'shunting_yard.tree',
+    'Node': 'shunting_yard.tree',
+    'ReactiveExpression': 'shunting_yard.tree',
+    'TreeBuilder': 'shunting_yard.tree',
+    'compute_rpn_array': 'shunting_yard.vectorize',
+    'Problem': 'shunting_yard.validation',
+    'validate': 'shunting_yard.validation',
+}
+
+__all__ = [
+    'clear_parse_cache', 'parse_cache_info', 'set_parse_cache_size', 'NumberType', 'RPNProgram', 'profile', 'ProfileCollector', 'ProfileHook', 'set_profile_hook',
+    'FunctionRegistry', 'VARIADIC', 'as_registry', 'Bindings', 'BUILTIN_FUNCTIONS', 'compute_rpn', 'FunctionDictionary', 'Functions', 'Number',
+    'WrongExpressionError', 'MismatchedBracketsError', 'shunting_yard', 'tokenize', 'compute',
+    # compile and parse would shadow the builtin compile and commonly used names, so they are only available as attributes
+    *(name for name in _LAZY_NAMES if name not in ('compile', 'parse')),
+]
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_NAMES.get(name)
+    if module is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = globals()[name] = getattr(import_module(module), name)
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()).union(_LAZY_NAMES))
+
+
+def compute(expression: str, case_sensitive: bool = True, additional_functions: Optional[Functions] = None,
+            variables: Optional[Union[Bindings, Sequence[Bindings]]] = None, scientific_literals: bool = False, number_type: NumberType = float) -> Union[Number, list[Number]]:
+    """Compute the value of a mathematical expression. Equivalent to compute_rpn(shunting_yard(expression, variable=..., functions=additional_functions), additional_functions, variables).
     Check the docstring of these functions for more details.
 
     Args:
         string (str): string containing the mathematical expression to compute.
         case_sensitive (bool): indicates whether the expression should care about case.
+        variables (Bindings | Sequence[Bindings], optional): value of each variable, or sequence of such values to compute the expression for each of them.
+        The expression is only parsed once in that case.
+        scientific_literals (bool, optional): indicates whether the numbers in scientific notation should be converted once into exactly the number
+        they write, instead of multiplications by a power of 10 (default: False).
+        number_type (type, optional): type of the numbers with a dot or an exponent : float, or Decimal or Fraction for exact arithmetic (default: float).
+        The constants pi and e are converted into it too.
 
     Returns:
-        Number: Result.
+        Number | list[Number]: Result, or list of results if variables is a sequence.
     """
-    return compute_rpn(shunting_yard(expression, case_sensitive), additional_functions)
+    names = bound_names(variables, case_sensitive)
+    if not case_sensitive and names:
+        variables = lowercase_bindings(variables)
+
+    # A program is only worth creating if the expression is computed for several bindings, see compute_rpn
+    as_program = variables is not None and not isinstance(variables, Mapping)
+    functions = as_registry(additional_functions)
+    rpn = shunting_yard(expression, case_sensitive, names, as_program=as_program, functions=functions, scientific_literals=scientific_literals, number_type=number_type)
+    return compute_rpn(rpn, functions, variables, number_type)
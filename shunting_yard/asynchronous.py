@@ -0,0 +1,191 @@
+import asyncio
+from concurrent.futures import Executor
+from inspect import isawaitable, iscoroutinefunction
+from typing import Any, Collection, Mapping, Optional, Sequence, Union
+
+from shunting_yard.program import FUNCTION, NUMBER, NumberType, RPNProgram
+from shunting_yard.rpn import Bindings, exact_functions, Functions, Number
+from shunting_yard.shunting_yard import bound_names, lowercase_bindings, shunting_yard
+from shunting_yard.tree import build_tree, ExpressionTree
+
+
+# How each node is computed : directly when the expression is evaluated, or in a task, because it waits for a parameter computed in a task,
+# because its function is a coroutine function, or because its function is run by the executor
+_DIRECT = 0
+_WAITING = 1
+_COROUTINE = 2
+_OFFLOADED = 3
+
+
+class AsyncExpression:
+    """Expression computed in an event loop, whose functions can be coroutine functions (async def) or be run by an executor.
+    The calls which depend on them are computed in tasks, so that the independent parameters of a function are computed concurrently,
+    and a call starts as soon as its own parameters are computed. The other nodes are computed directly, as by ExpressionTree.evaluate.
+    As in an expression tree, each distinct sub-expression is computed only once per evaluation, except the calls of impure functions.
+
+
+    >>> async def rate(currency):
+    ...     return await store.get_rate(currency)
+    >>> expression = AsyncExpression(build_tree(shunting_yard('x * rate(1)', variable='x'), ('x',), {'rate': (1, rate)}))
+    >>> await expression.evaluate(x=2)
+    """
+
+    __slots__ = ('tree', 'executor', 'offload', '_code', '_kinds')
+
+    def __init__(self, tree: ExpressionTree, executor: Optional[Executor] = None, offload: Collection[str] = ()) -> None:
+        """
+        Args:
+            tree (ExpressionTree): tree of the expression, as returned by build_tree.
+            executor (Executor, optional): executor running the offloaded functions (default: None, the default executor of the event loop).
+            offload (Collection[str]): names of the functions run by the executor instead of the event loop, such as slow pure functions.
+        """
+        self.tree = tree
+        self.executor = executor
+        self.offload = frozenset(offload)
+        # Instructions (opcode, number / variable name / function, indexes of the parameters) of each node
+        self._code: list[tuple[int, Any, tuple[int, ...]]] = []
+        self._kinds: list[int] = []
+
+        for node in tree.nodes:
+            children = tuple(child.index for child in node.children)
+            if node.opcode != FUNCTION:
+                self._code.append((node.opcode, node.operand, children))
+                self._kinds.append(_DIRECT)
+                continue
+
+            func = tree.functions[node.operand][1]
+            self._code.append((node.opcode, func, children))
+            if node.operand in self.offload:
+                self._kinds.append(_OFFLOADED)
+            elif iscoroutinefunction(func):
+                self._kinds.append(_COROUTINE)
+            elif any(self._kinds[child] != _DIRECT for child in children):
+                self._kinds.append(_WAITING)
+            else:
+                self._kinds.append(_DIRECT)
+
+    @property
+    def variables(self) -> frozenset[str]:
+        """Names of the variables used by the expression."""
+        return self.tree.variables
+
+    async def evaluate(self, **values: Number) -> Number:
+        """Compute the value of the expression in the running event loop.
+
+        Args:
+            **values (Number): value of each variable of the expression.
+
+        Raises:
+            ValueError: raised if a variable used by the expression has no value.
+
+        Returns:
+            Number: Result.
+        """
+        results: list[Any] = [None] * len(self._code)
+        tasks: dict[int, asyncio.Task] = {}
+        loop = asyncio.get_running_loop()
+
+        try:
+            # The parameters of a node are before it, so the nodes computed directly only need nodes computed directly before them, and the
+            # tasks are created after the tasks they wait for
+            for index, ((opcode, operand, children), kind) in enumerate(zip(self._code, self._kinds)):
+                if kind != _DIRECT:
+                    tasks[index] = loop.create_task(self._call(loop, index, results, tasks))
+                elif opcode == NUMBER:
+                    results[index] = operand
+                elif opcode == FUNCTION:
+                    results[index] = operand(*[results[child] for child in children])
+                else:
+                    if not operand in values:
+                        raise ValueError(f'Missing value for variable : {operand}')
+                    results[index] = values[operand]
+
+            root = self.tree.root.index
+            return await tasks[root] if root in tasks else results[root]
+        finally:
+            # When a call fails, the other tasks are cancelled, and the errors of the ones which failed too are retrieved
+            for task in tasks.values():
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()
+
+    async def _call(self, loop: asyncio.AbstractEventLoop, index: int, results: list[Any], tasks: dict[int, asyncio.Task]) -> Any:
+        _, func, children = self._code[index]
+        kind = self._kinds[index]
+
+        # The parameters computed in tasks are awaited together, so that the independent ones are computed concurrently
+        pending = [tasks[child] for child in children if child in tasks]
+        if pending:
+            await asyncio.gather(*pending)
+        parameters = [results[child] for child in children]
+
+        if kind == _OFFLOADED:
+            result = await loop.run_in_executor(self.executor, func, *parameters)
+        else:
+            result = func(*parameters)
+            if isawaitable(result):
+                result = await result
+
+        results[index] = result
+        return result
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({len(self._code)} nodes, {len(self._kinds) - self._kinds.count(_DIRECT)} asynchronous)'
+
+
+async def _evaluate(expression: AsyncExpression, variables: Optional[Union[Bindings, Sequence[Bindings]]]) -> Union[Number, list[Number]]:
+    if variables is None or isinstance(variables, Mapping):
+        return await expression.evaluate(**(variables or {}))
+    # The expression is computed for all the bindings concurrently
+    return list(await asyncio.gather(*(expression.evaluate(**bindings) for bindings in variables)))
+
+
+async def compute_rpn_async(rpn: Union[str, RPNProgram], additional_functions: Optional[Functions] = None,
+                            variables: Optional[Union[Bindings, Sequence[Bindings]]] = None, number_type: NumberType = float,
+                            executor: Optional[Executor] = None, offload: Collection[str] = ()) -> Union[Number, list[Number]]:
+    """Compute the value of an RPN expression in the running event loop, as compute_rpn does. The functions can be coroutine functions,
+    which are awaited, and the functions named in offload are run by the executor. The independent parameters of a function are computed
+    concurrently.
+
+
+    >>> await compute_rpn_async('x rate *', {'rate': (0, get_rate)}, {'x': 2})
+
+    Args:
+        rpn (str | RPNProgram): RPN expression, or program returned by shunting_yard(..., as_program=True).
+        additional_functions (FunctionDictionary | FunctionRegistry): additional functions, or registry of functions, as in compute_rpn.
+        variables (Bindings | Sequence[Bindings], optional): value of each variable, or sequence of such values to compute the expression for
+        each of them concurrently.
+        number_type (type, optional): type of the numbers of rpn with a dot or an exponent, if it is a string, and of the constants pi and e
+        (default: float).
+        executor (Executor, optional): executor running the offloaded functions (default: None, the default executor of the event loop).
+        offload (Collection[str]): names of the functions run by the executor, such as slow pure functions which would block the event loop.
+
+    Raises:
+        ValueError: raised if an unknown function or a wrong number is in the expression, or if a variable has no value.
+        WrongExpressionError: raised if a function does not have enough parameters or if the expression does not give only one result.
+
+    Returns:
+        Number | list[Number]: The result, or the list of results if variables is a sequence.
+    """
+    program = rpn if isinstance(rpn, RPNProgram) else RPNProgram.parse(rpn, number_type=number_type)
+    tree = build_tree(program, bound_names(variables), exact_functions(additional_functions, number_type))
+    return await _evaluate(AsyncExpression(tree, executor, offload), variables)
+
+
+async def compute_async(expression: str, case_sensitive: bool = True, additional_functions: Optional[Functions] = None,
+                        variables: Optional[Union[Bindings, Sequence[Bindings]]] = None, scientific_literals: bool = False,
+                        number_type: NumberType = float, executor: Optional[Executor] = None, offload: Collection[str] = ()) -> Union[Number, list[Number]]:
+    """Compute the value of a mathematical expression in the running event loop, as compute does. See compute_rpn_async for the coroutine
+    functions, executor and offload.
+
+    Returns:
+        Number | list[Number]: Result, or list of results if variables is a sequence.
+    """
+    names = bound_names(variables, case_sensitive)
+    if not case_sensitive and names:
+        variables = lowercase_bindings(variables)
+
+    program = shunting_yard(expression, case_sensitive, names, as_program=True, functions=additional_functions,
+                            scientific_literals=scientific_literals, number_type=number_type)
+    return await compute_rpn_async(program, additional_functions, variables, number_type, executor, offload)
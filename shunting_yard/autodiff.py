@@ -0,0 +1,231 @@
+import math
+from typing import Callable, Collection, Mapping, Optional, Sequence
+
+from shunting_yard.program import FUNCTION, VARIABLE
+from shunting_yard.rpn import Bindings, FUNCTIONS, Functions, Number
+from shunting_yard.shunting_yard import lowercase_bindings, shunting_yard, variable_names
+from shunting_yard.tree import build_tree, ExpressionTree
+
+
+# Derivative of a function : called with the result of the function and its parameters, it returns the partial derivative of the function
+# with respect to each parameter, in order
+DerivativeRule = Callable[..., Sequence[Number]]
+
+
+def _power(value: Number, base: Number, exponent: Number) -> tuple[Number, Number]:
+    # x^0 is constant, and the slope of x^y at x = 0 is infinite for 0 < y < 1, where 0 ^ (y - 1) cannot be computed
+    if exponent == 0:
+        base_partial = 0
+    elif base == 0 and exponent < 1:
+        base_partial = math.inf
+    else:
+        base_partial = exponent * base ** (exponent - 1)
+    # The base of a power with a non integer exponent must be positive, so the derivative with respect to the exponent is 0 otherwise
+    return base_partial, value * math.log(base) if base > 0 else 0
+
+
+def _sqrt(value: Number, parameter: Number) -> tuple[Number]:
+    # The slope of the square root is infinite at 0
+    return (0.5 / value if value else math.inf),
+
+
+def _selected(value: Number, *parameters: Number) -> tuple[int, ...]:
+    # min and max only depend on the parameter they return (the first one, if several are equal)
+    index = parameters.index(value)
+    return tuple(int(position == index) for position in range(len(parameters)))
+
+
+def _sign(value: Number, parameter: Number) -> tuple[int]:
+    return (1 if parameter > 0 else -1 if parameter < 0 else 0),
+
+
+DERIVATIVES: dict[str, DerivativeRule] = {
+    '+': lambda value, a, b: (1, 1),
+    '+u': lambda value, a: (1,),
+    '-': lambda value, a, b: (1, -1),
+    '-u': lambda value, a: (-1,),
+    '*': lambda value, a, b: (b, a),
+    '/': lambda value, a, b: (1 / b, -value / b),
+    '^': _power,
+    'pi': lambda value: (),
+    'e': lambda value: (),
+    'sqrt': _sqrt,
+    'sin': lambda value, a: (math.cos(a),),
+    'cos': lambda value, a: (-math.sin(a),),
+    'tan': lambda value, a: (1 + value * value,),
+    'min': _selected,
+    'min3': _selected,
+    'min4': _selected,
+    'max': _selected,
+    'max3': _selected,
+    'max4': _selected,
+    'sum': lambda value, *parameters: (1,) * len(parameters),
+    'mean': lambda value, *parameters: (1 / len(parameters),) * len(parameters),
+    'abs': _sign,
+}
+
+
+class DifferentiableExpression:
+    """Expression tree computing its value and its gradient, the partial derivatives of the expression with respect to the given variables.
+    The other variables are constants. Both modes give the gradient with respect to all the variables in a single computation :
+    - forward : the derivatives of each node with respect to every variable are computed along with its value,
+    - reverse : the values are computed, then the derivatives of the expression with respect to each node, from the root to the variables.
+    The reverse mode is faster for many variables, the forward mode for a few variables and many nodes using each sub-expression.
+
+    The default functions have their derivatives in DERIVATIVES. The other functions used by nodes which depend on the variables need one,
+    given in derivatives, as well as the default functions replaced by other ones.
+
+
+    >>> tree = build_tree(shunting_yard('x^2 * sin(y)', variable=('x', 'y')), ('x', 'y'))
+    >>> DifferentiableExpression(tree, ('x', 'y')).reverse(x=3, y=0)
+    (0.0, {'x': 0, 'y': 9.0})
+    """
+
+    __slots__ = ('tree', 'variables', '_rules', '_depends')
+
+    def __init__(self, tree: ExpressionTree, variables: Optional[Collection[str]] = None, derivatives: Optional[Mapping[str, DerivativeRule]] = None) -> None:
+        """
+        Args:
+            tree (ExpressionTree): tree of the expression, as returned by build_tree.
+            variables (Collection[str], optional): names of the variables of the gradient (default: None, all the variables of the expression).
+            derivatives (Mapping[str, DerivativeRule], optional): derivative of each additional function, called with the result of the function
+            and its parameters, and returning the partial derivative with respect to each parameter. They replace the ones of DERIVATIVES.
+
+        Raises:
+            ValueError: raised if a function used by a node which depends on the variables has no derivative.
+        """
+        self.tree = tree
+        self.variables: tuple[str, ...] = tuple(sorted(tree.variables) if variables is None else variables)
+        names = frozenset(self.variables)
+        derivatives = derivatives or {}
+
+        # Derivative of the function of each node which depends on the variables (None for the others)
+        self._rules: list[Optional[DerivativeRule]] = []
+        self._depends: list[bool] = []
+        for node in tree.nodes:
+            if node.opcode == VARIABLE:
+                self._depends.append(node.operand in names)
+                self._rules.append(None)
+                continue
+            if node.opcode != FUNCTION or not any(self._depends[child.index] for child in node.children):
+                self._depends.append(False)
+                self._rules.append(None)
+                continue
+
+            rule = derivatives.get(node.operand)
+            # The derivative of a default function is only used if the function was not replaced
+            if rule is None and node.operand in FUNCTIONS and tree.functions[node.operand][1] is FUNCTIONS[node.operand][1]:
+                rule = DERIVATIVES.get(node.operand)
+            if rule is None:
+                raise ValueError(f'No derivative for function : {node.operand}')
+            self._depends.append(True)
+            self._rules.append(rule)
+
+    def forward(self, **values: Number) -> tuple[Number, dict[str, Number]]:
+        """Compute the value and the gradient of the expression in forward mode.
+
+        Args:
+            **values (Number): value of each variable of the expression.
+
+        Raises:
+            ValueError: raised if a variable used by the expression has no value.
+
+        Returns:
+            tuple[Number, dict[str, Number]]: The value, and the partial derivative with respect to each variable.
+        """
+        results = self.tree._compute_nodes(values)
+        positions = {name: position for position, name in enumerate(self.variables)}
+        # Derivatives of each node with respect to each variable (None for the nodes which do not depend on the variables)
+        tangents: list[Optional[list[Number]]] = [None] * len(results)
+
+        for index, ((opcode, operand, children), rule) in enumerate(zip(self.tree._code, self._rules)):
+            if not self._depends[index]:
+                continue
+            tangent = [0] * len(positions)
+            if opcode == VARIABLE:
+                tangent[positions[operand]] = 1
+            else:
+                partials = rule(results[index], *[results[child] for child in children])
+                for child, partial in zip(children, partials):
+                    child_tangent = tangents[child]
+                    if child_tangent is not None:
+                        for position, derivative in enumerate(child_tangent):
+                            # An infinite partial derivative only applies to the variables the child depends on
+                            if derivative:
+                                tangent[position] += partial * derivative
+            tangents[index] = tangent
+
+        root = self.tree.root.index
+        return results[root], dict(zip(self.variables, tangents[root] or [0] * len(positions)))
+
+    def reverse(self, **values: Number) -> tuple[Number, dict[str, Number]]:
+        """Compute the value and the gradient of the expression in reverse mode.
+
+        Args:
+            **values (Number): value of each variable of the expression.
+
+        Raises:
+            ValueError: raised if a variable used by the expression has no value.
+
+        Returns:
+            tuple[Number, dict[str, Number]]: The value, and the partial derivative with respect to each variable.
+        """
+        results = self.tree._compute_nodes(values)
+        gradient: dict[str, Number] = dict.fromkeys(self.variables, 0)
+        # Derivative of the expression with respect to each node. The nodes using a node are after it, so its derivative is complete
+        # when it is reached.
+        adjoints: list[Number] = [0] * len(results)
+        adjoints[self.tree.root.index] = 1
+
+        for index in range(len(results) - 1, -1, -1):
+            adjoint = adjoints[index]
+            if adjoint == 0 or not self._depends[index]:
+                continue
+            opcode, operand, children = self.tree._code[index]
+            if opcode == VARIABLE:
+                gradient[operand] += adjoint
+                continue
+
+            partials = self._rules[index](results[index], *[results[child] for child in children])
+            for child, partial in zip(children, partials):
+                if self._depends[child]:
+                    adjoints[child] += adjoint * partial
+
+        return results[self.tree.root.index], gradient
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({len(self.tree)} nodes, variables={self.variables!r})'
+
+
+def gradient(expression: str, variables: Bindings, additional_functions: Optional[Functions] = None,
+             derivatives: Optional[Mapping[str, DerivativeRule]] = None, case_sensitive: bool = True, mode: str = 'reverse') -> tuple[Number, dict[str, Number]]:
+    """Compute the value of a mathematical expression and its partial derivatives with respect to all the given variables, in a single
+    computation instead of computing the expression again for each variable.
+
+
+    >>> gradient('x * y + sin(x)', {'x': 0, 'y': 2})
+    (0.0, {'x': 3.0, 'y': 0})
+
+    Args:
+        expression (str): string containing the mathematical expression.
+        variables (Bindings): value of each variable. The gradient is computed with respect to all of them.
+        additional_functions (FunctionDictionary | FunctionRegistry, optional): additional functions, or registry of functions, as in compute.
+        derivatives (Mapping[str, DerivativeRule], optional): derivative of each additional function, see DifferentiableExpression.
+        case_sensitive (bool): indicates whether the expression should care about case.
+        mode (str): 'reverse' or 'forward', see DifferentiableExpression (default: 'reverse').
+
+    Raises:
+        ValueError: raised if the mode is unknown, if an unknown function is in the expression, or if a function has no derivative.
+
+    Returns:
+        tuple[Number, dict[str, Number]]: The value, and the partial derivative with respect to each variable.
+    """
+    if mode not in ('forward', 'reverse'):
+        raise ValueError(f'Unknown differentiation mode : {mode}')
+    if not case_sensitive:
+        variables = lowercase_bindings(variables)
+
+    names = variable_names(variables)
+    program = shunting_yard(expression, case_sensitive, names, as_program=True, functions=additional_functions)
+    differentiable = DifferentiableExpression(build_tree(program, names, additional_functions), tuple(variables), derivatives)
+    return differentiable.forward(**variables) if mode == 'forward' else differentiable.reverse(**variables)
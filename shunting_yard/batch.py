@@ -0,0 +1,149 @@
+import pickle
+from typing import Any, Iterable, NamedTuple, Optional, Union
+
+from shunting_yard.compiler import CompiledExpression
+from shunting_yard.program import RPNProgram
+from shunting_yard.rpn import as_registry, Bindings, Functions, Number
+from shunting_yard.shunting_yard import lowercase_bindings, shunting_yard, variable_names
+
+
+class BatchResult(NamedTuple):
+    value: Optional[Number]
+    error: Optional[Exception]
+
+
+class WorkerError(Exception):
+    """Error raised in a worker process which could not be sent back to the calling process, replaced by the name of its type and its message."""
+
+    def __init__(self, type_name: str, message: str) -> None:
+        super().__init__(type_name, message)
+        self.type_name = type_name
+        self.message = message
+
+    def __str__(self) -> str:
+        return f'{self.type_name} : {self.message}'
+
+
+# Item sent to the workers : RPN program, names of its variables and their values
+_Task = tuple[RPNProgram, frozenset[str], Bindings]
+
+# State of each worker process, set by _initialize_worker
+_worker_functions: Optional[Functions] = None
+_worker_compiled: dict[tuple[RPNProgram, frozenset[str]], Any] = {}
+
+
+def _compute_chunk(chunk: list[_Task], functions: Optional[Functions], compiled: dict[tuple[RPNProgram, frozenset[str]], Any]) -> list[BatchResult]:
+    """Compute every item of the chunk, compiling each expression only once. The compiled expressions (or the compilation errors) are kept in compiled."""
+    results: list[BatchResult] = []
+
+    for program, names, bindings in chunk:
+        key = (program, names)
+        expression = compiled.get(key)
+        if expression is None:
+            try:
+                expression = CompiledExpression(program, names, functions)
+            except Exception as error:
+                expression = error
+            compiled[key] = expression
+
+        if isinstance(expression, Exception):
+            results.append(BatchResult(None, expression))
+            continue
+
+        try:
+            results.append(BatchResult(expression.evaluate(**bindings), None))
+        except Exception as error:
+            results.append(BatchResult(None, error))
+
+    return results
+
+
+def _initialize_worker(functions: Optional[Functions]) -> None:
+    global _worker_functions
+    _worker_functions = functions
+    _worker_compiled.clear()
+
+
+def _sendable(error: Exception) -> Exception:
+    """Return the error, or a WorkerError describing it if it cannot be pickled and unpickled, which would break the pool of processes."""
+    try:
+        pickle.loads(pickle.dumps(error))
+    except Exception:
+        return WorkerError(type(error).__qualname__, str(error))
+    return error
+
+
+def _compute_chunk_in_worker(chunk: list[_Task]) -> list[BatchResult]:
+    results = _compute_chunk(chunk, _worker_functions, _worker_compiled)
+    return [result if result.error is None else BatchResult(None, _sendable(result.error)) for result in results]
+
+
+def compute_many(items: Iterable[Union[str, tuple[str, Bindings]]], additional_functions: Optional[Functions] = None,
+                 case_sensitive: bool = True, max_workers: Optional[int] = None, chunksize: int = 1000) -> list[BatchResult]:
+    """Compute a large number of expressions, each with its own variables values, using a pool of processes.
+    Each distinct expression is parsed only once in the calling process, and then compiled only once by each worker.
+    The errors are not raised but returned as the result of the item which caused them, so one wrong expression does not stop the whole batch.
+
+
+    >>> compute_many(['1 + 2', ('2x', {'x': 3}), 'sin(1'], max_workers=0)
+    [BatchResult(value=3, error=None), BatchResult(value=6, error=None), BatchResult(value=None, error=MismatchedBracketsError('More left than right brackets.'))]
+
+    Args:
+        items (Iterable[str | tuple[str, Bindings]]): expressions to compute, either alone or with the value of their variables.
+        additional_functions (FunctionDictionary | FunctionRegistry, optional): dictionary containing more functions, or registry of functions, as in compute_rpn.
+        When using processes, these functions must be picklable (lambdas are not, but module-level functions are).
+        case_sensitive (bool): indicates whether the expressions should care about case (default: True).
+        max_workers (int, optional): number of processes to use (default: number of processors). If 0, everything is computed in the calling process.
+        chunksize (int): number of items sent at once to a worker (default: 1000).
+
+    Returns:
+        list[BatchResult]: For each item, in the same order, its value or the error raised while computing it. When using processes, the errors
+        which cannot be pickled are replaced by a WorkerError giving their type and message.
+    """
+    if chunksize < 1:
+        raise ValueError(f'The chunk size should be at least 1 : {chunksize}.')
+
+    functions = as_registry(additional_functions)
+    results: list[Optional[BatchResult]] = []
+    # Index in results of each task
+    indexes: list[int] = []
+    tasks: list[_Task] = []
+    parsed: dict[tuple[str, frozenset[str]], Union[RPNProgram, Exception]] = {}
+
+    for item in items:
+        expression, bindings = (item, {}) if isinstance(item, str) else item
+        if not case_sensitive:
+            bindings = lowercase_bindings(bindings)
+
+        names = variable_names(bindings)
+        program = parsed.get((expression, names))
+        if program is None:
+            try:
+                program = shunting_yard(expression, case_sensitive, names, as_program=True, functions=functions)
+            except Exception as error:
+                program = error
+            parsed[(expression, names)] = program
+
+        if isinstance(program, Exception):
+            results.append(BatchResult(None, program))
+        else:
+            indexes.append(len(results))
+            results.append(None)
+            tasks.append((program, names, bindings))
+
+    chunks = [tasks[start:start + chunksize] for start in range(0, len(tasks), chunksize)]
+
+    if max_workers == 0 or len(chunks) == 0:
+        compiled: dict[tuple[RPNProgram, frozenset[str]], Any] = {}
+        chunk_results: Iterable[list[BatchResult]] = (_compute_chunk(chunk, functions, compiled) for chunk in chunks)
+        task_results = [result for chunk_result in chunk_results for result in chunk_result]
+    else:
+        # Imported only here, as it takes longer than importing the whole package
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers, initializer=_initialize_worker, initargs=(functions,)) as executor:
+            task_results = [result for chunk_result in executor.map(_compute_chunk_in_worker, chunks) for result in chunk_result]
+
+    for index, result in zip(indexes, task_results):
+        results[index] = result
+
+    return results
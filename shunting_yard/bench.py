@@ -0,0 +1,310 @@
+"""Benchmarks of the module. Run with :
+
+    python -m shunting_yard.bench scaling [--max-tokens N]
+    python -m shunting_yard.bench suite [--repeat N] [--save FILE] [--compare FILE] [--threshold RATIO]
+"""
+import argparse
+import json
+import math
+import random
+from time import perf_counter
+from typing import Any, Callable, Optional, NamedTuple
+
+from shunting_yard import compute
+from shunting_yard.cache import PARSE_CACHE
+from shunting_yard.rpn import compute_rpn
+from shunting_yard.shunting_yard import shunting_yard
+from shunting_yard.tokenize import tokenize
+
+
+class ScalingResult(NamedTuple):
+    corpus: str
+    tokens: int
+    shunting_yard_time: float
+    compute_rpn_time: float
+
+
+def _long_sum(terms: int) -> str:
+    # 1 + 2 + ... : the stack of the computation stays small
+    return '+'.join(str(i % 10) for i in range(terms))
+
+
+def _power_tower(terms: int) -> str:
+    # 1 ^ 1 ^ ... : right associative, so every number is on the stack before the first operation
+    return '^'.join('1' for _ in range(terms))
+
+
+def _nested_brackets(terms: int) -> str:
+    # 1 - (1 - (1 - ...)) : deep operator stack while parsing, and deep stack while computing
+    return '1-(' * (terms - 1) + '1' + ')' * (terms - 1)
+
+
+# Each generator returns an expression with about 2 tokens per term
+SCALING_CORPORA: dict[str, Callable[[int], str]] = {
+    'sum': _long_sum,
+    'tower': _power_tower,
+    'nested': _nested_brackets,
+}
+
+
+def scaling(sizes: list[int]) -> list[ScalingResult]:
+    """Measure the time taken by shunting_yard and compute_rpn on generated expressions of the given numbers of tokens.
+    If both are linear, the time per token should not depend on the size.
+    """
+    results: list[ScalingResult] = []
+
+    for corpus, generator in SCALING_CORPORA.items():
+        for size in sizes:
+            expression = generator(max(1, size // 2))
+
+            start = perf_counter()
+            rpn = shunting_yard(expression)
+            parsing_time = perf_counter() - start
+
+            start = perf_counter()
+            compute_rpn(rpn)
+            computing_time = perf_counter() - start
+
+            results.append(ScalingResult(corpus, len(rpn.split()), parsing_time, computing_time))
+
+    return results
+
+
+class StageResult(NamedTuple):
+    corpus: str
+    stage: str
+    calls: int
+    tokens: int
+    total_time: float
+    # Latencies of one call, in seconds
+    p50: float
+    p90: float
+    p99: float
+
+    @property
+    def tokens_per_second(self) -> float:
+        return self.tokens / self.total_time if self.total_time > 0 else math.inf
+
+
+class Comparison(NamedTuple):
+    corpus: str
+    stage: str
+    baseline: float
+    current: float
+    # Current throughput divided by the one of the baseline : less than 1 is slower
+    ratio: float
+    regression: bool
+
+
+def _short_formulas(random: random.Random) -> list[str]:
+    # Formulas as typed by users, with a few operators and functions
+    templates = [
+        '{a} + {b} * {c}',
+        '({a} + {b}) / ({c} - {d})',
+        'sin({a}) ^ 2 + cos({b}) ^ 2',
+        'sqrt({a} ^ 2 + {b} ^ 2)',
+        '-{a} * -({b} - {c})',
+        'max({a}, {b}, {c}) - min({d}, {a})',
+        'tan({a} / 100) / sqrt({b} + 1)',
+        'abs({a} - {b}) * pi',
+    ]
+    return [template.format(a=random.randint(1, 99), b=random.randint(1, 99), c=random.randint(1, 99), d=random.randint(1, 99))
+            for template in templates for _ in range(4)]
+
+
+def _deeply_nested(random: random.Random) -> list[str]:
+    return ['(' * depth + '1' + ''.join(f' {random.choice("+-*")} {random.randint(1, 9)})' for _ in range(depth)) for depth in (50, 200, 500)]
+
+
+def _long_sums(random: random.Random) -> list[str]:
+    return [' + '.join(str(random.randint(0, 999)) for _ in range(terms)) for terms in (100, 1000, 5000)]
+
+
+def _implicit_multiplication(random: random.Random) -> list[str]:
+    factors = ['2(pi)', '3(1 + 2)', '(4 - 1)(2 + 5)', '0.5sin(1)', '(2)3', '7(e)', 'sqrt(2)(3)']
+    return [' + '.join(''.join(random.choices(factors, k=3)) for _ in range(terms)) for terms in (10, 100, 500)]
+
+
+def _scientific_notation(random: random.Random) -> list[str]:
+    def number() -> str:
+        return f'{random.randint(1, 9)}.{random.randint(0, 999)}e{random.choice(("", "-", "+"))}{random.randint(0, 20)}'
+    return [' * '.join(number() for _ in range(terms)) for terms in (10, 100, 500)]
+
+
+# Each generator returns the expressions of a corpus, always the same ones as the random generator is seeded
+BENCHMARK_CORPORA: dict[str, Callable[[random.Random], list[str]]] = {
+    'short': _short_formulas,
+    'nested': _deeply_nested,
+    'sum': _long_sums,
+    'implicit': _implicit_multiplication,
+    'scientific': _scientific_notation,
+}
+
+BENCHMARK_STAGES = ('tokenize', 'shunting_yard', 'compute_rpn', 'compute')
+
+
+def _percentile(sorted_samples: list[float], fraction: float) -> float:
+    # Nearest-rank percentile
+    return sorted_samples[max(0, math.ceil(fraction * len(sorted_samples)) - 1)]
+
+
+def _stage_call(stage: str, expression: str, rpn: str) -> Callable[[], Any]:
+    if stage == 'tokenize':
+        return lambda: list(tokenize(expression))
+    if stage == 'shunting_yard':
+        return lambda: shunting_yard(expression)
+    if stage == 'compute_rpn':
+        return lambda: compute_rpn(rpn)
+    if stage == 'compute':
+        return lambda: compute(expression)
+    raise ValueError(f'Unknown stage : {stage}')
+
+
+def run_suite(corpora: Optional[list[str]] = None, stages: Optional[list[str]] = None, repeat: int = 5, seed: int = 0) -> list[StageResult]:
+    """Measure the throughput and the latency of each stage of the computation on each corpus of expressions. The parsing cache is
+    disabled during the measures, so that each call parses the expression again.
+
+    Args:
+        corpora (list[str], optional): names of the corpora (default: all the ones of BENCHMARK_CORPORA).
+        stages (list[str], optional): names of the stages (default: all the ones of BENCHMARK_STAGES).
+        repeat (int): number of times each expression is processed by each stage.
+        seed (int): seed of the generation of the corpora.
+
+    Raises:
+        ValueError: raised if a corpus or a stage is unknown.
+
+    Returns:
+        list[StageResult]: The results of each corpus and stage.
+    """
+    corpora = list(BENCHMARK_CORPORA) if corpora is None else corpora
+    stages = list(BENCHMARK_STAGES) if stages is None else stages
+    for corpus in corpora:
+        if not corpus in BENCHMARK_CORPORA:
+            raise ValueError(f'Unknown corpus : {corpus}')
+
+    results: list[StageResult] = []
+    cache_size = PARSE_CACHE.info().maxsize
+    PARSE_CACHE.resize(0)
+
+    try:
+        for corpus in corpora:
+            expressions = BENCHMARK_CORPORA[corpus](random.Random(seed))
+            rpns = [shunting_yard(expression) for expression in expressions]
+            token_counts = [len(list(tokenize(expression))) for expression in expressions]
+
+            for stage in stages:
+                calls = [_stage_call(stage, expression, rpn) for expression, rpn in zip(expressions, rpns)]
+                samples: list[float] = []
+                tokens = 0
+
+                for _ in range(repeat):
+                    for call, token_count in zip(calls, token_counts):
+                        start = perf_counter()
+                        call()
+                        samples.append(perf_counter() - start)
+                        tokens += token_count
+
+                total_time = math.fsum(samples)
+                samples.sort()
+                results.append(StageResult(corpus, stage, len(samples), tokens, total_time,
+                                           _percentile(samples, 0.5), _percentile(samples, 0.9), _percentile(samples, 0.99)))
+    finally:
+        PARSE_CACHE.resize(cache_size)
+
+    return results
+
+
+def save_baseline(results: list[StageResult], path: str) -> None:
+    """Save the results of run_suite in a JSON file, to compare them later with compare_to_baseline."""
+    with open(path, 'w') as file:
+        json.dump({'results': [result._asdict() for result in results]}, file, indent=2)
+
+
+def load_baseline(path: str) -> list[StageResult]:
+    """Load results saved by save_baseline."""
+    with open(path) as file:
+        return [StageResult(**result) for result in json.load(file)['results']]
+
+
+def compare_to_baseline(results: list[StageResult], baseline: list[StageResult], threshold: float = 0.2) -> list[Comparison]:
+    """Compare the throughput of each corpus and stage with the one of a baseline. The ones missing in the baseline are ignored.
+
+    Args:
+        results (list[StageResult]): current results.
+        baseline (list[StageResult]): results of the baseline.
+        threshold (float): fraction of the throughput of the baseline below which the current throughput is a regression (default: 0.2, 20% slower).
+
+    Returns:
+        list[Comparison]: The comparisons of each corpus and stage.
+    """
+    baseline_throughputs = {(result.corpus, result.stage): result.tokens_per_second for result in baseline}
+    comparisons: list[Comparison] = []
+
+    for result in results:
+        previous = baseline_throughputs.get((result.corpus, result.stage))
+        if previous is None:
+            continue
+        ratio = result.tokens_per_second / previous if previous > 0 else math.inf
+        comparisons.append(Comparison(result.corpus, result.stage, previous, result.tokens_per_second, ratio, ratio < 1 - threshold))
+
+    return comparisons
+
+
+def _print_suite(results: list[StageResult]) -> None:
+    print(f"{'corpus':<11} {'stage':<14} {'calls':>6} {'tokens/s':>12} {'p50 (us)':>10} {'p90 (us)':>10} {'p99 (us)':>10}")
+    for result in results:
+        print(f'{result.corpus:<11} {result.stage:<14} {result.calls:>6} {result.tokens_per_second:>12.0f}'
+              f' {1e6 * result.p50:>10.1f} {1e6 * result.p90:>10.1f} {1e6 * result.p99:>10.1f}')
+
+
+def _print_comparisons(comparisons: list[Comparison]) -> None:
+    print(f"{'corpus':<11} {'stage':<14} {'baseline':>12} {'current':>12} {'ratio':>7}")
+    for comparison in comparisons:
+        print(f'{comparison.corpus:<11} {comparison.stage:<14} {comparison.baseline:>12.0f} {comparison.current:>12.0f} {comparison.ratio:>7.2f}'
+              + ('  REGRESSION' if comparison.regression else ''))
+
+
+def _print_scaling(results: list[ScalingResult]) -> None:
+    print(f"{'corpus':<8} {'tokens':>9} {'shunting_yard':>14} {'ns/token':>9} {'compute_rpn':>12} {'ns/token':>9}")
+    for result in results:
+        print(f'{result.corpus:<8} {result.tokens:>9} {result.shunting_yard_time:>13.4f}s {1e9 * result.shunting_yard_time / result.tokens:>9.0f}'
+              f' {result.compute_rpn_time:>11.4f}s {1e9 * result.compute_rpn_time / result.tokens:>9.0f}')
+
+
+def main(arguments=None) -> None:
+    parser = argparse.ArgumentParser(prog='python -m shunting_yard.bench', description='Benchmarks of the shunting_yard module.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    scaling_parser = subparsers.add_parser('scaling', help='time per token of shunting_yard and compute_rpn on expressions of increasing sizes')
+    scaling_parser.add_argument('--max-tokens', type=int, default=10 ** 6, help='size of the largest expression (default: 1000000)')
+
+    suite_parser = subparsers.add_parser('suite', help='throughput and latency of each stage on realistic corpora of expressions')
+    suite_parser.add_argument('--corpus', action='append', choices=list(BENCHMARK_CORPORA), help='corpus to run, can be repeated (default: all)')
+    suite_parser.add_argument('--stage', action='append', choices=BENCHMARK_STAGES, help='stage to run, can be repeated (default: all)')
+    suite_parser.add_argument('--repeat', type=int, default=5, help='number of times each expression is processed (default: 5)')
+    suite_parser.add_argument('--save', metavar='FILE', help='save the results as a JSON baseline')
+    suite_parser.add_argument('--compare', metavar='FILE', help='compare the results with a JSON baseline, and exit with status 1 if there is a regression')
+    suite_parser.add_argument('--threshold', type=float, default=0.2, help='loss of throughput considered as a regression (default: 0.2)')
+
+    args = parser.parse_args(arguments)
+
+    if args.command == 'scaling':
+        sizes = [10 ** power for power in range(3, 10) if 10 ** power <= args.max_tokens]
+        _print_scaling(scaling(sizes))
+
+    elif args.command == 'suite':
+        results = run_suite(args.corpus, args.stage, args.repeat)
+        _print_suite(results)
+
+        if args.save:
+            save_baseline(results, args.save)
+        if args.compare:
+            comparisons = compare_to_baseline(results, load_baseline(args.compare), args.threshold)
+            print()
+            _print_comparisons(comparisons)
+            if any(comparison.regression for comparison in comparisons):
+                raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Hashable, NamedTuple
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+class LRUCache:
+    """Thread-safe cache with a bounded size, which evicts the least recently used entry when full.
+    A maximum size of 0 disables the cache.
+    """
+
+    _MISSING = object()
+
+    def __init__(self, maxsize: int = 512) -> None:
+        if maxsize < 0:
+            raise ValueError(f'The maximum size of the cache cannot be negative : {maxsize}.')
+
+        self._maxsize = maxsize
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the value associated with the key and mark it as recently used, or default if it is not in the cache."""
+        with self._lock:
+            value = self._entries.get(key, self._MISSING)
+            if value is self._MISSING:
+                self._misses += 1
+                return default
+
+            self._hits += 1
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Add the value to the cache, evicting the least recently used entries if it is full."""
+        if self._maxsize == 0:
+            return
+
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            self._evict(self._maxsize)
+
+    def _evict(self, maxsize: int) -> None:
+        while len(self._entries) > maxsize:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def resize(self, maxsize: int) -> None:
+        """Change the maximum size of the cache, evicting the least recently used entries if needed."""
+        if maxsize < 0:
+            raise ValueError(f'The maximum size of the cache cannot be negative : {maxsize}.')
+
+        with self._lock:
+            self._maxsize = maxsize
+            self._evict(maxsize)
+
+    def clear(self) -> None:
+        """Remove every entry of the cache and reset its counters."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._evictions = 0
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._evictions, self._maxsize, len(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Cache of the results of shunting_yard, keyed by the expression and the parsing options
+PARSE_CACHE = LRUCache()
+
+
+def parse_cache_info() -> CacheInfo:
+    """Return the hits, misses and evictions counters of the parsing cache, as well as its maximum and current sizes."""
+    return PARSE_CACHE.info()
+
+
+def set_parse_cache_size(maxsize: int) -> None:
+    """Change the maximum number of expressions kept in the parsing cache (0 disables it)."""
+    PARSE_CACHE.resize(maxsize)
+
+
+def clear_parse_cache() -> None:
+    """Remove every expression of the parsing cache and reset its counters."""
+    PARSE_CACHE.clear()
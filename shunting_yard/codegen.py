@@ -0,0 +1,146 @@
+from keyword import iskeyword
+import math
+from typing import Any, Callable, Optional, Sequence, Union
+
+from shunting_yard.program import FUNCTION, NUMBER, RPNProgram
+from shunting_yard.registry import FunctionRegistry
+from shunting_yard.rpn import as_registry, BUILTIN_FUNCTIONS, Functions, get_param_count, WrongExpressionError
+
+
+# Python templates of the operators which can be written directly in the generated code instead of calling the function
+INLINE_OPERATORS: dict[str, str] = {
+    '+': '({} + {})',
+    '+u': '(+{})',
+    '-': '({} - {})',
+    '-u': '(-{})',
+    '*': '({} * {})',
+    '/': '({} / {})',
+    '^': '({} ** {})',
+}
+
+# Sub-expressions nested deeper than this are stored in a local variable, as Python cannot compile too deeply nested expressions
+MAX_NESTING = 50
+
+FUNCTION_NAME = '_sy_expression'
+
+
+def _generate(program: RPNProgram, variables: Sequence[str], functions: FunctionRegistry) -> tuple[str, dict[str, Any]]:
+    """Return the source of a Python function computing the RPN expression, as well as the namespace it needs (the called functions and the
+    constants which cannot be written as Python literals)."""
+    for variable in variables:
+        if not variable.isidentifier() or iskeyword(variable) or variable.startswith('_sy_'):
+            raise ValueError(f'Variable cannot be used as a Python parameter : {variable}')
+
+    namespace: dict[str, Any] = {}
+    function_names: dict[int, str] = {}
+    constant_count = 0
+    lines: list[str] = []
+    # Source of each operand along with how deeply nested it is
+    stack: list[tuple[str, int]] = []
+
+    for opcode, token, arity in zip(program.opcodes, program.operands, program.arities):
+        if opcode == NUMBER:
+            # The other numbers (Decimal, Fraction, infinite floats) are bound in the namespace, as the function has no builtins
+            if type(token) is int or (type(token) is float and math.isfinite(token)):
+                stack.append((repr(token), 0))
+            else:
+                name = f'_sy_c{constant_count}'
+                constant_count += 1
+                namespace[name] = token
+                stack.append((name, 0))
+        elif token in variables and arity is None:
+            stack.append((token, 0))
+        else:
+            if opcode != FUNCTION:
+                raise ValueError(f'Variable is not a parameter of the function : {token}')
+            if not token in functions:
+                raise ValueError(f'Unknown function : {token}')
+
+            param_count, func = functions[token]
+            param_count = get_param_count(token, param_count, arity)
+            if len(stack) < param_count:
+                raise WrongExpressionError(f"Not enough parameters for function '{token}' : {len(stack)} found, {param_count} expected.")
+
+            if param_count > 0:
+                parameters = stack[-param_count:]
+                del stack[-param_count:]
+            else:
+                parameters = []
+
+            if token in INLINE_OPERATORS and func is BUILTIN_FUNCTIONS[token][1]:
+                source = INLINE_OPERATORS[token].format(*(parameter for parameter, _ in parameters))
+            else:
+                if not id(func) in function_names:
+                    function_names[id(func)] = f'_sy_f{len(function_names)}'
+                    namespace[function_names[id(func)]] = func
+                source = f"{function_names[id(func)]}({', '.join(parameter for parameter, _ in parameters)})"
+
+            nesting = 1 + max((nesting for _, nesting in parameters), default=0)
+            if nesting >= MAX_NESTING:
+                local = f'_sy_t{len(lines)}'
+                lines.append(f'{local} = {source}')
+                source, nesting = local, 0
+
+            stack.append((source, nesting))
+
+    if len(stack) != 1:
+        raise WrongExpressionError("Expression does not give only one result.")
+
+    lines.append(f'return {stack[0][0]}')
+    body = ''.join(f'\n    {line}' for line in lines)
+    return f"def {FUNCTION_NAME}({', '.join(variables)}):{body}\n", namespace
+
+
+def _as_program(rpn: Union[str, RPNProgram]) -> RPNProgram:
+    return rpn if isinstance(rpn, RPNProgram) else RPNProgram.parse(rpn)
+
+
+def to_python_source(rpn: Union[str, RPNProgram], variables: Sequence[str] = (), additional_functions: Optional[Functions] = None) -> str:
+    """Return the source code of the Python function generated for the RPN expression by to_python_function.
+
+
+    >>> print(to_python_source('x 2 * 1 +', ('x',)))
+    def _sy_expression(x):
+        return ((x * 2) + 1)
+
+    Args:
+        rpn (str | RPNProgram): RPN expression or program.
+        variables (Sequence[str]): names of the variables of the expression, which are the parameters of the function in this order.
+        additional_functions (FunctionDictionary | FunctionRegistry, optional): dictionary containing more functions, or registry of functions, as in compute_rpn.
+
+    Returns:
+        str: Source code of the function.
+    """
+    functions = as_registry(additional_functions)
+    return _generate(_as_program(rpn), variables, functions)[0]
+
+
+def to_python_function(rpn: Union[str, RPNProgram], variables: Sequence[str] = (), additional_functions: Optional[Functions] = None) -> Callable[..., Any]:
+    """Translate the RPN expression into Python source code and compile it into a regular function taking the variables as parameters.
+    The base operators are written directly as Python operators and the other functions are called directly, so the evaluation runs
+    at the speed of any Python function.
+
+
+    >>> f = to_python_function('2 x * y sin +', ('x', 'y'))
+    >>> f(1, 0)
+    2.0
+
+    Args:
+        rpn (str | RPNProgram): RPN expression or program.
+        variables (Sequence[str]): names of the variables of the expression, which are the parameters of the function in this order.
+        They must be valid Python identifiers.
+        additional_functions (FunctionDictionary | FunctionRegistry, optional): dictionary containing more functions, or registry of functions, as in compute_rpn.
+
+    Raises:
+        ValueError: raised if an unknown function is in the expression or if a variable is not a valid Python identifier.
+        WrongExpressionError: raised if a function does not have enough parameters or if the expression does not give only one result.
+
+    Returns:
+        Callable: The function computing the expression.
+    """
+    functions = as_registry(additional_functions)
+    source, namespace = _generate(_as_program(rpn), variables, functions)
+    namespace['__builtins__'] = {}
+
+    exec(compile(source, '<shunting_yard>', 'exec'), namespace)
+    return namespace[FUNCTION_NAME]
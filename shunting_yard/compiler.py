@@ -0,0 +1,319 @@
+from typing import Any, Callable, Collection, Mapping, Optional, Union
+
+from shunting_yard.optimizer import optimize as optimize_rpn
+from shunting_yard.program import FUNCTION, NUMBER, NumberType, RPNProgram, VARIABLE
+from shunting_yard.registry import FunctionRegistry
+from shunting_yard.rpn import as_registry, exact_functions, Functions, get_param_count, Number, WrongExpressionError
+from shunting_yard.shunting_yard import lowercase_bindings, shunting_yard, variable_names
+from shunting_yard.tree import TreeBuilder
+
+
+# Opcodes of the compiled instructions
+PUSH_NUMBER = 0
+PUSH_VARIABLE = 1
+CALL_FUNCTION = 2
+
+Instruction = tuple[int, Any, int]
+
+
+def _resolve(program: RPNProgram, variables: Collection[str], functions: FunctionRegistry) -> list[Instruction]:
+    """Convert an RPN program into a list of instructions (opcode, operand, parameter count) where functions are already looked up.
+    The stack depth is simulated so that arity errors are raised here rather than during the evaluation.
+    """
+    code: list[Instruction] = []
+    depth = 0
+    resolved = functions.resolve(token for opcode, token in program if opcode == FUNCTION)
+
+    for opcode, token, arity in zip(program.opcodes, program.operands, program.arities):
+        if opcode == NUMBER:
+            code.append((PUSH_NUMBER, token, 0))
+            depth += 1
+        elif opcode == VARIABLE or (token in variables and arity is None):
+            code.append((PUSH_VARIABLE, token, 0))
+            depth += 1
+        else:
+            if not token in resolved:
+                raise ValueError(f'Unknown function : {token}')
+
+            param_count, func = resolved[token]
+            param_count = get_param_count(token, param_count, arity)
+            if depth < param_count:
+                raise WrongExpressionError(f"Not enough parameters for function '{token}' : {depth} found, {param_count} expected.")
+
+            code.append((CALL_FUNCTION, func, param_count))
+            depth += 1 - param_count
+
+    if depth != 1:
+        raise WrongExpressionError("Expression does not give only one result.")
+
+    return code
+
+
+class CompiledExpression:
+    """Expression parsed and resolved once, which can then be evaluated many times with different variable values.
+    Use the compile function to create one from a mathematical expression.
+
+    >>> expr = CompiledExpression('x 2 ^ 1 +', variables=('x',))
+    >>> expr.evaluate(x=3)
+    10
+    """
+
+    __slots__ = ('program', 'variables', 'functions', 'case_sensitive', '_code', '_array_expression')
+
+    def __init__(self, rpn: Union[str, RPNProgram], variables: Collection[str] = (), functions: Optional[Functions] = None,
+                 case_sensitive: bool = True) -> None:
+        """
+        Args:
+            rpn (str | RPNProgram): RPN expression or program (see the shunting_yard function).
+            variables (Collection[str]): names of the variables of the expression. They take precedence over functions with the same name.
+            functions (FunctionDictionary | FunctionRegistry, optional): additional functions, or registry of functions, as in compute_rpn.
+            case_sensitive (bool): if False, the names of the variable values given to evaluate are lowercased, as the variables of an expression
+            parsed without caring about case (default: True).
+
+        Raises:
+            ValueError: raised if an unknown function is in the expression.
+            WrongExpressionError: raised if a function does not have enough parameters or if the expression does not give only one result.
+        """
+        self.variables = frozenset(variables)
+        self.program = rpn if isinstance(rpn, RPNProgram) else RPNProgram.parse(rpn, self.variables)
+        self.functions = functions
+        self.case_sensitive = case_sensitive
+        self._array_expression: Optional[CompiledExpression] = None
+        self._code = _resolve(self.program, self.variables, as_registry(functions))
+
+    @property
+    def rpn(self) -> str:
+        return str(self.program)
+
+    def evaluate(self, **values: Number) -> Number:
+        """Compute the value of the expression.
+
+        Args:
+            **values (Number): value of each variable of the expression.
+
+        Raises:
+            ValueError: raised if a variable used by the expression has no value.
+
+        Returns:
+            Number: Result.
+        """
+        if not self.case_sensitive:
+            values = lowercase_bindings(values)
+
+        stack: list[Number] = []
+        push = stack.append
+
+        try:
+            for opcode, operand, param_count in self._code:
+                if opcode == PUSH_NUMBER:
+                    push(operand)
+                elif opcode == PUSH_VARIABLE:
+                    push(values[operand])
+                elif param_count == 0:
+                    push(operand())
+                elif param_count == 1:
+                    stack[-1] = operand(stack[-1])
+                elif param_count == 2:
+                    right = stack.pop()
+                    stack[-1] = operand(stack[-1], right)
+                else:
+                    parameters = stack[-param_count:]
+                    del stack[-param_count:]
+                    push(operand(*parameters))
+        except KeyError:
+            # Only report the error if it comes from a missing variable and not from a function
+            for opcode, operand, _ in self._code:
+                if opcode == PUSH_VARIABLE and not operand in values:
+                    raise ValueError(f'Missing value for variable : {operand}') from None
+            raise
+
+        return stack[0]
+
+    def evaluate_array(self, **values: Any) -> Any:
+        """Compute the value of the expression for whole arrays of variable values at once (requires NumPy).
+        See the compute_rpn_array function of the vectorize module for more details.
+
+        Args:
+            **values (ArrayLike): value of each variable of the expression, as NumPy arrays, lists, buffers or numbers.
+
+        Returns:
+            numpy.ndarray: The result for every element of the variables.
+        """
+        from shunting_yard.vectorize import _import_numpy, vectorized_functions
+
+        np = _import_numpy()
+        if self._array_expression is None:
+            self._array_expression = CompiledExpression(self.program, self.variables, vectorized_functions(self.functions), self.case_sensitive)
+
+        return self._array_expression.evaluate(**{name: np.asarray(value) for name, value in values.items()})
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.rpn!r}, variables={sorted(self.variables)!r})'
+
+
+def compile(expression: str, variables: Collection[str] = (), functions: Optional[Functions] = None,
+            case_sensitive: bool = True, convert_scientific_notation: bool = True, optimize: bool = False, impure: Collection[str] = (),
+            scientific_literals: bool = False, number_type: NumberType = float) -> CompiledExpression:
+    """Parse a mathematical expression once and return an object which can evaluate it many times without parsing it again.
+    The numbers are converted, the functions looked up and the number of parameters checked when compiling.
+
+
+    >>> compile('2x + 1', variables=('x',)).evaluate(x=3)
+    7
+
+    Args:
+        expression (str): string containing the mathematical expression to compile.
+        variables (Collection[str]): names of the variables of the expression.
+        functions (FunctionDictionary | FunctionRegistry, optional): additional functions, or registry of functions, as the additional_functions of compute_rpn.
+        case_sensitive (bool): indicates whether the expression should care about case (default: True).
+        convert_scientific_notation (bool, optional): indicates whether the expression should convert scientific notation (default: True).
+        optimize (bool): indicates whether the constant sub-expressions and identity operations should be simplified (default: False).
+        See the optimize function of the optimizer module.
+        impure (Collection[str]): names of the functions which should not be computed in advance by the optimization.
+        scientific_literals (bool, optional): indicates whether the numbers in scientific notation should be converted once into exactly the number
+        they write, instead of multiplications by a power of 10 (default: False).
+        number_type (type, optional): type of the numbers with a dot or an exponent : float, or Decimal or Fraction for exact arithmetic (default: float).
+        The constants pi and e are converted into it too.
+
+    Raises:
+        MismatchedBracketsError: raised if the bracket are unbalanced.
+        ValueError: raised if an unknown function is in the expression.
+        WrongExpressionError: raised if a function does not have enough parameters or if the expression does not give only one result.
+
+    Returns:
+        CompiledExpression: The compiled expression.
+    """
+    variables = variable_names(variables, case_sensitive)
+    functions = exact_functions(functions, number_type)
+
+    program = shunting_yard(expression, case_sensitive, variables, convert_scientific_notation, as_program=True, functions=functions,
+                            scientific_literals=scientific_literals, number_type=number_type)
+    if optimize:
+        program = optimize_rpn(program, functions, impure)
+    return CompiledExpression(program, variables, functions, case_sensitive)
+
+
+class CompiledBundle:
+    """Set of named expressions evaluated together, whose common sub-expressions are computed only once per evaluation, even when they
+    are in different expressions (e.g. sqrt(a^2 + b^2) in several formulas). Use the compile_many function to create one.
+
+    >>> bundle = CompiledBundle({'r': 'a 2 ^ b 2 ^ + sqrt', 'x': 'a 2 ^ b 2 ^ + sqrt a /'}, variables=('a', 'b'))
+    >>> bundle.evaluate(a=3, b=4)
+    {'r': 5.0, 'x': 1.6666666666666667}
+    """
+
+    __slots__ = ('programs', 'variables', 'functions', 'impure', 'case_sensitive', '_results', '_variable_nodes', '_calls', '_roots', '_array_bundle')
+
+    def __init__(self, expressions: Mapping[str, Union[str, RPNProgram]], variables: Collection[str] = (), functions: Optional[Functions] = None,
+                 impure: Collection[str] = (), case_sensitive: bool = True) -> None:
+        """
+        Args:
+            expressions (Mapping[str, str | RPNProgram]): RPN expression or program of each name.
+            variables (Collection[str]): names of the variables of the expressions. They take precedence over functions with the same name.
+            functions (FunctionDictionary | FunctionRegistry, optional): additional functions, or registry of functions, as in compute_rpn.
+            impure (Collection[str]): names of the functions whose calls should never be shared, in addition to the impure ones of the registry.
+            case_sensitive (bool): if False, the names of the variable values given to evaluate are lowercased, as in CompiledExpression (default: True).
+
+        Raises:
+            ValueError: raised if an unknown function is in an expression.
+            WrongExpressionError: raised if a function does not have enough parameters or if an expression does not give only one result.
+        """
+        self.variables = frozenset(variables)
+        self.programs = {name: rpn if isinstance(rpn, RPNProgram) else RPNProgram.parse(rpn, self.variables) for name, rpn in expressions.items()}
+        self.functions = functions
+        self.impure = frozenset(impure)
+        self.case_sensitive = case_sensitive
+        self._array_bundle: Optional[CompiledBundle] = None
+
+        builder = TreeBuilder(functions, impure)
+        self._roots = {name: builder.add(program, self.variables).index for name, program in self.programs.items()}
+
+        # Value of each node, where the numbers are already set, the node of each variable, and the calls (node, function, parameter nodes)
+        # in an order where the parameters of a call are computed before it
+        self._results: list[Any] = [node.operand if node.opcode == NUMBER else None for node in builder.nodes]
+        self._variable_nodes = [(node.index, node.operand) for node in builder.nodes if node.opcode == VARIABLE]
+        self._calls: list[tuple[int, Callable[..., Any], tuple[int, ...]]] = [
+            (node.index, builder.functions[node.operand][1], tuple(child.index for child in node.children))
+            for node in builder.nodes if node.opcode == FUNCTION
+        ]
+
+    def evaluate(self, **values: Number) -> dict[str, Number]:
+        """Compute the value of every expression.
+
+        Args:
+            **values (Number): value of each variable of the expressions.
+
+        Raises:
+            ValueError: raised if a variable used by an expression has no value.
+
+        Returns:
+            dict[str, Number]: The result of each expression, by name.
+        """
+        if not self.case_sensitive:
+            values = lowercase_bindings(values)
+
+        results = self._results.copy()
+        for index, name in self._variable_nodes:
+            if not name in values:
+                raise ValueError(f'Missing value for variable : {name}')
+            results[index] = values[name]
+
+        for index, func, children in self._calls:
+            results[index] = func(*[results[child] for child in children])
+
+        return {name: results[index] for name, index in self._roots.items()}
+
+    def evaluate_array(self, **values: Any) -> dict[str, Any]:
+        """Compute the value of every expression for whole arrays of variable values at once (requires NumPy), as
+        CompiledExpression.evaluate_array does.
+
+        Args:
+            **values (ArrayLike): value of each variable of the expressions, as NumPy arrays, lists, buffers or numbers.
+
+        Returns:
+            dict[str, numpy.ndarray]: The results of each expression, by name.
+        """
+        from shunting_yard.vectorize import _import_numpy, vectorized_functions
+
+        np = _import_numpy()
+        if self._array_bundle is None:
+            self._array_bundle = CompiledBundle(self.programs, self.variables, vectorized_functions(self.functions), self.impure, self.case_sensitive)
+
+        return self._array_bundle.evaluate(**{name: np.asarray(value) for name, value in values.items()})
+
+    def __len__(self) -> int:
+        """Number of distinct sub-expressions (nodes) of all the expressions."""
+        return len(self._results)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({len(self.programs)} expressions, {len(self._results)} nodes, variables={sorted(self.variables)!r})'
+
+
+def compile_many(expressions: Mapping[str, str], variables: Collection[str] = (), functions: Optional[Functions] = None,
+                 case_sensitive: bool = True, convert_scientific_notation: bool = True, optimize: bool = False, impure: Collection[str] = (),
+                 scientific_literals: bool = False, number_type: NumberType = float) -> CompiledBundle:
+    """Parse a set of named mathematical expressions once and return an object evaluating all of them together, computing their common
+    sub-expressions only once. See the compile function for the parameters, which apply to every expression.
+
+
+    >>> bundle = compile_many({'r': 'sqrt(a^2 + b^2)', 'ratio': 'sqrt(a^2 + b^2) / a'}, variables=('a', 'b'))
+    >>> bundle.evaluate(a=3, b=4)
+    {'r': 5.0, 'ratio': 1.6666666666666667}
+
+    Raises:
+        MismatchedBracketsError: raised if the bracket are unbalanced in an expression.
+        ValueError: raised if an unknown function is in an expression.
+        WrongExpressionError: raised if a function does not have enough parameters or if an expression does not give only one result.
+
+    Returns:
+        CompiledBundle: The compiled expressions.
+    """
+    variables = variable_names(variables, case_sensitive)
+    functions = exact_functions(functions, number_type)
+
+    programs: dict[str, RPNProgram] = {}
+    for name, expression in expressions.items():
+        program = shunting_yard(expression, case_sensitive, variables, convert_scientific_notation, as_program=True, functions=functions,
+                                scientific_literals=scientific_literals, number_type=number_type)
+        programs[name] = optimize_rpn(program, functions, impure) if optimize else program
+    return CompiledBundle(programs, variables, functions, impure, case_sensitive)
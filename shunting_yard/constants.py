@@ -12,6 +12,9 @@ FUNCTION_CHARS = FUNCTION_FIRST_CHARS + NUMBER_CHARS
 SEPARATORS_NO_CLOSING_BRACKET = '(,;'
 SEPARATORS = SEPARATORS_NO_CLOSING_BRACKET + ')'
 
+# Separates the name of a variadic function from its number of parameters in the RPN expressions (e.g. max@3)
+ARITY_SEPARATOR = '@'
+
 
 IMPLICIT_MULTIPLICATION_NUMBER_REGEX = r'\b(\d+)([^)\d.,;+*\/^-])'
 IMPLICIT_MULTIPLICATION_BRACKET_REGEX = r'(\))([^),;+*\/^-])'
@@ -0,0 +1,294 @@
+from bisect import bisect_left, bisect_right
+from itertools import repeat
+from typing import Collection, Optional, Union
+
+from shunting_yard.program import RPNProgram
+from shunting_yard.rpn import as_registry, Functions
+from shunting_yard.scanner import _Scanner, Boundary
+from shunting_yard.shunting_yard import MismatchedBracketsError, Parser, ParserState, variable_names
+
+
+# Number of tokens between two saved states of the parser
+CHECKPOINT_INTERVAL = 32
+
+
+def _shifted(values: list[int], delta: int) -> map:
+    return map(delta.__add__, values)
+
+
+class ParseState:
+    """Result of the parsing of an expression, which can be updated after an edit of the expression without parsing it again entirely.
+    Use the parse function to create one, and its edit method to get the state of the edited expression.
+
+    Besides the tokens and the RPN expression, it keeps the boundaries of the lexemes of the scanner (see the scanner module) and the state of
+    the parser every CHECKPOINT_INTERVAL tokens. After an edit, the scanning resumes from the last lexeme which could be affected by the edit,
+    and stops as soon as it reaches a lexeme boundary of the previous state, after the edit, with the same scanner state : the following
+    tokens are the same as before. The parsing then resumes from the last saved state before the first new token, and stops as soon as
+    its state is the same as a saved state of the previous parsing after the new tokens : the rest of the output is the same as before.
+    So the time taken by an edit depends on the size of the edit (and the nesting of brackets around it) rather than of the expression,
+    apart from copying the lists of tokens.
+    """
+
+    __slots__ = ('expression', 'variables', 'variadic', 'convert_scientific_notation', 'scientific_literals', 'case_sensitive', 'tokens', 'output', 'error',
+                 '_cursors', '_ends', '_scanner_states', '_token_indexes', '_checkpoint_tokens', '_checkpoint_outputs', '_checkpoint_states')
+
+    def __init__(self, expression: str, variables: frozenset[str], variadic: frozenset[str], convert_scientific_notation: bool, case_sensitive: bool,
+                 scientific_literals: bool = False) -> None:
+        self.expression = expression
+        self.variables = variables
+        self.variadic = variadic
+        self.convert_scientific_notation = convert_scientific_notation
+        self.scientific_literals = scientific_literals
+        self.case_sensitive = case_sensitive
+
+        self.tokens: list[str] = []
+        # RPN tokens, which is only a part of the RPN expression if there is an error
+        self.output: list[str] = []
+        self.error: Optional[MismatchedBracketsError] = None
+
+        # For each lexeme boundary : its offset, the furthest character the previous lexemes depend on, the state of the scanner and the index
+        # of the first token of the lexeme. The last boundary is the end of the expression.
+        self._cursors: list[int] = []
+        self._ends: list[int] = []
+        self._scanner_states: list[tuple[bool, bool]] = []
+        self._token_indexes: list[int] = []
+
+        # For each checkpoint : the index of the next token to parse, the length of the output and the state of the parser
+        self._checkpoint_tokens: list[int] = []
+        self._checkpoint_outputs: list[int] = []
+        self._checkpoint_states: list[ParserState] = []
+
+    @property
+    def rpn(self) -> str:
+        """The RPN expression.
+
+        Raises:
+            MismatchedBracketsError: raised if the brackets of the expression are unbalanced.
+        """
+        if self.error is not None:
+            raise self.error
+        return ' '.join(self.output)
+
+    @property
+    def program(self) -> RPNProgram:
+        """The RPN expression, as an RPNProgram.
+
+        Raises:
+            MismatchedBracketsError: raised if the brackets of the expression are unbalanced.
+            ValueError: raised if a number is not valid (e.g. 1.2.3).
+        """
+        if self.error is not None:
+            raise self.error
+        return RPNProgram.from_tokens(self.output, self.variables)
+
+    def _copy_settings(self, expression: str) -> 'ParseState':
+        return ParseState(expression, self.variables, self.variadic, self.convert_scientific_notation, self.case_sensitive, self.scientific_literals)
+
+    def _add_boundaries(self, boundaries: list[Boundary], token_index: int) -> None:
+        for cursor, is_infix, after_word, reach in boundaries:
+            self._cursors.append(cursor)
+            self._ends.append(max(cursor, reach))
+            self._scanner_states.append((is_infix, after_word))
+            self._token_indexes.append(token_index)
+        boundaries.clear()
+
+    def _scan(self, cursor: int, scanner_state: tuple[bool, bool], reach: int = 0, previous: Optional['ParseState'] = None, delta: int = 0,
+              edit_end: int = 0) -> Optional[tuple[int, int]]:
+        """Scan the expression from the given boundary, adding the tokens and the boundaries to this state. If previous is given, stop at the
+        first boundary after edit_end (in the previous expression) which is also a boundary of the previous state, shifted by delta.
+        Return the indexes in the previous state of the boundary after this one and of the first token of this one, or None if the scanning
+        went to the end.
+        """
+        scanner = _Scanner(self.expression, self.convert_scientific_notation, self.scientific_literals)
+        scanner.reach = reach
+        boundaries: list[Boundary] = []
+        tokens = self.tokens
+
+        def converged() -> Optional[tuple[int, int]]:
+            # Look for the new boundaries in the previous state
+            for position, (cursor, is_infix, after_word, _) in enumerate(boundaries):
+                previous_cursor = cursor - delta
+                if previous_cursor < edit_end:
+                    continue
+                index = bisect_left(previous._cursors, previous_cursor)
+                if (index < len(previous._cursors) and previous._cursors[index] == previous_cursor
+                        and previous._scanner_states[index] == (is_infix, after_word)):
+                    del boundaries[position + 1:]
+                    self._add_boundaries(boundaries, len(tokens))
+                    return index + 1, previous._token_indexes[index]
+            self._add_boundaries(boundaries, len(tokens))
+            return None
+
+        for token, _ in scanner.scan(cursor, *scanner_state, boundaries):
+            if boundaries:
+                if previous is not None and (found := converged()) is not None:
+                    return found
+                self._add_boundaries(boundaries, len(tokens))
+            tokens.append(token)
+
+        if previous is not None:
+            return converged()
+        self._add_boundaries(boundaries, len(tokens))
+        return None
+
+    def _checkpoint(self, parser: Parser, token_index: int) -> None:
+        self._checkpoint_tokens.append(token_index)
+        self._checkpoint_outputs.append(len(parser.output))
+        self._checkpoint_states.append(parser.save())
+
+    def _parse(self, parser: Parser, token_index: int, previous: Optional['ParseState'] = None, first_checkpoint: int = 0, token_delta: int = 0) -> None:
+        """Parse the tokens from the given index, with the parser in the state it has before this token. If previous is given, stop at the
+        first checkpoint of previous from first_checkpoint (whose token index is shifted by token_delta) where the state of the parser is the same.
+        """
+        tokens = self.tokens
+        # Index in the previous state of the next checkpoint at which the parsing could stop
+        candidate = first_checkpoint if previous is not None else None
+
+        while True:
+            self._checkpoint(parser, token_index)
+
+            if candidate is not None:
+                while candidate < len(previous._checkpoint_tokens) and previous._checkpoint_tokens[candidate] + token_delta < token_index:
+                    candidate += 1
+                if candidate == len(previous._checkpoint_tokens):
+                    candidate = None
+                elif previous._checkpoint_tokens[candidate] + token_delta == token_index and previous._checkpoint_states[candidate] == self._checkpoint_states[-1]:
+                    # Same state at the same token : the rest is the same as in the previous state
+                    self._checkpoint_tokens.pop()
+                    self._checkpoint_outputs.pop()
+                    self._checkpoint_states.pop()
+                    output_delta = len(parser.output) - previous._checkpoint_outputs[candidate]
+                    self.output = parser.output + previous.output[previous._checkpoint_outputs[candidate]:]
+                    self.error = previous.error
+                    self._checkpoint_tokens += _shifted(previous._checkpoint_tokens[candidate:], token_delta)
+                    self._checkpoint_outputs += _shifted(previous._checkpoint_outputs[candidate:], output_delta)
+                    self._checkpoint_states += previous._checkpoint_states[candidate:]
+                    return
+
+            if token_index >= len(tokens):
+                break
+
+            # Stop the next part at the next candidate checkpoint if it is before the next regular one
+            next_index = token_index + CHECKPOINT_INTERVAL
+            if candidate is not None:
+                next_index = min(next_index, max(token_index + 1, previous._checkpoint_tokens[candidate] + token_delta))
+
+            try:
+                parser.feed(tokens[token_index:next_index])
+            except MismatchedBracketsError as error:
+                self.output = parser.output
+                self.error = error
+                return
+            token_index = next_index
+
+        try:
+            self.output = parser.finish()
+        except MismatchedBracketsError as error:
+            self.output = parser.output
+            self.error = error
+
+    def edit(self, offset: int, deleted: int, inserted: str) -> 'ParseState':
+        """Return the state of the expression after replacing deleted characters from offset by inserted. This state is not modified.
+
+        Args:
+            offset (int): offset in the expression of the first deleted character, or of the insertion.
+            deleted (int): number of deleted characters.
+            inserted (str): inserted text.
+
+        Raises:
+            ValueError: raised if the edit is not inside the expression.
+
+        Returns:
+            ParseState: The state of the edited expression.
+        """
+        if offset < 0 or deleted < 0 or offset + deleted > len(self.expression):
+            raise ValueError(f'Edit outside of the expression : {deleted} characters from {offset} in {len(self.expression)} characters.')
+        if not self.case_sensitive:
+            inserted = inserted.lower()
+
+        expression = self.expression[:offset] + inserted + self.expression[offset + deleted:]
+        delta = len(inserted) - deleted
+        state = self._copy_settings(expression)
+
+        # First lexeme depending on a character of the edit (or on the character just after it). The lexemes before are kept.
+        lexeme = bisect_left(self._ends, offset, 1) - 1
+        if lexeme <= 0:
+            lexeme, cursor, scanner_state, reach = 0, 0, (False, False), 0
+        else:
+            cursor, scanner_state, reach = self._cursors[lexeme], self._scanner_states[lexeme], self._ends[lexeme]
+
+        first_token = self._token_indexes[lexeme]
+        state.tokens = self.tokens[:first_token]
+        state._cursors = self._cursors[:lexeme]
+        state._ends = self._ends[:lexeme]
+        state._scanner_states = self._scanner_states[:lexeme]
+        state._token_indexes = self._token_indexes[:lexeme]
+
+        found = state._scan(cursor, scanner_state, reach, self, delta, offset + deleted)
+
+        token_delta = 0
+        first_checkpoint = len(self._checkpoint_tokens)
+        if found is not None:
+            # The end of the tokens is the same as before
+            previous_lexeme, previous_token = found
+            token_delta = state._token_indexes[-1] - previous_token
+            reach = state._ends[-1]
+            state.tokens += self.tokens[previous_token:]
+            state._cursors += _shifted(self._cursors[previous_lexeme:], delta)
+            state._ends += map(max, _shifted(self._ends[previous_lexeme:], delta), repeat(reach))
+            state._scanner_states += self._scanner_states[previous_lexeme:]
+            state._token_indexes += _shifted(self._token_indexes[previous_lexeme:], token_delta)
+            first_checkpoint = bisect_left(self._checkpoint_tokens, previous_token)
+
+        # Resume the parsing from the last checkpoint before the first new token
+        checkpoint = bisect_right(self._checkpoint_tokens, first_token) - 1
+        token_index = self._checkpoint_tokens[checkpoint]
+        output_length = self._checkpoint_outputs[checkpoint]
+
+        parser = Parser(self.variables, self.variadic)
+        parser.restore(self.output[:output_length], self._checkpoint_states[checkpoint])
+        state._checkpoint_tokens = self._checkpoint_tokens[:checkpoint]
+        state._checkpoint_outputs = self._checkpoint_outputs[:checkpoint]
+        state._checkpoint_states = self._checkpoint_states[:checkpoint]
+        state._parse(parser, token_index, self, first_checkpoint, token_delta)
+
+        return state
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.expression!r})'
+
+
+def parse(expression: str, case_sensitive: bool = True, variable: Optional[Union[str, Collection[str]]] = None, convert_scientific_notation: bool = True,
+          functions: Optional[Functions] = None, scientific_literals: bool = False) -> ParseState:
+    """Convert a mathematical expression into Reverse Polish Notation, as the shunting_yard function, but return a state which can then be
+    updated after each edit of the expression (see ParseState.edit) much faster than parsing the whole expression again. This is useful when
+    the expression is edited interactively. The expression is always split into tokens in a single pass (as with single_pass=True).
+    The errors of brackets are not raised, but only when getting the RPN expression, as an expression is often unbalanced while being edited.
+
+
+    >>> state = parse('2 * sin(x)', variable='x')
+    >>> state.rpn
+    '2 x sin *'
+    >>> state.edit(4, 3, 'cos').rpn
+    '2 x cos *'
+
+    Args:
+        expression (str): string containing the mathematical expression to convert.
+        case_sensitive (bool): indicates whether the expression should care about case (default: True).
+        variable (str | Collection[str], optional): variable or variables of the expression (default: None).
+        convert_scientific_notation (bool, optional): indicates whether the expression should convert scientific notation (default: True).
+        functions (FunctionDictionary | FunctionRegistry, optional): additional functions, or registry of functions, as in shunting_yard.
+        scientific_literals (bool, optional): indicates whether the numbers in scientific notation should be single tokens, as in shunting_yard (default: False).
+
+    Returns:
+        ParseState: The state of the parsing.
+    """
+    variables = variable_names(variable, case_sensitive)
+
+    if not case_sensitive:
+        expression = expression.lower()
+
+    state = ParseState(expression, variables, as_registry(functions).variadic, convert_scientific_notation, case_sensitive, scientific_literals)
+    state._scan(0, (False, False))
+    state._parse(Parser(variables, state.variadic), 0)
+    return state
@@ -0,0 +1,207 @@
+import math
+from decimal import Decimal
+from typing import Any, Collection, Optional, Union
+
+from shunting_yard.program import FUNCTION, NUMBER, RPNProgram
+from shunting_yard.registry import FunctionRegistry
+from shunting_yard.rpn import as_registry, BUILTIN_FUNCTIONS, Functions, get_param_count, Number, WrongExpressionError
+
+
+# Largest integer (in bits) which can be created when folding a power, so that something like 9^9^9 is left to the evaluation
+MAX_FOLDED_POWER_BITS = 4096
+
+
+class _Node:
+    """Node of the expression tree built from an RPN program. The constants are NUMBER nodes, whose operand is their value (which can be negative)."""
+
+    __slots__ = ('opcode', 'operand', 'token', 'children', 'arity')
+
+    def __init__(self, opcode: int, operand: Any, token: str, children: tuple['_Node', ...] = (), arity: Optional[int] = None) -> None:
+        self.opcode = opcode
+        self.operand = operand
+        self.token = token
+        self.children = children
+        self.arity = arity
+
+
+def _number_token(value: Number) -> str:
+    """Token of a positive number, which converts back to the same value (the tokens cannot use the scientific notation)."""
+    if isinstance(value, int):
+        return str(value)
+    token = format(Decimal(repr(value)), 'f')
+    return token if '.' in token else token + '.'
+
+
+def _constant(value: Number) -> _Node:
+    return _Node(NUMBER, value, _number_token(abs(value)))
+
+
+def _is_foldable(value: Any) -> bool:
+    return type(value) is int or (type(value) is float and math.isfinite(value))
+
+
+def _is_integer_constant(node: _Node, value: int) -> bool:
+    return node.opcode == NUMBER and type(node.operand) is int and node.operand == value
+
+
+class _Optimizer:
+    """Simplification of the expression tree. See the optimize function."""
+
+    __slots__ = ('functions', 'impure')
+
+    def __init__(self, functions: FunctionRegistry, impure: Collection[str]) -> None:
+        self.functions = functions
+        self.impure = impure
+
+    def _is_builtin(self, name: str) -> bool:
+        return name in BUILTIN_FUNCTIONS and self.functions.get(name) is BUILTIN_FUNCTIONS[name]
+
+    def _negate(self, node: _Node) -> _Node:
+        if node.opcode == FUNCTION and node.operand == '-u':
+            return node.children[0]
+        return _Node(FUNCTION, '-u', '-u', (node,))
+
+    def _fold(self, node: _Node) -> _Node:
+        """Compute the node if all its parameters are constants and its function is pure."""
+        if node.operand in self.impure or not all(child.opcode == NUMBER for child in node.children):
+            return node
+
+        func = self.functions[node.operand][1]
+        parameters = [child.operand for child in node.children]
+
+        if func is pow and len(parameters) == 2 and all(type(parameter) is int for parameter in parameters):
+            base, exponent = parameters
+            if exponent > 0 and base.bit_length() * exponent > MAX_FOLDED_POWER_BITS:
+                return node
+
+        try:
+            value = func(*parameters)
+        except Exception:
+            # The error will be raised again when computing the expression
+            return node
+
+        # The negative numbers are written with a negation, which can only be used if it is the usual one
+        if not _is_foldable(value) or (math.copysign(1, value) < 0 and not self._is_builtin('-u')):
+            return node
+        return _constant(value)
+
+    def _simplify(self, node: _Node) -> _Node:
+        """Remove the identity operations of the base operators, and replace a multiplication by -1 with a negation. Adding 0 and subtracting
+        from 0 are kept, as x + 0 is not x and 0 - x is not -x when x is a zero of another sign (e.g. -0.0 + 0 is 0.0)."""
+        name, children = node.operand, node.children
+        if not self._is_builtin(name):
+            return node
+
+        can_negate = self._is_builtin('-u')
+
+        if name == '+u':
+            return children[0]
+        if name == '-u':
+            return self._negate(children[0])
+        if name == '-':
+            if _is_integer_constant(children[1], 0):
+                return children[0]
+        elif name == '*':
+            for constant, other in (children, reversed(children)):
+                if _is_integer_constant(constant, 1):
+                    return other
+                if _is_integer_constant(constant, -1) and can_negate:
+                    return self._negate(other)
+        elif name == '^':
+            if _is_integer_constant(children[1], 1):
+                return children[0]
+
+        return node
+
+    def optimize(self, program: RPNProgram) -> Optional[RPNProgram]:
+        """Return the optimized program, or None if the program cannot be converted into a tree (unknown function or wrong number of parameters)."""
+        stack: list[_Node] = []
+
+        for token, opcode, operand, arity in zip(program.tokens, program.opcodes, program.operands, program.arities):
+            if opcode != FUNCTION:
+                stack.append(_Node(opcode, operand, token))
+                continue
+
+            if not operand in self.functions:
+                return None
+            try:
+                param_count = get_param_count(operand, self.functions[operand][0], arity)
+            except WrongExpressionError:
+                return None
+            if len(stack) < param_count:
+                return None
+
+            children = tuple(stack[len(stack) - param_count:])
+            del stack[len(stack) - param_count:]
+            node = self._fold(_Node(opcode, operand, token, children, arity))
+            if node.opcode == FUNCTION:
+                node = self._simplify(node)
+            stack.append(node)
+
+        if len(stack) != 1:
+            return None
+        return _flatten(stack[0])
+
+
+def _flatten(root: _Node) -> RPNProgram:
+    """Write the tree back in Reverse Polish Notation, without recursion so that deep expressions can be written."""
+    tokens: list[str] = []
+    opcodes: list[int] = []
+    operands: list[Any] = []
+    arities: list[Optional[int]] = []
+
+    # Each node is pushed twice : once to push its children, and once to write it after them
+    pending: list[tuple[_Node, bool]] = [(root, False)]
+    while pending:
+        node, children_written = pending.pop()
+
+        if node.opcode == NUMBER and math.copysign(1, node.operand) < 0:
+            tokens += (node.token, '-u')
+            opcodes += (NUMBER, FUNCTION)
+            operands += (-node.operand, '-u')
+            arities += (None, None)
+        elif children_written or not node.children:
+            tokens.append(node.token)
+            opcodes.append(node.opcode)
+            operands.append(node.operand)
+            arities.append(node.arity)
+        else:
+            pending.append((node, True))
+            pending.extend((child, False) for child in reversed(node.children))
+
+    return RPNProgram(tokens, opcodes, operands, arities)
+
+
+def optimize(rpn: Union[str, RPNProgram], additional_functions: Optional[Functions] = None, impure: Collection[str] = (),
+             variables: Collection[str] = ()) -> Union[str, RPNProgram]:
+    """Simplify an expression in Reverse Polish Notation before computing it :
+    - the constant sub-expressions are computed once (e.g. 2 pi * becomes 6.283185307179586), including the ones created when converting the
+    unary minus (0 1 - x * becomes x -u) and the scientific notation (1.5 10 3 ^ * becomes 1500.0),
+    - the identity operations are removed (x 0 -, x 1 *, x 1 ^, ...).
+
+    Every function is considered pure (its result only depends on its parameters) unless its name is in impure or it is marked as impure in the
+    registry of functions. The sub-expressions whose result is
+    not a finite number, or which raise an error, are left as they are so that the computation gives the same result or error as before.
+    The expressions which cannot be computed (unknown function, wrong number of parameters) are returned unchanged.
+
+
+    >>> optimize('0 1 - x * 2 pi * +', variables=('x',))
+    'x -u 6.283185307179586 +'
+
+    Args:
+        rpn (str | RPNProgram): RPN expression, or program returned by shunting_yard(..., as_program=True).
+        additional_functions (FunctionDictionary | FunctionRegistry, optional): additional functions, or registry of functions, as in compute_rpn.
+        impure (Collection[str]): names of the functions which should never be computed in advance (e.g. random number generators).
+        variables (Collection[str]): names of the variables, if rpn is a string. They take precedence over functions with the same name.
+
+    Returns:
+        str | RPNProgram: The optimized expression, with the same type as rpn.
+    """
+    program = rpn if isinstance(rpn, RPNProgram) else RPNProgram.parse(rpn, variables)
+
+    functions = as_registry(additional_functions)
+    optimized = _Optimizer(functions, functions.impure | frozenset(impure)).optimize(program)
+    if optimized is None:
+        return rpn
+
+    return optimized if isinstance(rpn, RPNProgram) else str(optimized)
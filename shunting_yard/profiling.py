@@ -0,0 +1,157 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Any, Callable, Iterator, Optional
+
+from shunting_yard.registry import Function
+
+
+class ProfileHook:
+    """Receiver of the measures of the parsing and the computation. Subclass it and override the methods of the measures you need, then
+    enable it with set_profile_hook or profile. The methods do nothing by default.
+
+    The measured stages are :
+    - 'tokenize' : splitting the expression into tokens (including the rewriting with regular expressions), by shunting_yard,
+    - 'parse' : the Shunting-yard algorithm itself on these tokens,
+    - 'compute' : the computation of an RPN expression by compute_rpn, including the calls of the functions.
+    The expressions found in the parsing cache are not parsed again, so they are not measured.
+    """
+
+    def stage(self, name: str, elapsed: float, tokens: int) -> None:
+        """Called after each stage with its wall time in seconds and the number of tokens it processed."""
+
+    def stack_depth(self, depth: int) -> None:
+        """Called after each parsing with the maximum depth of its operator stack."""
+
+    def function(self, name: str, calls: int, elapsed: float) -> None:
+        """Called after each computation, for each function it called, with the number of calls and their cumulative wall time in seconds."""
+
+
+class StageStats:
+    __slots__ = ('calls', 'tokens', 'total_time')
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.tokens = 0
+        self.total_time = 0.0
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(calls={self.calls}, tokens={self.tokens}, total_time={self.total_time})'
+
+
+class FunctionStats:
+    __slots__ = ('calls', 'total_time')
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.total_time = 0.0
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(calls={self.calls}, total_time={self.total_time})'
+
+
+class ProfileCollector(ProfileHook):
+    """Hook adding up the measures : the calls, tokens and time of each stage, the maximum depth of the operator stack, and the calls and time
+    of each function.
+
+
+    >>> with profile() as collector:
+    ...     compute('sin(1) + 2 * 3')
+    >>> collector.functions['sin'].calls
+    1
+    """
+
+    def __init__(self) -> None:
+        self.stages: dict[str, StageStats] = {}
+        self.functions: dict[str, FunctionStats] = {}
+        self.max_stack_depth = 0
+
+    def stage(self, name: str, elapsed: float, tokens: int) -> None:
+        stats = self.stages.get(name)
+        if stats is None:
+            stats = self.stages[name] = StageStats()
+        stats.calls += 1
+        stats.tokens += tokens
+        stats.total_time += elapsed
+
+    def stack_depth(self, depth: int) -> None:
+        self.max_stack_depth = max(self.max_stack_depth, depth)
+
+    def function(self, name: str, calls: int, elapsed: float) -> None:
+        stats = self.functions.get(name)
+        if stats is None:
+            stats = self.functions[name] = FunctionStats()
+        stats.calls += calls
+        stats.total_time += elapsed
+
+    def reset(self) -> None:
+        self.stages.clear()
+        self.functions.clear()
+        self.max_stack_depth = 0
+
+    def report(self) -> str:
+        """Return the measures as a table, with the functions sorted by decreasing cumulative time."""
+        lines = [f"{'stage':<10} {'calls':>8} {'tokens':>10} {'time (s)':>10}"]
+        for name, stats in self.stages.items():
+            lines.append(f'{name:<10} {stats.calls:>8} {stats.tokens:>10} {stats.total_time:>10.6f}')
+        lines.append(f'maximum operator stack depth : {self.max_stack_depth}')
+
+        lines.append(f"{'function':<10} {'calls':>8} {'time (s)':>10}")
+        for name, stats in sorted(self.functions.items(), key=lambda item: item[1].total_time, reverse=True):
+            lines.append(f'{name:<10} {stats.calls:>8} {stats.total_time:>10.6f}')
+        return '\n'.join(lines)
+
+
+# Enabled hook, checked once per call of shunting_yard and compute_rpn : when it is None, nothing is measured. It is a context variable, so
+# each thread (and each asyncio task, from the hook enabled when it was created) only measures its own parsings and computations
+HOOK: ContextVar[Optional[ProfileHook]] = ContextVar('shunting_yard_profile_hook', default=None)
+
+
+def set_profile_hook(hook: Optional[ProfileHook]) -> Optional[ProfileHook]:
+    """Enable the given hook in the current thread (or asyncio task), or disable the profiling if it is None. Return the previous hook."""
+    previous = HOOK.get()
+    HOOK.set(hook)
+    return previous
+
+
+@contextmanager
+def profile(hook: Optional[ProfileHook] = None) -> Iterator[ProfileHook]:
+    """Enable a hook (a new ProfileCollector by default) inside a with block, and give it. Only the current thread (or asyncio task) is
+    measured, and the previous hook is enabled again at the end of the block, so the blocks can be nested.
+
+    Args:
+        hook (ProfileHook, optional): hook to enable (default: None, a new ProfileCollector).
+
+    Returns:
+        Iterator[ProfileHook]: The enabled hook.
+    """
+    hook = ProfileCollector() if hook is None else hook
+    token = HOOK.set(hook)
+    try:
+        yield hook
+    finally:
+        HOOK.reset(token)
+
+
+def _timed(func: Callable[..., Any], stats: list[Any]) -> Callable[..., Any]:
+    # stats is [number of calls, cumulative time]
+    def timed(*parameters: Any) -> Any:
+        start = perf_counter()
+        try:
+            return func(*parameters)
+        finally:
+            stats[1] += perf_counter() - start
+            stats[0] += 1
+    return timed
+
+
+def timed_functions(functions: dict[str, Function]) -> tuple[dict[str, Function], dict[str, list[Any]]]:
+    """Return the given functions replaced by ones measuring their calls, and the measures of each of them."""
+    measures = {name: [0, 0.0] for name in functions}
+    return {name: (param_count, _timed(func, measures[name])) for name, (param_count, func) in functions.items()}, measures
+
+
+def report_functions(hook: ProfileHook, measures: dict[str, list[Any]]) -> None:
+    for name, (calls, elapsed) in measures.items():
+        if calls:
+            hook.function(name, calls, elapsed)
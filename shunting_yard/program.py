@@ -0,0 +1,131 @@
+from typing import Any, Callable, Collection, Iterable, Iterator, Optional, TYPE_CHECKING, Union
+
+from shunting_yard.constants import ARITY_SEPARATOR, NUMBER_CHARS
+
+if TYPE_CHECKING:
+    from decimal import Decimal
+    from fractions import Fraction
+
+
+# Opcodes of the instructions of an RPN program
+NUMBER = 0
+VARIABLE = 1
+FUNCTION = 2
+
+
+# Type of the numbers with a dot or an exponent : float, or Decimal or Fraction for exact numbers
+NumberType = Callable[[str], Union[float, 'Decimal', 'Fraction']]
+
+
+def convert_number(token: str, number_type: NumberType = float):
+    # Convert to int, or to number_type if there is a dot or an exponent (e.g. 1.5e-3), so that the number is exactly the one written
+    return number_type(token) if '.' in token or 'e' in token else int(token)
+
+
+def split_arity(token: str) -> tuple[str, Optional[int]]:
+    """Split a function token into the name of the function and its number of parameters, if it is written (e.g. max@3).
+
+    Raises:
+        ValueError: raised if the number of parameters is not a number.
+    """
+    name, separator, arity = token.partition(ARITY_SEPARATOR)
+    if not separator:
+        return token, None
+    if not arity.isdigit() or not name:
+        raise ValueError(f'Wrong function call : {token}')
+    return name, int(arity)
+
+
+def join_arity(name: str, arity: int) -> str:
+    return f'{name}{ARITY_SEPARATOR}{arity}'
+
+
+class RPNProgram:
+    """Expression in Reverse Polish Notation stored as parallel tuples : the opcode of each instruction (NUMBER, VARIABLE or FUNCTION),
+    its operand (the value of the number, or the name of the variable or function), the number of parameters of the function calls whose number
+    of parameters is written in the expression (None for the others) and the original token. The numbers are converted only once, when the
+    program is created, and the tokens do not need to be split or classified again when computing it.
+    The string form of a program (str(program)) is the usual space-separated RPN expression.
+
+
+    >>> program = shunting_yard('2x + 1', variable='x', as_program=True)
+    >>> program.opcodes
+    (0, 1, 2, 0, 2)
+    >>> program.operands
+    (2, 'x', '*', 1, '+')
+    >>> str(program)
+    '2 x * 1 +'
+    """
+
+    __slots__ = ('tokens', 'opcodes', 'operands', 'arities')
+
+    def __init__(self, tokens: Iterable[str], opcodes: Iterable[int], operands: Iterable[Any], arities: Optional[Iterable[Optional[int]]] = None) -> None:
+        self.tokens: tuple[str, ...] = tuple(tokens)
+        self.opcodes: tuple[int, ...] = tuple(opcodes)
+        self.operands: tuple[Any, ...] = tuple(operands)
+        self.arities: tuple[Optional[int], ...] = (None,) * len(self.tokens) if arities is None else tuple(arities)
+
+    @classmethod
+    def from_tokens(cls, tokens: Iterable[str], variables: Collection[str] = (), number_type: NumberType = float) -> 'RPNProgram':
+        """Create a program from the tokens of an RPN expression.
+
+        Args:
+            tokens (Iterable[str]): tokens of the RPN expression, in order.
+            variables (Collection[str]): names of the variables. The other names are functions, whose number of parameters can be written
+            after their name (e.g. max@3).
+            number_type (type): type of the numbers with a dot or an exponent (e.g. 1.5 or 1.5e-3) : float, or Decimal or Fraction to keep
+            them exact. The numbers without them are int (default: float).
+
+        Raises:
+            ValueError: raised if a token starting with a digit or a dot is not a valid number, or if a number of parameters is not valid.
+
+        Returns:
+            RPNProgram: The program.
+        """
+        tokens = tuple(tokens)
+        opcodes: list[int] = []
+        operands: list[Any] = []
+        arities: list[Optional[int]] = []
+
+        for token in tokens:
+            if token[0] in NUMBER_CHARS:
+                opcodes.append(NUMBER)
+                operands.append(convert_number(token, number_type))
+                arities.append(None)
+            elif token in variables:
+                opcodes.append(VARIABLE)
+                operands.append(token)
+                arities.append(None)
+            else:
+                # Only the calls of variadic functions have their number of parameters written after their name
+                name, arity = split_arity(token) if ARITY_SEPARATOR in token else (token, None)
+                opcodes.append(FUNCTION)
+                operands.append(name)
+                arities.append(arity)
+
+        return cls(tokens, opcodes, operands, arities)
+
+    @classmethod
+    def parse(cls, rpn: str, variables: Collection[str] = (), number_type: NumberType = float) -> 'RPNProgram':
+        """Create a program from its string form, the space-separated RPN expression."""
+        return cls.from_tokens(rpn.split(), variables, number_type)
+
+    def __iter__(self) -> Iterator[tuple[int, Any]]:
+        return zip(self.opcodes, self.operands)
+
+    def __len__(self) -> int:
+        return len(self.opcodes)
+
+    def __str__(self) -> str:
+        return ' '.join(self.tokens)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}.parse({str(self)!r})'
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, RPNProgram):
+            return NotImplemented
+        return self.tokens == other.tokens and self.opcodes == other.opcodes
+
+    def __hash__(self) -> int:
+        return hash((self.tokens, self.opcodes))
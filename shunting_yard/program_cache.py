@@ -0,0 +1,225 @@
+import hashlib
+import marshal
+import mmap
+import os
+import struct
+import sys
+from typing import Any, Collection, Optional
+
+from shunting_yard.compiler import CompiledExpression
+from shunting_yard.program import RPNProgram
+from shunting_yard.rpn import as_registry, Functions
+from shunting_yard.shunting_yard import shunting_yard, variable_names
+
+
+# File format : a header, the records (one marshal-encoded tuple per program), then the index of the records sorted by the digest of their key,
+# so that a program can be found by a binary search in the memory-mapped file without reading the others
+MAGIC = b'SYPC'
+VERSION = 2
+# The format of marshal can change between Python versions, so the files are only read by the version which wrote them
+_HEADER = struct.Struct('<4sIIBBIQ') # magic, version, marshal version, Python major and minor version, number of records, offset of the index
+_PYTHON_VERSION = sys.version_info[:2]
+_ENTRY = struct.Struct('<16sQI') # digest of the key, offset and length of the record
+
+Key = tuple[Any, ...]
+
+
+class ProgramCacheError(Exception):
+    pass
+
+
+def _digest(key: Key) -> bytes:
+    # The representation of the key is used rather than marshal, whose output depends on the references between the objects
+    return hashlib.blake2b(repr(key).encode(), digest_size=16).digest()
+
+
+class ProgramCache:
+    """Cache of parsed expressions stored in a file, to avoid parsing the same expressions again each time a process starts.
+    The programs (RPNProgram) are stored with the names of their functions, never the functions themselves, and are found with their
+    expression, the options of the parsing and the fingerprint of the registry of functions.
+
+    The file is memory-mapped when the cache is opened, and only the programs which are used are read and decoded, so the time
+    taken by the start of a process depends on the number of expressions it uses, not on the size of the file. The new programs
+    are only written in the file by save.
+
+
+    >>> with ProgramCache('formulas.cache') as cache:
+    ...     compiled = cache.compile('2x + 1', variables=('x',))
+    ...     cache.save()
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Args:
+            path (str): path of the file of the cache. It is created by save if it does not exist.
+
+        Raises:
+            ProgramCacheError: raised if the file is not a cache file, or was written by another version of the cache or of Python.
+        """
+        self.path = path
+        self._file = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._count = 0
+        self._index_offset = 0
+        # Programs added since the file was opened, encoded, by digest of their key
+        self._new_records: dict[bytes, bytes] = {}
+        self._open()
+
+    def _open(self) -> None:
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return
+
+        self._file = open(self.path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mmap) < _HEADER.size:
+            self.close()
+            raise ProgramCacheError(f'Not a program cache file : {self.path}')
+
+        magic, version, marshal_version, major, minor, self._count, self._index_offset = _HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != VERSION or self._index_offset + self._count * _ENTRY.size > len(self._mmap):
+            self.close()
+            raise ProgramCacheError(f'Not a program cache file, or written by another version : {self.path}')
+        if marshal_version != marshal.version or (major, minor) != _PYTHON_VERSION:
+            self.close()
+            raise ProgramCacheError(f'Program cache file written by Python {major}.{minor} (marshal version {marshal_version}) : {self.path}')
+
+    @staticmethod
+    def key(expression: str, variables: Collection[str] = (), functions: Optional[Functions] = None, case_sensitive: bool = True,
+            convert_scientific_notation: bool = True, scientific_literals: bool = False) -> Key:
+        """Key of an expression parsed with the given options, which only contains strings, booleans and tuples so that it can be encoded."""
+        return (expression, tuple(sorted(variables)), as_registry(functions).fingerprint, case_sensitive, convert_scientific_notation, scientific_literals)
+
+    def _find(self, digest: bytes) -> Optional[bytes]:
+        """Return the encoded record with the given digest, looking first in the new ones, then in the file."""
+        record = self._new_records.get(digest)
+        return record if record is not None else self._find_in_file(digest)
+
+    def _find_in_file(self, digest: bytes) -> Optional[bytes]:
+        # Binary search in the index
+        if self._mmap is None:
+            return None
+
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            entry_digest, offset, length = _ENTRY.unpack_from(self._mmap, self._index_offset + middle * _ENTRY.size)
+            if entry_digest == digest:
+                return self._mmap[offset:offset + length]
+            if entry_digest < digest:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def get(self, expression: str, variables: Collection[str] = (), functions: Optional[Functions] = None, case_sensitive: bool = True,
+            convert_scientific_notation: bool = True, scientific_literals: bool = False) -> Optional[RPNProgram]:
+        """Return the program of the expression parsed with the given options, or None if it is not in the cache.
+        See shunting_yard for the parameters.
+
+        Raises:
+            ProgramCacheError: raised if the record of the program in the file is corrupt.
+        """
+        key = self.key(expression, variables, functions, case_sensitive, convert_scientific_notation, scientific_literals)
+        record = self._find(_digest(key))
+        if record is None:
+            return None
+
+        # The digest identifies the options as well, only the expression is stored to check it
+        try:
+            record_expression, tokens, opcodes, operands, arities = marshal.loads(record)
+        except (EOFError, TypeError, ValueError) as error:
+            raise ProgramCacheError(f'Corrupt record in the program cache file : {self.path}') from error
+        if record_expression != expression:
+            return None
+        return RPNProgram(tokens, opcodes, operands, arities)
+
+    def put(self, program: RPNProgram, expression: str, variables: Collection[str] = (), functions: Optional[Functions] = None, case_sensitive: bool = True,
+            convert_scientific_notation: bool = True, scientific_literals: bool = False) -> None:
+        """Add the program of the expression parsed with the given options to the cache. It is written in the file by save.
+
+        Raises:
+            ValueError: raised if the numbers of the program are not int or float (e.g. Decimal).
+        """
+        key = self.key(expression, variables, functions, case_sensitive, convert_scientific_notation, scientific_literals)
+        self._new_records[_digest(key)] = marshal.dumps((expression, program.tokens, program.opcodes, program.operands, program.arities))
+
+    def shunting_yard(self, expression: str, variables: Collection[str] = (), functions: Optional[Functions] = None, case_sensitive: bool = True,
+                      convert_scientific_notation: bool = True, scientific_literals: bool = False) -> RPNProgram:
+        """Return the program of the expression, parsing it with shunting_yard(..., as_program=True) and adding it to the cache if it is not
+        in the cache yet.
+        """
+        program = self.get(expression, variables, functions, case_sensitive, convert_scientific_notation, scientific_literals)
+        if program is None:
+            program = shunting_yard(expression, case_sensitive, variables, convert_scientific_notation, as_program=True, functions=functions,
+                                    scientific_literals=scientific_literals)
+            self.put(program, expression, variables, functions, case_sensitive, convert_scientific_notation, scientific_literals)
+        return program
+
+    def compile(self, expression: str, variables: Collection[str] = (), functions: Optional[Functions] = None, case_sensitive: bool = True,
+                convert_scientific_notation: bool = True, scientific_literals: bool = False) -> CompiledExpression:
+        """Compile the expression as the compile function, taking its program from the cache if possible.
+
+        Raises:
+            MismatchedBracketsError: raised if the bracket are unbalanced.
+            ValueError: raised if an unknown function is in the expression.
+            WrongExpressionError: raised if a function does not have enough parameters or if the expression does not give only one result.
+        """
+        variables = variable_names(variables, case_sensitive)
+        program = self.shunting_yard(expression, variables, functions, case_sensitive, convert_scientific_notation, scientific_literals)
+        return CompiledExpression(program, variables, functions, case_sensitive)
+
+    def save(self) -> None:
+        """Write the programs of the file and the new ones in the file, replacing it atomically. The records already in the file are copied
+        without being decoded.
+        """
+        entries: dict[bytes, Optional[tuple[int, int]]] = {}
+        if self._mmap is not None:
+            for position in range(self._count):
+                digest, offset, length = _ENTRY.unpack_from(self._mmap, self._index_offset + position * _ENTRY.size)
+                entries[digest] = (offset, length)
+        for digest in self._new_records:
+            entries[digest] = None
+
+        index: list[tuple[bytes, int, int]] = []
+        temporary_path = f'{self.path}.{os.getpid()}.tmp'
+        with open(temporary_path, 'wb') as file:
+            file.write(bytes(_HEADER.size))
+            offset = _HEADER.size
+            for digest, location in entries.items():
+                record = self._new_records[digest] if location is None else self._mmap[location[0]:location[0] + location[1]]
+                file.write(record)
+                index.append((digest, offset, len(record)))
+                offset += len(record)
+
+            index.sort()
+            for entry in index:
+                file.write(_ENTRY.pack(*entry))
+            file.seek(0)
+            file.write(_HEADER.pack(MAGIC, VERSION, marshal.version, *_PYTHON_VERSION, len(index), offset))
+
+        self.close()
+        os.replace(temporary_path, self.path)
+        self._new_records.clear()
+        self._open()
+
+    def close(self) -> None:
+        """Close the file. The programs which were not saved are still available."""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count + sum(1 for digest in self._new_records if self._find_in_file(digest) is None)
+
+    def __enter__(self) -> 'ProgramCache':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.path!r}, {len(self)} programs)'
@@ -0,0 +1,137 @@
+from typing import Any, Callable, Iterable, Iterator, Mapping, Optional
+
+
+# Number of parameters of a function, and the function itself
+Function = tuple[int, Callable[..., Any]]
+
+# Number of parameters of the functions accepting any number of parameters
+VARIADIC = -1
+
+
+class FunctionRegistry(Mapping[str, Function]):
+    """Immutable set of functions usable in the expressions, mapping each name to its number of parameters and the function itself
+    (the same format as the additional_functions of compute_rpn).
+
+    A registry is made of layers : overlay returns a new registry which adds or replaces some functions, without copying or modifying the
+    registry it is based on. Registries are hashable, and equal when they contain the same functions, so they can be used as keys of caches.
+    Some functions can be marked as impure (their result does not only depend on their parameters), so that they are never computed in advance.
+    The functions registered with VARIADIC as their number of parameters accept any number of parameters.
+
+
+    >>> registry = BUILTIN_FUNCTIONS.overlay({'inc': (1, lambda x:x+1)})
+    >>> compute_rpn('1 inc', registry)
+    2
+    >>> 'inc' in BUILTIN_FUNCTIONS
+    False
+    """
+
+    __slots__ = ('_layer', '_parent', '_impure', '_flattened', '_hash', '_variadic', '_fingerprint')
+
+    def __init__(self, functions: Optional[Mapping[str, Function]] = None, impure: Iterable[str] = (), parent: Optional['FunctionRegistry'] = None) -> None:
+        """
+        Args:
+            functions (Mapping[str, tuple[int, Callable]], optional): functions of the registry, or added to the parent registry.
+            impure (Iterable[str]): names of the functions of this layer (or of the parent registry) which are impure.
+            parent (FunctionRegistry, optional): registry whose functions are available too, unless replaced by the ones of this layer.
+        """
+        self._layer: dict[str, Function] = dict(functions or {})
+        self._parent = parent
+
+        # A function replaced by this layer is only impure if this layer says so
+        inherited_impure = frozenset() if parent is None else parent.impure.difference(self._layer)
+        self._impure = inherited_impure | frozenset(impure)
+
+        self._flattened: Optional[dict[str, Function]] = None
+        self._hash: Optional[int] = None
+        self._variadic: Optional[frozenset[str]] = None
+        self._fingerprint: Optional[str] = None
+
+    @property
+    def impure(self) -> frozenset[str]:
+        return self._impure
+
+    @property
+    def variadic(self) -> frozenset[str]:
+        """Names of the variadic functions."""
+        if self._variadic is None:
+            self._variadic = frozenset(name for name, (param_count, _) in self._flatten().items() if param_count == VARIADIC)
+        return self._variadic
+
+    @property
+    def fingerprint(self) -> str:
+        """Digest of the names, numbers of parameters and purity of the functions, and of the module and qualified name of each function.
+        Unlike the hash of the registry, it is the same in every process, so it can identify the registry in files.
+        """
+        if self._fingerprint is None:
+            import hashlib
+            digest = hashlib.sha256()
+            for name, (param_count, func) in sorted(self._flatten().items()):
+                module = getattr(func, '__module__', None) or type(func).__module__
+                qualname = getattr(func, '__qualname__', None) or type(func).__qualname__
+                digest.update(repr((name, param_count, module, qualname, name in self._impure)).encode())
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+    @property
+    def parent(self) -> Optional['FunctionRegistry']:
+        return self._parent
+
+    def overlay(self, functions: Optional[Mapping[str, Function]] = None, impure: Iterable[str] = ()) -> 'FunctionRegistry':
+        """Return a new registry containing the functions of this one, as well as the given functions which replace the ones with the same name.
+
+        Args:
+            functions (Mapping[str, tuple[int, Callable]], optional): functions to add.
+            impure (Iterable[str]): names of the impure functions, among the added ones or the ones of this registry.
+
+        Returns:
+            FunctionRegistry: The new registry. This one is not modified.
+        """
+        return FunctionRegistry(functions, impure, self)
+
+    def resolve(self, names: Iterable[str]) -> dict[str, Function]:
+        """Look up the given names once, and return a dictionary containing the ones which are functions of the registry."""
+        resolved: dict[str, Function] = {}
+        for name in set(names):
+            function = self.get(name)
+            if function is not None:
+                resolved[name] = function
+        return resolved
+
+    def _flatten(self) -> dict[str, Function]:
+        if self._flattened is None:
+            flattened = {} if self._parent is None else dict(self._parent._flatten())
+            flattened.update(self._layer)
+            self._flattened = flattened
+        return self._flattened
+
+    def __getitem__(self, name: str) -> Function:
+        registry: Optional[FunctionRegistry] = self
+        while registry is not None:
+            layer = registry._layer
+            if name in layer:
+                return layer[name]
+            registry = registry._parent
+        raise KeyError(name)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._flatten())
+
+    def __len__(self) -> int:
+        return len(self._flatten())
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, FunctionRegistry):
+            return NotImplemented
+        return self is other or (self._impure == other._impure and self._flatten() == other._flatten())
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash((frozenset(self._flatten().items()), self._impure))
+        return self._hash
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # The caches are not sent, only the layers
+        return (self.__class__, (self._layer, self._impure, self._parent))
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({sorted(self)!r}, impure={sorted(self._impure)!r})'
@@ -1,8 +1,13 @@
+from functools import partial
 import math
 from operator import add, mul, neg, pos, sub, truediv
-from typing import Any, Callable, Optional, Union
+from time import perf_counter
+from typing import Any, Callable, Mapping, Optional, Sequence, Union
 
-from shunting_yard.constants import NUMBER_CHARS
+from shunting_yard import profiling
+from shunting_yard.constants import ARITY_SEPARATOR, NUMBER_CHARS
+from shunting_yard.program import FUNCTION, NUMBER, NumberType, RPNProgram, split_arity
+from shunting_yard.registry import Function, FunctionRegistry, VARIADIC
 
 
 class WrongExpressionError(Exception):
@@ -11,6 +16,35 @@ class WrongExpressionError(Exception):
 
 Number = Union[int, float]
 FunctionDictionary = dict[str, tuple[int, Callable[[Any], Number]]]
+Bindings = Mapping[str, Number]
+# Functions given to the computations : a registry replacing the default functions, or a dictionary of functions added to them
+Functions = Union[FunctionDictionary, FunctionRegistry]
+
+
+def _pi() -> float:
+    return math.pi
+
+
+def _e() -> float:
+    return math.e
+
+
+def _minimum(*values: Number) -> Number:
+    return min(values)
+
+
+def _maximum(*values: Number) -> Number:
+    return max(values)
+
+
+def _sum(*values: Number) -> Number:
+    return sum(values)
+
+
+def _mean(*values: Number) -> float:
+    import statistics
+    return statistics.fmean(values)
+
 
 FUNCTIONS: FunctionDictionary = {
     '+': (2, add),
@@ -20,25 +54,91 @@ FUNCTIONS: FunctionDictionary = {
     '*': (2, mul),
     '/': (2, truediv),
     '^': (2, pow),
-    'pi': (0, lambda:math.pi),
-    'e': (0, lambda:math.exp(1)),
+    'pi': (0, _pi),
+    'e': (0, _e),
     'sqrt': (1, math.sqrt),
     'sin': (1, math.sin),
     'cos': (1, math.cos),
     'tan': (1, math.tan),
-    'min': (2, min),
+    'min': (VARIADIC, _minimum),
     'min3': (3, min),
     'min4': (4, min),
-    'max': (2, max),
+    'max': (VARIADIC, _maximum),
     'max3': (3, max),
     'max4': (4, max),
+    'sum': (VARIADIC, _sum),
+    'mean': (VARIADIC, _mean),
     'abs': (1, abs)
 }
 
+# Number of parameters of a variadic function when it is not written in the expression (e.g. '1 2 max' instead of '1 2 3 max@3')
+DEFAULT_VARIADIC_ARITY = 2
+
+# Registry of the default functions. It is a copy of FUNCTIONS, which is never modified by the computations
+BUILTIN_FUNCTIONS = FunctionRegistry(FUNCTIONS)
+# Functions of BUILTIN_FUNCTIONS as a dictionary, which is looked up by the computations with the default functions
+BUILTIN_TABLE = BUILTIN_FUNCTIONS._flatten()
 
-def compute_rpn(rpn: str, additional_functions: Optional[FunctionDictionary] = None) -> Number:
+
+def as_registry(functions: Optional[Functions] = None) -> FunctionRegistry:
+    """Return the registry to use for the given functions : the default functions if it is None, the registry itself, or the
+    default functions overlaid with the dictionary.
+    """
+    if functions is None:
+        return BUILTIN_FUNCTIONS
+    if isinstance(functions, FunctionRegistry):
+        return functions
+    return BUILTIN_FUNCTIONS.overlay(functions)
+
+
+def _function_table(functions: Optional[Functions] = None) -> Mapping[str, Function]:
+    """Return the functions to use as a dictionary, without creating a registry. It must not be modified."""
+    if functions is None:
+        return BUILTIN_TABLE
+    if isinstance(functions, FunctionRegistry):
+        return functions._flatten()
+    return {**BUILTIN_TABLE, **functions}
+
+
+def _exact_constants(functions: Mapping[str, Function], number_type: NumberType) -> dict[str, Function]:
+    """Return the default constants (pi and e) of functions replaced by ones giving number_type, so that they can be used with its numbers."""
+    constants: dict[str, Function] = {}
+    if number_type is not float:
+        for name, value in (('pi', math.pi), ('e', math.e)):
+            if functions.get(name) == FUNCTIONS[name]:
+                # The constant is exactly the float written as a number, as 3.141592653589793 would be
+                constants[name] = (0, partial(number_type, repr(value)))
+    return constants
+
+
+def exact_functions(functions: Optional[Functions], number_type: NumberType) -> Optional[Functions]:
+    """Return the functions to use with numbers of number_type : the given ones, whose default constants pi and e give numbers of number_type
+    instead of float if it is not float (e.g. Decimal('3.141592653589793')).
+    """
+    registry = as_registry(functions)
+    constants = _exact_constants(registry, number_type)
+    return registry.overlay(constants) if constants else functions
+
+
+def get_param_count(name: str, param_count: int, arity: Optional[int]) -> int:
+    """Return the number of parameters given to a function, from the number of parameters it is registered with and the one written in
+    the expression (if any).
+
+    Raises:
+        WrongExpressionError: raised if the function does not accept the number of parameters written in the expression.
+    """
+    if param_count == VARIADIC:
+        return DEFAULT_VARIADIC_ARITY if arity is None else arity
+    if arity is not None and arity != param_count:
+        raise WrongExpressionError(f"Wrong number of parameters for function '{name}' : {arity} given, {param_count} expected.")
+    return param_count
+
+
+def compute_rpn(rpn: Union[str, RPNProgram], additional_functions: Optional[Functions] = None,
+                variables: Optional[Union[Bindings, Sequence[Bindings]]] = None, number_type: NumberType = float) -> Union[Number, list[Number]]:
     """Compute the value of an expression in the Reverse Polish Notation format (see https://en.wikipedia.org/wiki/Reverse_Polish_notation for more details).
-    The included function are the five base operations (+-*/^), sin, cos, tan, sqrt, abs, min, max and e and pi as constants.
+    The included function are the five base operations (+-*/^), sin, cos, tan, sqrt, abs, min, max, sum, mean and e and pi as constants.
+    min, max, sum and mean are variadic : they take the number of parameters written after their name (e.g. max@3), or 2 if there is none.
     The additional_functions parameters enables more function to be used in the computation. See below for its format.
 
 
@@ -51,47 +151,167 @@ def compute_rpn(rpn: str, additional_functions: Optional[FunctionDictionary] = N
     >>> compute_rpn("pi 2 / sin")
     1.0
 
+    >>> compute_rpn("x y *", variables={'x': 2, 'y': 3})
+    6
+
+    >>> compute_rpn("x 1 +", variables=[{'x': 1}, {'x': 2}])
+    [2, 3]
+
     Args:
-        rpn (str): RPN expression.
-        additional_functions (FunctionDictionary): dictionary containing more functions. The keys should be string, and the values should be a tuple
-        containing first the number of parameters of the function (>= 0), and then the function itself. For example {'inc': (1, lambda x:x+1)} will
-        enable the computation to use the inc function. If the function exists by default, it will be overwritten.
+        rpn (str | RPNProgram): RPN expression, or program returned by shunting_yard(..., as_program=True).
+        additional_functions (FunctionDictionary | FunctionRegistry): dictionary containing more functions. The keys should be string, and the values should be
+        a tuple containing first the number of parameters of the function (>= 0, or VARIADIC), and then the function itself. For example {'inc': (1, lambda x:x+1)}
+        will enable the computation to use the inc function. If the function exists by default, it will be overwritten for this computation only.
+        It can also be a FunctionRegistry, whose functions are used instead of the default ones.
+        variables (Bindings | Sequence[Bindings], optional): value of each variable, as a dictionary whose keys are the variables names. Variables
+        take precedence over functions with the same name. If it is a sequence of such dictionaries, the expression is computed for each of them.
+        number_type (type, optional): type of the numbers of rpn with a dot or an exponent (e.g. 1.5e-3), if it is a string : float, or Decimal or
+        Fraction for exact arithmetic (default: float). If it is not float, the default constants pi and e are converted into it too (see exact_functions).
 
     Raises:
-        ValueError: raised if an unknown function is in the expression.
+        ValueError: raised if an unknown function or a wrong number is in the expression, or if a variable has no value.
 
     Returns:
-        Number: The result of the operation.
+        Number | list[Number]: The result of the operation, or the list of results if variables is a sequence.
     """
 
-    functions = FUNCTIONS
-    if additional_functions is not None:
-        functions.update(additional_functions)
+    hook = profiling.HOOK.get()
+    if hook is not None:
+        start = perf_counter()
+
+    # A string computed once is computed directly from its tokens : creating a program only pays off when it is computed several times
+    if hook is None and isinstance(rpn, str) and (variables is None or isinstance(variables, Mapping)):
+        functions = _function_table(additional_functions)
+        if number_type is not float:
+            functions = {**functions, **_exact_constants(functions, number_type)}
+        return _compute_tokens(rpn, functions, variables or {}, number_type)
+
+    program = rpn if isinstance(rpn, RPNProgram) else RPNProgram.parse(rpn, number_type=number_type)
+    functions = _function_table(additional_functions)
+    if number_type is not float:
+        functions = {**functions, **_exact_constants(functions, number_type)}
+
+    if hook is not None:
+        return _profiled_compute(hook, start, program, functions, variables)
+
+    calls = _resolve_calls(program, functions)
+    if variables is None or isinstance(variables, Mapping):
+        return _compute_program(program, calls, variables or {})
+
+    return [_compute_program(program, calls, bindings) for bindings in variables]
+
+
+def _profiled_compute(hook: profiling.ProfileHook, start: float, program: RPNProgram, functions: Mapping[str, Function],
+                      variables: Optional[Union[Bindings, Sequence[Bindings]]]) -> Union[Number, list[Number]]:
+    # Only the functions used by the expression are measured
+    functions, measures = profiling.timed_functions({name: functions[name] for opcode, name in program if opcode == FUNCTION and name in functions})
+    calls = _resolve_calls(program, functions)
 
+    if variables is None or isinstance(variables, Mapping):
+        result = _compute_program(program, calls, variables or {})
+        tokens = len(program)
+    else:
+        result = [_compute_program(program, calls, bindings) for bindings in variables]
+        tokens = len(program) * len(result)
+
+    hook.stage('compute', perf_counter() - start, tokens)
+    profiling.report_functions(hook, measures)
+    return result
+
+
+def _compute_tokens(rpn: str, functions: Mapping[str, Function], variables: Bindings, number_type: NumberType) -> Number:
     stack: list[Number] = []
+    push = stack.append
+    pop = stack.pop
+    number_chars = NUMBER_CHARS
+    separator = ARITY_SEPARATOR
 
     for token in rpn.split():
-        if token[0] in NUMBER_CHARS:
-            # Convert to float or int according to the presence of a dot
-            stack.append(float(token) if '.' in token else int(token))
+        if token[0] in number_chars:
+            # Convert to int, or to number_type if there is a dot or an exponent, as convert_number does
+            push(number_type(token) if '.' in token or 'e' in token else int(token))
+        elif variables and token in variables:
+            push(variables[token])
+        else:
+            arity = None
+            if separator in token:
+                token, arity = split_arity(token)
+            function = functions.get(token)
+            if function is None:
+                raise ValueError(f'Unknown function : {token}')
+
+            param_count, func = function
+            if param_count < 0 or arity is not None:
+                param_count = get_param_count(token, param_count, arity)
+
+            if len(stack) < param_count:
+                raise WrongExpressionError(f"Not enough parameters for function '{token}' : {len(stack)} found, {param_count} expected.")
+            # The operators and the functions of one parameter replace the top of the stack, without building a list of parameters
+            if param_count == 2:
+                right = pop()
+                stack[-1] = func(stack[-1], right)
+            elif param_count == 1:
+                stack[-1] = func(stack[-1])
+            # Seperate both cases because l[-0:] is all the list and not an empty one
+            elif param_count > 0:
+                # Only the parameters are copied and removed, so each call is O(param_count) and not O(len(stack))
+                parameters = stack[-param_count:]
+                del stack[-param_count:]
+                push(func(*parameters))
+            else:
+                push(func())
+
+    if len(stack) > 1:
+        raise WrongExpressionError("Expression does not give only one result.")
+
+    return stack[0]
+
+
+def _resolve_calls(program: RPNProgram, functions: Mapping[str, Function]) -> list[Optional[Function]]:
+    """Return the number of parameters and the function of each function call of the program (None for the other instructions and the
+    unknown functions), so that the numbers of parameters are checked once for all the bindings.
+
+    Raises:
+        WrongExpressionError: raised if a function does not accept the number of parameters written in the expression.
+    """
+    calls: list[Optional[Function]] = []
+    for opcode, token, arity in zip(program.opcodes, program.operands, program.arities):
+        function = functions.get(token) if opcode == FUNCTION else None
+        if function is not None and (function[0] < 0 or arity is not None):
+            function = get_param_count(token, function[0], arity), function[1]
+        calls.append(function)
+    return calls
+
+
+def _compute_program(program: RPNProgram, calls: list[Optional[Function]], variables: Bindings) -> Number:
+    stack: list[Number] = []
+
+    for opcode, token, arity, call in zip(program.opcodes, program.operands, program.arities, calls):
+        if opcode == NUMBER:
+            stack.append(token)
+        elif token in variables and arity is None:
+            stack.append(variables[token])
         else:
-            if not token in functions:
+            if opcode != FUNCTION:
+                raise ValueError(f'Missing value for variable : {token}')
+            if call is None:
                 raise ValueError(f'Unknown function : {token}')
 
-            param_count, func = functions[token]
+            param_count, func = call
 
             # Seperate both cases because l[-0:] is all the list and not an empty one
             if param_count > 0:
                 if len(stack) < param_count:
                     raise WrongExpressionError(f"Not enough parameters for function '{token}' : {len(stack)} found, {param_count} expected.")
+                # Only the parameters are copied and removed, so each call is O(param_count) and not O(len(stack))
                 parameters = stack[-param_count:]
-                stack = stack[:-param_count]
+                del stack[-param_count:]
             else:
                 parameters = []
 
             stack.append(func(*parameters))
 
     if len(stack) > 1:
-        raise WrongExpressionError(f"Expression does not give only one result.")
+        raise WrongExpressionError("Expression does not give only one result.")
 
     return stack[0]
@@ -0,0 +1,306 @@
+from string import whitespace
+from typing import Iterator, Optional
+
+from shunting_yard.constants import BASE_OPERATORS, FUNCTION_FIRST_CHARS
+
+
+# Character classes
+DIGIT = 0
+DOT = 1
+LETTER = 2
+OPERATOR = 3
+OPENING_BRACKET = 4
+CLOSING_BRACKET = 5
+SEPARATOR = 6
+SPACE = 7
+OTHER = 8
+
+class _CharClasses(dict):
+    """Table of the class of each character. The non ASCII characters are classified when first seen."""
+
+    def __missing__(self, char: str) -> int:
+        char_class = SPACE if char.isspace() else OTHER
+        self[char] = char_class
+        return char_class
+
+
+CHAR_CLASSES: dict[str, int] = _CharClasses()
+CHAR_CLASSES.update(dict.fromkeys('0123456789', DIGIT))
+CHAR_CLASSES['.'] = DOT
+CHAR_CLASSES.update(dict.fromkeys(FUNCTION_FIRST_CHARS, LETTER))
+CHAR_CLASSES.update(dict.fromkeys(BASE_OPERATORS, OPERATOR))
+CHAR_CLASSES['('] = OPENING_BRACKET
+CHAR_CLASSES[')'] = CLOSING_BRACKET
+CHAR_CLASSES.update(dict.fromkeys(',;', SEPARATOR))
+CHAR_CLASSES.update(dict.fromkeys(whitespace, SPACE))
+
+# Classes of the characters before which a '*' is inserted (implicit multiplication), after a number and after a closing bracket
+AFTER_NUMBER_MULTIPLICATION = frozenset((LETTER, OPENING_BRACKET, OTHER))
+AFTER_BRACKET_MULTIPLICATION = frozenset((DIGIT, DOT, LETTER, OPENING_BRACKET, OTHER))
+
+UNARY_MINUS_TOKENS = ('(', '0', '-', '1', ')', '*')
+
+Token = tuple[str, int]
+# Offset of the start of a lexeme (the characters the main loop of the scanner processes at once), the state of the scanner there (whether
+# the last token is infix, and whether the last character is a (non ASCII) letter or digit), and the offset of the furthest character
+# read so far, as the exponent of the scientific notation is looked for after the end of a lexeme
+Boundary = tuple[int, bool, bool, int]
+
+
+def _clean(text: str, has_spaces: bool) -> str:
+    return ''.join(text.split()) if has_spaces else text
+
+
+class _Scanner:
+    """Single pass over the expression. See the scan function."""
+
+    __slots__ = ('string', 'length', 'convert_scientific_notation', 'scientific_literals', 'reach')
+
+    def __init__(self, string: str, convert_scientific_notation: bool, scientific_literals: bool = False) -> None:
+        self.string = string
+        self.length = len(string)
+        self.convert_scientific_notation = convert_scientific_notation
+        self.scientific_literals = scientific_literals
+        # Offset of the furthest character read when looking for an exponent
+        self.reach = 0
+
+    def _skip_spaces(self, cursor: int) -> int:
+        string, length = self.string, self.length
+        while cursor < length and CHAR_CLASSES[string[cursor]] == SPACE:
+            cursor += 1
+        return cursor
+
+    def _class_at(self, cursor: int) -> Optional[int]:
+        return CHAR_CLASSES[self.string[cursor]] if cursor < self.length else None
+
+    def _read_exponent(self, cursor: int) -> Optional[tuple[str, int, str, int, int]]:
+        """Read the exponent of a number in scientific notation, starting just after the 'e'.
+        Return its sign and the offset of the sign, its digits and their offset, and the offset of the next character, or None if there is no exponent.
+        """
+        string = self.string
+        cursor = self._skip_spaces(cursor)
+        sign, sign_offset = '', cursor
+        if cursor < self.length and string[cursor] in '+-':
+            sign = string[cursor]
+            cursor = self._skip_spaces(cursor + 1)
+
+        start = cursor
+        has_spaces = False
+        while cursor < self.length:
+            char_class = CHAR_CLASSES[string[cursor]]
+            if char_class == DIGIT:
+                cursor += 1
+            elif char_class == SPACE:
+                has_spaces = True
+                cursor += 1
+            else:
+                break
+
+        if cursor > self.reach:
+            self.reach = cursor
+        if cursor == start:
+            return None
+        return sign, sign_offset, _clean(string[start:cursor], has_spaces), start, cursor
+
+    def _scientific_notation(self, e_offset: int, exponent: tuple[str, int, str, int, int], mantissa_ends_with_dot: bool,
+                             mantissa: Optional[Token] = None) -> Iterator[Token]:
+        """Yield the tokens of '*10^(exponent)' replacing the 'e' of a number in scientific notation, as well as the implicit multiplication after it.
+        With scientific literals, the mantissa (if given) and the exponent are a single token instead (e.g. 1.5e-3), and the exponent
+        without mantissa is multiplied as the literal 1e(exponent).
+        Returns the offset of the next character and whether the last token is infix.
+        """
+        while True:
+            sign, sign_offset, digits, digits_offset, cursor = exponent
+
+            if self.scientific_literals:
+                if mantissa is not None:
+                    yield f'{mantissa[0]}e{sign}{digits}', mantissa[1]
+                    mantissa = None
+                else:
+                    yield '*', e_offset
+                    yield f'1e{sign}{digits}', e_offset
+            else:
+                yield '*', e_offset
+                yield '10', e_offset
+                yield '^', e_offset
+                yield '(', e_offset
+                if sign == '-':
+                    for token in UNARY_MINUS_TOKENS:
+                        yield token, sign_offset
+                yield digits, digits_offset
+                yield ')', digits_offset
+
+            # The scientific notations whose mantissa ends with a dot are converted after all the others. So the exponent digits
+            # of such a number can still be the mantissa of another one, which is not the case of the other exponents.
+            if not mantissa_ends_with_dot or not (cursor < self.length and self.string[cursor] == 'e'):
+                break
+            next_exponent = self._read_exponent(cursor + 1)
+            if next_exponent is None:
+                break
+            e_offset, exponent, mantissa_ends_with_dot = cursor, next_exponent, False
+
+        if self._class_at(cursor) in AFTER_BRACKET_MULTIPLICATION:
+            yield '*', cursor
+            return cursor, False
+        return cursor, True
+
+    def _number(self, cursor: int, after_word: bool) -> Iterator[Token]:
+        string = self.string
+        start = cursor
+        has_spaces = has_dot = False
+        last_class = before_last_class = None
+
+        while cursor < self.length:
+            char_class = CHAR_CLASSES[string[cursor]]
+            if char_class == DIGIT or char_class == DOT:
+                has_dot = has_dot or char_class == DOT
+                before_last_class, last_class = last_class, char_class
+            elif char_class == SPACE:
+                has_spaces = True
+            else:
+                break
+            cursor += 1
+
+        mantissa = _clean(string[start:cursor], has_spaces)
+
+        if (self.convert_scientific_notation and cursor < self.length and string[cursor] == 'e'
+                and (last_class == DIGIT or before_last_class == DIGIT)
+                and (exponent := self._read_exponent(cursor + 1)) is not None):
+            if not self.scientific_literals:
+                yield mantissa, start
+            return (yield from self._scientific_notation(cursor, exponent, last_class == DOT, (mantissa, start)))
+
+        yield mantissa, start
+
+        # Implicit multiplication after the last digits, if they are not glued to a letter before them
+        if last_class == DIGIT and (has_dot or not after_word) and self._class_at(cursor) in AFTER_NUMBER_MULTIPLICATION:
+            yield '*', cursor
+            return cursor, False
+        return cursor, True
+
+    def _function(self, cursor: int) -> Iterator[Token]:
+        string = self.string
+        start = cursor
+        has_spaces = False
+        last_class, before_last_class = LETTER, None
+        # Whether the current digits are just after a dot, which makes an implicit multiplication possible after them
+        digits_after_dot = False
+        cursor += 1
+
+        while cursor < self.length:
+            char = string[cursor]
+            char_class = CHAR_CLASSES[char]
+
+            if char_class == SPACE:
+                has_spaces = True
+                cursor += 1
+                continue
+
+            if char_class == LETTER:
+                if (self.convert_scientific_notation and char == 'e' and (last_class == DIGIT or (last_class == DOT and before_last_class == DIGIT))
+                        and (exponent := self._read_exponent(cursor + 1)) is not None):
+                    yield _clean(string[start:cursor], has_spaces), start
+                    return (yield from self._scientific_notation(cursor, exponent, last_class == DOT))
+
+                if last_class == DIGIT and digits_after_dot:
+                    yield _clean(string[start:cursor], has_spaces), start
+                    yield '*', cursor
+                    start, has_spaces = cursor, False
+                    last_class, before_last_class, digits_after_dot = LETTER, None, False
+                    cursor += 1
+                    continue
+            elif char_class == DIGIT:
+                if last_class != DIGIT:
+                    digits_after_dot = (last_class == DOT)
+            elif char_class != DOT:
+                break
+
+            before_last_class, last_class = last_class, char_class
+            cursor += 1
+
+        yield _clean(string[start:cursor], has_spaces), start
+
+        if last_class == DIGIT and digits_after_dot and self._class_at(cursor) in AFTER_NUMBER_MULTIPLICATION:
+            yield '*', cursor
+            return cursor, False
+        return cursor, True
+
+    def scan(self, cursor: int = 0, is_infix: bool = False, after_word: bool = False, boundaries: Optional[list[Boundary]] = None) -> Iterator[Token]:
+        """Yield the tokens from the given offset and state. The tokens only depend on the characters after the offset, so the scanning can
+        resume from any boundary. If boundaries is a list, the boundary of each lexeme is appended to it before its tokens are yielded,
+        and the end of the string is appended last.
+        """
+        string, length = self.string, self.length
+        cursor = self._skip_spaces(cursor)
+        # after_word : whether the last character is a (non ASCII) letter or digit, which prevents the implicit multiplication after a number
+
+        while cursor < length:
+            if boundaries is not None:
+                boundaries.append((cursor, is_infix, after_word, self.reach))
+
+            char = string[cursor]
+            char_class = CHAR_CLASSES[char]
+
+            if char_class == OPERATOR:
+                if not is_infix and char in '+-':
+                    if char == '-':
+                        for token in UNARY_MINUS_TOKENS:
+                            yield token, cursor
+                else:
+                    yield char, cursor
+                    is_infix = False
+                cursor += 1
+
+            elif char_class == OPENING_BRACKET or char_class == SEPARATOR:
+                yield char, cursor
+                is_infix = False
+                cursor += 1
+
+            elif char_class == CLOSING_BRACKET:
+                yield char, cursor
+                cursor = self._skip_spaces(cursor + 1)
+                is_infix = True
+                if self._class_at(cursor) in AFTER_BRACKET_MULTIPLICATION:
+                    yield '*', cursor
+                    is_infix = False
+
+            elif char_class == DIGIT or char_class == DOT:
+                cursor, is_infix = yield from self._number(cursor, after_word)
+
+            elif char_class == LETTER:
+                cursor, is_infix = yield from self._function(cursor)
+
+            else:
+                # This mean we encountered another character acting as a separator
+                is_infix = False
+                after_word = char.isalnum()
+                cursor = self._skip_spaces(cursor + 1)
+                continue
+
+            after_word = False
+            if cursor < length and CHAR_CLASSES[string[cursor]] == SPACE:
+                cursor = self._skip_spaces(cursor)
+
+        if boundaries is not None:
+            boundaries.append((cursor, is_infix, after_word, self.reach))
+
+
+def scan(string: str, convert_scientific_notation: bool = True, scientific_literals: bool = False) -> Iterator[Token]:
+    """Split a mathematical expression into its tokens in a single pass over the string, along with the offset in the string of the character
+    each token comes from. The tokens are identical to the ones of the tokenize function for any ASCII expression : the whitespaces are ignored,
+    the implicit multiplications, the unary minus and the scientific notation (if convert_scientific_notation is True) are converted the same way.
+
+
+    >>> list(scan('2x - 1'))
+    [('2', 0), ('*', 1), ('x', 1), ('-', 3), ('1', 5)]
+
+    Args:
+        string (str): string containing the mathematical expression.
+        convert_scientific_notation (bool, optional): indicates whether the scientific notation should be converted (e.g. 1.23e4 to 1.23*10^(4)) (default: True).
+        scientific_literals (bool, optional): indicates whether the numbers in scientific notation should be single tokens instead (e.g. 1.23e4),
+        if convert_scientific_notation is True (default: False).
+
+    Returns:
+        Iterator[tuple[str, int]]: The tokens and their offset.
+    """
+    return _Scanner(string, convert_scientific_notation, scientific_literals).scan()
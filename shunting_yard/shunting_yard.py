@@ -1,8 +1,12 @@
 from enum import Enum
 import math
-import re
-from typing import Optional
+from time import perf_counter
+from typing import Collection, Iterable, Mapping, Optional, Sequence, Union
 
+from shunting_yard import profiling
+from shunting_yard.cache import PARSE_CACHE
+from shunting_yard.program import join_arity, NumberType, RPNProgram
+from shunting_yard.rpn import as_registry, Bindings, DEFAULT_VARIADIC_ARITY, Functions
 from shunting_yard.tokenize import tokenize
 from shunting_yard.constants import BASE_OPERATORS, NUMBER_CHARS, FUNCTION_CHARS, SEPARATORS, SEPARATORS_NO_CLOSING_BRACKET, UNARY_OPERATORS_SYMBOLS
 
@@ -42,8 +46,36 @@ OPERATORS_ASSOCIATIVITY: dict[str, Associativity] = {
 
 
 
+def variable_names(variable: Optional[Union[str, Collection[str]]], case_sensitive: bool = True) -> frozenset[str]:
+    """Return the names of the variable parameter of the parsing functions (None, a name or a collection of names), lowercased if case_sensitive is False."""
+    if variable is None:
+        return frozenset()
+    if isinstance(variable, str):
+        variable = (variable,)
+    return frozenset(variable if case_sensitive else (name.lower() for name in variable))
+
+
+def bound_names(variables: Optional[Union[Bindings, Sequence[Bindings]]], case_sensitive: bool = True) -> frozenset[str]:
+    """Return the names of the variables which have a value in variables (None, the values of the variables or a sequence of them),
+    lowercased if case_sensitive is False."""
+    if variables is None or isinstance(variables, Mapping):
+        return variable_names(variables, case_sensitive)
+    return variable_names(set().union(*variables), case_sensitive)
+
+
+def lowercase_bindings(variables: Optional[Union[Bindings, Sequence[Bindings]]]) -> Optional[Union[Bindings, list[Bindings]]]:
+    """Return the values of the variables (or the sequence of them) with lowercased names, for the expressions parsed without caring about case."""
+    if variables is None:
+        return None
+    if isinstance(variables, Mapping):
+        return {name.lower(): value for name, value in variables.items()}
+    return [{name.lower(): value for name, value in bindings.items()} for bindings in variables]
+
+
 # Reference : https://en.wikipedia.org/wiki/Shunting_yard_algorithm
-def shunting_yard(expression: str, case_sensitive: bool = True, variable: Optional[str] = None, convert_scientific_notation: bool = True) -> str:
+def shunting_yard(expression: str, case_sensitive: bool = True, variable: Optional[Union[str, Collection[str]]] = None, convert_scientific_notation: bool = True,
+                  single_pass: bool = False, as_program: bool = False, functions: Optional[Functions] = None, scientific_literals: bool = False,
+                  number_type: NumberType = float) -> Union[str, RPNProgram]:
     """Convert the given classical math expression into Reverse Polish Notation using the Shunting-yard algorithm (see https://en.wikipedia.org/wiki/Shunting_yard_algorithm for more details). All whitespace are ignored.
 
 
@@ -53,72 +85,192 @@ def shunting_yard(expression: str, case_sensitive: bool = True, variable: Option
     >>> shuting_yard("sin(max(2, 3) / 3 * pi)")
     '2 3 max 3 / pi * sin'
 
+    >>> shuting_yard("x * y + 1", variable=('x', 'y'))
+    'x y * 1 +'
+
+    >>> shuting_yard("max(1, 2, 3) + max(4, 5)")
+    '1 2 3 max@3 4 5 max +'
+
+    >>> shuting_yard("2.5e-3 * x", variable='x', scientific_literals=True)
+    '2.5e-3 x *'
+
 
     Args:
         expression (str): string containing the mathematical expression to convert.
         case_sensitive (bool): indicates whether the expression should care about case (default: True).
-        variable (str, optional): if defined, will treat every token matching the variable as a number (default: None).
+        variable (str | Collection[str], optional): if defined, will treat every token matching the variable (or one of the variables) as a number (default: None).
         convert_scientific_notation (bool, optional): indicates whether the expression should convert scientific notation (e.g. 1.23e4 to 1.23*10^4) (default: True).
+        single_pass (bool, optional): indicates whether the expression should be split into tokens in a single pass instead of rewriting it with
+        regular expressions beforehand. The result is the same, but faster (default: False).
+        as_program (bool, optional): indicates whether the result should be an RPNProgram, whose numbers are already converted, instead of a string (default: False).
+        functions (FunctionDictionary | FunctionRegistry, optional): additional functions, or registry of functions, as in compute_rpn. The number of
+        parameters of the calls of its variadic functions is written after their name (e.g. max@3), unless it is 2 (default: None, the default functions).
+        scientific_literals (bool, optional): indicates whether the numbers in scientific notation should be kept as single tokens (e.g. 1.23e4), which
+        are converted once into exactly the number they write, instead of being converted into a multiplication by a power of 10. The expression is then
+        split into tokens in a single pass (default: False).
+        number_type (type, optional): type of the numbers with a dot or an exponent if as_program is True : float, or Decimal or Fraction for exact
+        literals (default: float). See RPNProgram.from_tokens.
 
     Raises:
         MismatchedBracketsError: raised if the bracket are unbalanced.
+        ValueError: raised if as_program is True and a number is not valid (e.g. 1.2.3).
 
 
     Returns:
-        str: The RPN expression corresponding to the mathematical expression.
+        str | RPNProgram: The RPN expression corresponding to the mathematical expression.
     """
-    output: list[str] = []
-    operator_stack: list[str] = []
+    variables = variable_names(variable)
 
-    if not case_sensitive:
-        expression = expression.lower()
+    # The results are kept in a LRU cache as the same expressions are often converted many times
+    variadic = as_registry(functions).variadic
+    key = (expression, case_sensitive, variables, convert_scientific_notation, single_pass, as_program, variadic, scientific_literals, number_type)
+    rpn = PARSE_CACHE.get(key)
+    if rpn is None:
+        if not case_sensitive:
+            expression = expression.lower()
+            variables = variable_names(variables, case_sensitive)
 
-    for token in tokenize(expression, convert_scientific_notation=convert_scientific_notation):
-        first_char = token[0]
+        output = _shunting_yard(expression, variables, convert_scientific_notation, single_pass, variadic, scientific_literals)
+        rpn = RPNProgram.from_tokens(output, variables, number_type) if as_program else ' '.join(output)
+        PARSE_CACHE.put(key, rpn)
 
-        if first_char in NUMBER_CHARS or token == variable:
-            output.append(token)
+    return rpn
 
-        elif first_char in FUNCTION_CHARS:
-            operator_stack.append(token)
 
-        elif first_char == '(':
-            operator_stack.append(first_char)
+def _shunting_yard(expression: str, variables: frozenset[str], convert_scientific_notation: bool, single_pass: bool, variadic: frozenset[str],
+                   scientific_literals: bool = False) -> list[str]:
+    parser = Parser(variables, variadic)
+    hook = profiling.HOOK.get()
+    if hook is not None:
+        return _profiled_shunting_yard(hook, parser, expression, convert_scientific_notation, single_pass, scientific_literals)
 
-        elif first_char in SEPARATORS: # The ( has already been processed above, so it's only ),;
-            if len(operator_stack) == 0:
-                raise MismatchedBracketsError('More right than left brackets.')
+    parser.feed(tokenize(expression, convert_scientific_notation, single_pass, scientific_literals))
+    return parser.finish()
 
-            while not operator_stack[-1] in SEPARATORS_NO_CLOSING_BRACKET:
-                output.append(operator_stack.pop())
-                if len(operator_stack) == 0:
-                    raise MismatchedBracketsError('More right than left brackets.')
 
-            operator_stack.pop() # Pop the left over separator
-            if first_char != ')': # If it's not the end of a bracket, replace by the current separator
-                operator_stack.append(first_char)
+def _profiled_shunting_yard(hook: profiling.ProfileHook, parser: 'Parser', expression: str, convert_scientific_notation: bool, single_pass: bool,
+                            scientific_literals: bool) -> list[str]:
+    # The tokens are all created before the parsing, so that both stages are measured separately
+    start = perf_counter()
+    tokens = list(tokenize(expression, convert_scientific_notation, single_pass, scientific_literals))
+    hook.stage('tokenize', perf_counter() - start, len(tokens))
+
+    start = perf_counter()
+    parser.feed(tokens)
+    output = parser.finish()
+    hook.stage('parse', perf_counter() - start, len(tokens))
+
+    # The depth of the stack is measured in a second parsing, token by token, so that it does not slow down the measured one
+    depth_parser = Parser(parser.variables, parser.variadic)
+    depth = 0
+    for token in tokens:
+        depth_parser.feed((token,))
+        depth = max(depth, len(depth_parser.operator_stack))
+    hook.stack_depth(depth)
+
+    return output
 
-            # If there is a function left, pop it to the output
-            if len(operator_stack) > 0 and (operator_stack[-1] in FUNCTION_CHARS or operator_stack[-1] in UNARY_OPERATORS_SYMBOLS):
-                output.append(operator_stack.pop())
 
-        elif first_char in BASE_OPERATORS:
-            while   (len(operator_stack) > 0 and
-                    (prev_operator := operator_stack[-1]) not in SEPARATORS_NO_CLOSING_BRACKET and (
-                        get_precedence(prev_operator) > get_precedence(token) or (
-                            get_precedence(prev_operator) == get_precedence(token) and
-                            OPERATORS_ASSOCIATIVITY[token] == Associativity.LEFT
-                        )
-                    )):
+# Operator stack and number of arguments of each opened bracket, which are all the parser needs to resume from a token
+ParserState = tuple[tuple[str, ...], tuple[int, ...]]
 
-                output.append(operator_stack.pop())
 
-            operator_stack.append(token)
+class Parser:
+    """State of the Shunting-yard algorithm, which can be given the tokens of an expression in several parts.
+    The state between two parts can be saved and restored, so that the parsing can resume from any saved token.
+    """
+
+    __slots__ = ('variables', 'variadic', 'output', 'operator_stack', 'argument_counts')
+
+    def __init__(self, variables: frozenset[str], variadic: frozenset[str]) -> None:
+        self.variables = variables
+        self.variadic = variadic
+        self.output: list[str] = []
+        self.operator_stack: list[str] = []
+        # Number of arguments found so far in each opened bracket
+        self.argument_counts: list[int] = []
+
+    def save(self) -> ParserState:
+        return tuple(self.operator_stack), tuple(self.argument_counts)
+
+    def restore(self, output: list[str], state: ParserState) -> None:
+        self.output = output
+        self.operator_stack = list(state[0])
+        self.argument_counts = list(state[1])
+
+    def feed(self, tokens: Iterable[str]) -> None:
+        """Process the given tokens, adding the RPN tokens they produce to the output.
+
+        Raises:
+            MismatchedBracketsError: raised if a bracket or separator does not match any opening bracket.
+        """
+        variables, variadic = self.variables, self.variadic
+        output, operator_stack, argument_counts = self.output, self.operator_stack, self.argument_counts
+
+        for token in tokens:
+            first_char = token[0]
 
-    # Empty the stack
-    for token in reversed(operator_stack):
-        if token == '(':
-            raise MismatchedBracketsError('More left than right brackets.')
-        output.append(token)
+            # Any token except a closing bracket starts the first argument of the bracket
+            if argument_counts and argument_counts[-1] == 0 and first_char != ')':
+                argument_counts[-1] = 1
+
+            if first_char in NUMBER_CHARS or token in variables:
+                output.append(token)
+
+            elif first_char in FUNCTION_CHARS:
+                operator_stack.append(token)
+
+            elif first_char == '(':
+                operator_stack.append(first_char)
+                argument_counts.append(0)
+
+            elif first_char in SEPARATORS: # The ( has already been processed above, so it's only ),;
+                if len(operator_stack) == 0:
+                    raise MismatchedBracketsError('More right than left brackets.')
 
-    return ' '.join(output)
+                while not operator_stack[-1] in SEPARATORS_NO_CLOSING_BRACKET:
+                    output.append(operator_stack.pop())
+                    if len(operator_stack) == 0:
+                        raise MismatchedBracketsError('More right than left brackets.')
+
+                operator_stack.pop() # Pop the left over separator
+                if first_char != ')': # If it's not the end of a bracket, replace by the current separator
+                    operator_stack.append(first_char)
+                    argument_counts[-1] += 1
+                    continue
+
+                # If the bracket contains the parameters of a variadic function, write their number after its name
+                argument_count = argument_counts.pop()
+                if len(operator_stack) > 0 and operator_stack[-1] in variadic and argument_count != DEFAULT_VARIADIC_ARITY:
+                    operator_stack[-1] = join_arity(operator_stack[-1], argument_count)
+
+                # If there is a function left, pop it to the output
+                if len(operator_stack) > 0 and (operator_stack[-1] in FUNCTION_CHARS or operator_stack[-1] in UNARY_OPERATORS_SYMBOLS):
+                    output.append(operator_stack.pop())
+
+            elif first_char in BASE_OPERATORS:
+                while   (len(operator_stack) > 0 and
+                        (prev_operator := operator_stack[-1]) not in SEPARATORS_NO_CLOSING_BRACKET and (
+                            get_precedence(prev_operator) > get_precedence(token) or (
+                                get_precedence(prev_operator) == get_precedence(token) and
+                                OPERATORS_ASSOCIATIVITY[token] == Associativity.LEFT
+                            )
+                        )):
+
+                    output.append(operator_stack.pop())
+
+                operator_stack.append(token)
+
+    def finish(self) -> list[str]:
+        """Empty the operator stack into the output, and return the output.
+
+        Raises:
+            MismatchedBracketsError: raised if a bracket is not closed.
+        """
+        for token in reversed(self.operator_stack):
+            if token == '(':
+                raise MismatchedBracketsError('More left than right brackets.')
+            self.output.append(token)
+
+        self.operator_stack.clear()
+        return self.output
@@ -0,0 +1,132 @@
+import codecs
+from typing import Collection, IO, Iterator, Optional, Union
+
+from shunting_yard.rpn import as_registry, Functions
+from shunting_yard.scanner import _Scanner, Boundary
+from shunting_yard.shunting_yard import Parser, variable_names
+
+
+# Number of characters read at once
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+
+def _read_chunks(file: IO, chunk_size: int, case_sensitive: bool) -> Iterator[str]:
+    """Read a text or binary (UTF-8) file, or a memory-mapped file, by chunks of characters."""
+    decoder = None
+    while True:
+        data = file.read(chunk_size)
+        if isinstance(data, (bytes, bytearray)):
+            if decoder is None:
+                decoder = codecs.getincrementaldecoder('utf-8')()
+            chunk = decoder.decode(data, final=not data)
+        else:
+            chunk = data
+
+        if chunk:
+            yield chunk if case_sensitive else chunk.lower()
+        if not data:
+            return
+
+
+def _stream_tokens(chunks: Iterator[str], convert_scientific_notation: bool, scientific_literals: bool) -> Iterator[list[str]]:
+    """Yield the tokens of the expression made of the given chunks, by lists of tokens.
+
+    After each chunk, the characters are scanned from the start of the first lexeme (see the scanner module) which is not complete yet :
+    the tokens of a lexeme are only kept once the scanner has read a character after it, as they may depend on the next characters.
+    So only this lexeme is kept between two chunks, and the memory used does not depend on the size of the expression.
+    """
+    buffer = ''
+    is_infix = after_word = False
+    boundaries: list[Boundary] = []
+    at_end = False
+
+    while not at_end:
+        chunk = next(chunks, None)
+        if chunk is None:
+            at_end = True
+        else:
+            buffer += chunk
+
+        scanner = _Scanner(buffer, convert_scientific_notation, scientific_literals)
+        length = len(buffer)
+        tokens: list[str] = []
+        pending: list[str] = []
+        # Start of the first lexeme which is not complete
+        cursor = 0
+
+        boundaries.clear()
+        for token, _ in scanner.scan(0, is_infix, after_word, boundaries):
+            if boundaries:
+                boundary = boundaries[-1]
+                if not at_end and max(boundary[0], boundary[3]) >= length:
+                    break
+                tokens += pending
+                pending.clear()
+                cursor, is_infix, after_word, _ = boundary
+                boundaries.clear()
+            pending.append(token)
+        else:
+            # The last lexeme is only complete at the end of the file
+            if at_end:
+                tokens += pending
+
+        buffer = buffer[cursor:]
+        if tokens:
+            yield tokens
+
+
+def tokenize_stream(file: IO, convert_scientific_notation: bool = True, chunk_size: int = DEFAULT_CHUNK_SIZE, scientific_literals: bool = False) -> Iterator[str]:
+    """Split a mathematical expression read from a file into tokens, reading it by chunks. The tokens are the same as the ones of
+    tokenize(file.read(), convert_scientific_notation, single_pass=True, scientific_literals=scientific_literals), but the whole expression is never in memory.
+
+    Args:
+        file (IO): text file, binary file (encoded in UTF-8) or memory-mapped file containing the expression.
+        convert_scientific_notation (bool, optional): indicates whether the scientific notation should be converted (default: True).
+        chunk_size (int, optional): number of characters (or bytes) read at once (default: DEFAULT_CHUNK_SIZE).
+        scientific_literals (bool, optional): indicates whether the numbers in scientific notation should be single tokens (default: False).
+
+    Returns:
+        Iterator[str]: The tokens.
+    """
+    for tokens in _stream_tokens(_read_chunks(file, chunk_size, True), convert_scientific_notation, scientific_literals):
+        yield from tokens
+
+
+def shunting_yard_stream(file: IO, case_sensitive: bool = True, variable: Optional[Union[str, Collection[str]]] = None, convert_scientific_notation: bool = True,
+                         functions: Optional[Functions] = None, chunk_size: int = DEFAULT_CHUNK_SIZE, scientific_literals: bool = False) -> Iterator[str]:
+    """Convert a mathematical expression read from a file into Reverse Polish Notation, as the shunting_yard function, reading it by chunks
+    and yielding the tokens of the RPN expression as soon as they are known. The memory used only depends on the size of the chunks and
+    the depth of the brackets and operators not yet written, not on the size of the expression, so that huge generated expressions can be
+    converted. The expression is split into tokens as with single_pass=True.
+
+
+    >>> with open('expression.txt') as file, open('expression.rpn', 'w') as output:
+    ...     for token in shunting_yard_stream(file, variable='x'):
+    ...         output.write(token + ' ')
+
+    Args:
+        file (IO): text file, binary file (encoded in UTF-8) or memory-mapped file containing the expression.
+        case_sensitive (bool): indicates whether the expression should care about case (default: True).
+        variable (str | Collection[str], optional): variable or variables of the expression (default: None).
+        convert_scientific_notation (bool, optional): indicates whether the expression should convert scientific notation (default: True).
+        functions (FunctionDictionary | FunctionRegistry, optional): additional functions, or registry of functions, as in shunting_yard.
+        chunk_size (int, optional): number of characters (or bytes) read at once (default: DEFAULT_CHUNK_SIZE).
+        scientific_literals (bool, optional): indicates whether the numbers in scientific notation should be single tokens, as in shunting_yard (default: False).
+
+    Raises:
+        MismatchedBracketsError: raised if the bracket are unbalanced, once the tokens of the previous chunks have been yielded.
+
+    Returns:
+        Iterator[str]: The tokens of the RPN expression.
+    """
+    variables = variable_names(variable, case_sensitive)
+
+    parser = Parser(variables, as_registry(functions).variadic)
+    output = parser.output
+
+    for tokens in _stream_tokens(_read_chunks(file, chunk_size, case_sensitive), convert_scientific_notation, scientific_literals):
+        parser.feed(tokens)
+        yield from output
+        output.clear()
+
+    yield from parser.finish()
@@ -2,6 +2,7 @@ import re
 from typing import Iterator
 
 from shunting_yard.constants import BASE_OPERATORS, FUNCTION_CHARS, FUNCTION_FIRST_CHARS, NUMBER_CHARS, SEPARATORS, UNARY_OPERATORS
+from shunting_yard.scanner import scan
 from shunting_yard.constants import IMPLICIT_MULTIPLICATION_BRACKET_REGEX, IMPLICIT_MULTIPLICATION_NUMBER_REGEX, SCIENTIFIC_NOTATION_AFTER_DOT_REGEX, SCIENTIFIC_NOTATION_BEFORE_DOT_REGEX
 
 
@@ -37,10 +38,16 @@ def _convert_scientific_notation(expression: str) -> str:
     return expression
 
 
-def tokenize(string: str, convert_scientific_notation: bool = True) -> Iterator[str]:
+def tokenize(string: str, convert_scientific_notation: bool = True, single_pass: bool = False, scientific_literals: bool = False) -> Iterator[str]:
     if string == '':
         return
 
+    # The scanner gives the same tokens without rewriting the string beforehand. The scientific literals are only recognized by the scanner.
+    if single_pass or scientific_literals:
+        for token, _ in scan(string, convert_scientific_notation, scientific_literals):
+            yield token
+        return
+
     # Remove all whitespaces are they do not change anything
     string = ''.join(string.split())
 
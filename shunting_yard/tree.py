@@ -0,0 +1,335 @@
+from heapq import heappop, heappush
+import math
+from numbers import Number as _NumberABC
+from typing import Any, Collection, Hashable, Optional, Union
+
+from shunting_yard.program import FUNCTION, NUMBER, RPNProgram, VARIABLE
+from shunting_yard.registry import FunctionRegistry
+from shunting_yard.rpn import as_registry, Functions, get_param_count, Number, WrongExpressionError
+
+
+class Node:
+    """Node of an expression tree : a number, a variable, or the call of a function on the nodes of its parameters.
+    Nodes are created by a TreeBuilder, which creates only one node for structurally identical sub-expressions, so a node can be the
+    parameter of several others. Their index is their position in the nodes of the builder, which are sorted so that the parameters of
+    a node are always before it.
+    """
+
+    __slots__ = ('index', 'opcode', 'operand', 'token', 'children', 'impure')
+
+    def __init__(self, index: int, opcode: int, operand: Any, token: str, children: tuple['Node', ...] = (), impure: bool = False) -> None:
+        self.index = index
+        self.opcode = opcode
+        self.operand = operand
+        self.token = token
+        self.children = children
+        self.impure = impure
+
+    def __repr__(self) -> str:
+        if self.opcode != FUNCTION:
+            return f'{self.__class__.__name__}({self.token!r})'
+        return f"{self.__class__.__name__}({self.token!r}, children=[{', '.join(str(child.index) for child in self.children)}])"
+
+
+class TreeBuilder:
+    """Convert RPN expressions into trees whose identical sub-expressions are only one node (hash-consing).
+    The sub-expressions are shared between all the expressions added to the same builder. The calls of impure functions are never shared,
+    as each of them may give a different result.
+    """
+
+    __slots__ = ('functions', 'impure', 'nodes', '_table')
+
+    def __init__(self, functions: Optional[Functions] = None, impure: Collection[str] = ()) -> None:
+        """
+        Args:
+            functions (FunctionDictionary | FunctionRegistry, optional): additional functions, or registry of functions, as in compute_rpn.
+            impure (Collection[str]): names of the functions whose calls should never be shared, in addition to the impure ones of the registry.
+        """
+        self.functions: FunctionRegistry = as_registry(functions)
+        self.impure = self.functions.impure | frozenset(impure)
+        self.nodes: list[Node] = []
+        self._table: dict[Hashable, Node] = {}
+
+    def _node(self, key: Optional[Hashable], opcode: int, operand: Any, token: str, children: tuple[Node, ...] = (), impure: bool = False) -> Node:
+        """Return the existing node with the given key, or create it. Nodes without key are always created."""
+        if key is not None:
+            node = self._table.get(key)
+            if node is not None:
+                return node
+
+        node = Node(len(self.nodes), opcode, operand, token, children, impure)
+        self.nodes.append(node)
+        if key is not None:
+            self._table[key] = node
+        return node
+
+    def add(self, rpn: Union[str, RPNProgram], variables: Collection[str] = ()) -> Node:
+        """Add the nodes of an RPN expression to the builder, and return its root.
+
+        Args:
+            rpn (str | RPNProgram): RPN expression or program.
+            variables (Collection[str]): names of the variables of the expression. They take precedence over functions with the same name.
+
+        Raises:
+            ValueError: raised if an unknown function is in the expression.
+            WrongExpressionError: raised if a function does not have enough parameters or if the expression does not give only one result.
+
+        Returns:
+            Node: The node of the whole expression.
+        """
+        program = rpn if isinstance(rpn, RPNProgram) else RPNProgram.parse(rpn, variables)
+        stack: list[Node] = []
+
+        for token, opcode, operand, arity in zip(program.tokens, program.opcodes, program.operands, program.arities):
+            if opcode == NUMBER:
+                # The key is the token so that 1 and 1.0 (equal in Python) stay different
+                stack.append(self._node((NUMBER, token), NUMBER, operand, token))
+            elif opcode == VARIABLE or (operand in variables and arity is None):
+                stack.append(self._node((VARIABLE, operand), VARIABLE, operand, token))
+            else:
+                if not operand in self.functions:
+                    raise ValueError(f'Unknown function : {operand}')
+
+                param_count = get_param_count(operand, self.functions[operand][0], arity)
+                if len(stack) < param_count:
+                    raise WrongExpressionError(f"Not enough parameters for function '{operand}' : {len(stack)} found, {param_count} expected.")
+
+                children = tuple(stack[len(stack) - param_count:])
+                del stack[len(stack) - param_count:]
+
+                impure = operand in self.impure
+                key = None if impure else (FUNCTION, operand, tuple(child.index for child in children))
+                stack.append(self._node(key, FUNCTION, operand, token, children, impure))
+
+        if len(stack) != 1:
+            raise WrongExpressionError("Expression does not give only one result.")
+
+        return stack[0]
+
+
+class ExpressionTree:
+    """Expression stored as a directed acyclic graph of nodes, where each distinct sub-expression is computed only once per evaluation.
+    Use the build_tree function to create one.
+
+
+    >>> tree = build_tree(shunting_yard('sin(x)^2 + sin(x) * 2', variable='x'), variables=('x',))
+    >>> len(tree)
+    6
+    >>> tree.evaluate(x=0)
+    0.0
+    """
+
+    __slots__ = ('nodes', 'root', 'functions', '_code')
+
+    def __init__(self, nodes: list[Node], root: Node, functions: FunctionRegistry) -> None:
+        """
+        Args:
+            nodes (list[Node]): nodes of the tree, sorted so that the parameters of a node are before it.
+            root (Node): node of the whole expression.
+            functions (FunctionRegistry): functions called by the nodes.
+        """
+        self.nodes = nodes
+        self.root = root
+        self.functions = functions
+        # Instructions (opcode, number / variable name / function, indexes of the parameters) of each node
+        self._code: list[tuple[int, Any, tuple[int, ...]]] = [
+            (node.opcode, functions[node.operand][1] if node.opcode == FUNCTION else node.operand, tuple(child.index for child in node.children))
+            for node in nodes
+        ]
+
+    @property
+    def variables(self) -> frozenset[str]:
+        """Names of the variables used by the expression."""
+        return frozenset(node.operand for node in self.nodes if node.opcode == VARIABLE)
+
+    def evaluate(self, **values: Number) -> Number:
+        """Compute the value of the expression, computing each node only once.
+
+        Args:
+            **values (Number): value of each variable of the expression.
+
+        Raises:
+            ValueError: raised if a variable used by the expression has no value.
+
+        Returns:
+            Number: Result.
+        """
+        return self._compute_nodes(values)[self.root.index]
+
+    def reactive(self, **values: Number) -> 'ReactiveExpression':
+        """Return a reactive expression computed with the given values of the variables, see ReactiveExpression.
+
+        Raises:
+            ValueError: raised if a variable used by the expression has no value.
+        """
+        return ReactiveExpression(self, **values)
+
+    def _compute_nodes(self, values: dict[str, Number]) -> list[Any]:
+        # Compute the value of every node
+        results: list[Any] = [None] * len(self._code)
+
+        for index, (opcode, operand, children) in enumerate(self._code):
+            if opcode == NUMBER:
+                results[index] = operand
+            elif opcode == VARIABLE:
+                if not operand in values:
+                    raise ValueError(f'Missing value for variable : {operand}')
+                results[index] = values[operand]
+            else:
+                results[index] = operand(*[results[child] for child in children])
+
+        return results
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({len(self.nodes)} nodes, root={self.root!r})'
+
+
+def _unchanged(old: Any, new: Any) -> bool:
+    # Only numbers are compared, as comparing other values (e.g. arrays) may not give a boolean. 0.0 and -0.0 are equal, but not interchangeable.
+    if old is new:
+        return True
+    if type(old) is not type(new) or not isinstance(new, _NumberABC) or old != new:
+        return False
+    return type(new) is not float or math.copysign(1, old) == math.copysign(1, new)
+
+
+class ReactiveExpression:
+    """Expression tree keeping the value of each of its nodes, so that when some variables change, only the nodes which depend on them
+    are computed again, from the variables to the root. A node whose new value is the same as before does not invalidate the nodes using it.
+    The calls of impure functions are computed again at each update, as compute would.
+
+
+    >>> expression = build_tree(shunting_yard('sin(x) * 2 + y', variable=('x', 'y')), ('x', 'y')).reactive(x=0, y=1)
+    >>> expression.value
+    1.0
+    >>> expression.update(y=2)
+    2.0
+    >>> expression.recomputed
+    1
+    """
+
+    __slots__ = ('tree', 'recomputed', '_results', '_parents', '_variable_nodes', '_impure_nodes')
+
+    def __init__(self, tree: ExpressionTree, **values: Number) -> None:
+        """
+        Args:
+            tree (ExpressionTree): tree of the expression, as returned by build_tree.
+            **values (Number): initial value of each variable of the expression.
+
+        Raises:
+            ValueError: raised if a variable used by the expression has no value.
+        """
+        self.tree = tree
+        # Indexes of the nodes using each node, and of the node of each variable
+        self._parents: list[list[int]] = [[] for _ in tree.nodes]
+        for node in tree.nodes:
+            for child in node.children:
+                self._parents[child.index].append(node.index)
+        self._variable_nodes = {node.operand: node.index for node in tree.nodes if node.opcode == VARIABLE}
+        self._impure_nodes = [node.index for node in tree.nodes if node.impure]
+
+        self._results = tree._compute_nodes(values)
+        # Number of nodes computed by the last update (or by the creation)
+        self.recomputed = len(self._results)
+
+    @property
+    def value(self) -> Number:
+        """Value of the expression with the current values of the variables."""
+        return self._results[self.tree.root.index]
+
+    @property
+    def variables(self) -> dict[str, Number]:
+        """Current value of each variable used by the expression."""
+        return {name: self._results[index] for name, index in self._variable_nodes.items()}
+
+    def update(self, **values: Number) -> Number:
+        """Change the values of some variables, and compute again the nodes which depend on them. The number of computed nodes is then
+        in recomputed. The variables which are not used by the expression are ignored.
+
+        Args:
+            **values (Number): new value of each changed variable.
+
+        Raises:
+            Exception: any error raised by a function. The values of the variables and of the nodes are then the ones before the update.
+
+        Returns:
+            Number: The new value of the expression.
+        """
+        results = self._results
+        parents = self._parents
+        code = self.tree._code
+        # Indexes of the invalidated nodes. They are computed in increasing order, so that the parameters of a node are computed before it.
+        invalidated: list[int] = []
+        queued: set[int] = set()
+        # Values replaced by this update, to restore them if a function fails. Each node is changed at most once.
+        previous: dict[int, Number] = {}
+
+        for name, value in values.items():
+            index = self._variable_nodes.get(name)
+            if index is None or _unchanged(results[index], value):
+                continue
+            previous[index] = results[index]
+            results[index] = value
+            for parent in parents[index]:
+                if not parent in queued:
+                    queued.add(parent)
+                    heappush(invalidated, parent)
+
+        for index in self._impure_nodes:
+            if not index in queued:
+                queued.add(index)
+                heappush(invalidated, index)
+
+        recomputed = 0
+        try:
+            while invalidated:
+                index = heappop(invalidated)
+                _, func, children = code[index]
+                value = func(*[results[child] for child in children])
+                recomputed += 1
+
+                if _unchanged(results[index], value):
+                    continue
+                previous[index] = results[index]
+                results[index] = value
+                for parent in parents[index]:
+                    if not parent in queued:
+                        queued.add(parent)
+                        heappush(invalidated, parent)
+        except BaseException:
+            for index, value in previous.items():
+                results[index] = value
+            raise
+
+        self.recomputed = recomputed
+        return results[self.tree.root.index]
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({len(self._results)} nodes, value={self.value!r})'
+
+
+def build_tree(rpn: Union[str, RPNProgram], variables: Collection[str] = (), functions: Optional[Functions] = None,
+               impure: Collection[str] = ()) -> ExpressionTree:
+    """Convert an RPN expression into an expression tree, where the structurally identical sub-expressions (e.g. each sin(x) of
+    sin(x)^2 + sin(x)) are a single node. When evaluating the tree, each node is computed only once.
+
+    Args:
+        rpn (str | RPNProgram): RPN expression, or program returned by shunting_yard(..., as_program=True).
+        variables (Collection[str]): names of the variables of the expression. They take precedence over functions with the same name.
+        functions (FunctionDictionary | FunctionRegistry, optional): additional functions, or registry of functions, as in compute_rpn.
+        impure (Collection[str]): names of the functions whose calls should never be shared (e.g. random number generators), in addition to
+        the impure ones of the registry.
+
+    Raises:
+        ValueError: raised if an unknown function is in the expression.
+        WrongExpressionError: raised if a function does not have enough parameters or if the expression does not give only one result.
+
+    Returns:
+        ExpressionTree: The tree.
+    """
+    builder = TreeBuilder(functions, impure)
+    root = builder.add(rpn, variables)
+    return ExpressionTree(builder.nodes, root, builder.functions)
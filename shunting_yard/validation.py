@@ -0,0 +1,160 @@
+from string import whitespace
+from typing import Collection, NamedTuple, Optional, Union
+
+from shunting_yard.constants import BASE_OPERATORS, FUNCTION_CHARS, FUNCTION_FIRST_CHARS, NUMBER_CHARS, SEPARATORS
+from shunting_yard.program import convert_number
+from shunting_yard.registry import VARIADIC
+from shunting_yard.rpn import as_registry, DEFAULT_VARIADIC_ARITY, Functions
+from shunting_yard.scanner import scan
+from shunting_yard.shunting_yard import Parser, variable_names
+
+
+ALLOWED_CHARS = frozenset(FUNCTION_CHARS + BASE_OPERATORS + SEPARATORS + whitespace)
+
+
+class Problem(NamedTuple):
+    offset: int
+    message: str
+
+
+class _Token(str):
+    # Token given to the parser, which keeps the same objects in its output : it keeps the offset of the character it comes from and, for the
+    # function calls, the number of parameters in their brackets
+    offset: int
+    argument_count: Optional[int] = None
+
+
+def _make_token(text: str, offset: int) -> _Token:
+    token = _Token(text)
+    token.offset = offset
+    return token
+
+
+def _check_brackets(expression: str, tokens: list[_Token], variables: frozenset[str], problems: list[Problem]) -> list[_Token]:
+    """Return the tokens without the closing brackets and separators which do not match an opening bracket, and with the missing closing
+    brackets, so that the rest of the expression can still be checked. Count the parameters of each function call, as the parser does.
+    """
+    checked: list[_Token] = []
+    # Offset of each opened bracket, the function called with it (if any) and the number of parameters found so far
+    brackets: list[list] = []
+    removed_bracket = False
+
+    for token in tokens:
+        # The implicit multiplication after a removed closing bracket is removed as well
+        if removed_bracket and token == '*' and expression[token.offset] != '*':
+            continue
+        removed_bracket = False
+
+        if brackets and brackets[-1][2] == 0 and token != ')':
+            brackets[-1][2] = 1
+
+        if token == '(':
+            previous = checked[-1] if checked else None
+            is_call = previous is not None and previous[0] in FUNCTION_FIRST_CHARS and not previous in variables
+            brackets.append([token.offset, previous if is_call else None, 0])
+        elif token == ')':
+            if not brackets:
+                problems.append(Problem(token.offset, 'Closing bracket without opening bracket.'))
+                removed_bracket = True
+                continue
+            _, function, argument_count = brackets.pop()
+            if function is not None:
+                function.argument_count = argument_count
+        elif token in (',', ';'):
+            if not brackets:
+                problems.append(Problem(token.offset, 'Separator outside of brackets.'))
+                continue
+            brackets[-1][2] += 1
+        checked.append(token)
+
+    for offset, function, argument_count in reversed(brackets):
+        problems.append(Problem(offset, 'Bracket not closed.'))
+        if function is not None:
+            function.argument_count = argument_count
+        checked.append(_make_token(')', len(expression)))
+
+    return checked
+
+
+def validate(expression: str, case_sensitive: bool = True, variable: Optional[Union[str, Collection[str]]] = None, convert_scientific_notation: bool = True,
+             functions: Optional[Functions] = None, scientific_literals: bool = False) -> list[Problem]:
+    """Check an expression without computing it, and return all its problems with the offset in the expression of the character where each
+    of them is. The expression is converted into RPN as by shunting_yard, then the stack of the computation is simulated : only the numbers of
+    parameters of the functions are used, the functions are never called. An expression without problems can still fail when it is computed,
+    if a function raises an error (e.g. a division by zero).
+
+
+    >>> validate('max(1, 2) + sin(1, 2) * foo(3')
+    [Problem(offset=12, message="Wrong number of parameters for function 'sin' : 2 given, 1 expected."), Problem(offset=24, message='Unknown function : foo'), Problem(offset=27, message='Bracket not closed.')]
+
+    Args:
+        expression (str): string containing the mathematical expression to check.
+        case_sensitive (bool): indicates whether the expression should care about case (default: True).
+        variable (str | Collection[str], optional): name of the variable, or names of the variables of the expression (default: None).
+        convert_scientific_notation (bool, optional): indicates whether the expression should convert scientific notation (default: True).
+        functions (FunctionDictionary | FunctionRegistry, optional): additional functions, or registry of functions, as in compute_rpn.
+        scientific_literals (bool, optional): indicates whether the numbers in scientific notation are single tokens (default: False).
+
+    Returns:
+        list[Problem]: The problems, sorted by offset. It is empty if the expression is valid.
+    """
+    variables = variable_names(variable, case_sensitive)
+
+    if not case_sensitive:
+        expression = expression.lower()
+
+    # The characters which are not part of any token are ignored by the parsing, so they are reported here
+    problems: list[Problem] = []
+    if not ALLOWED_CHARS.issuperset(expression):
+        problems.extend(Problem(offset, f'Unexpected character : {char!r}') for offset, char in enumerate(expression) if not char in ALLOWED_CHARS)
+
+    tokens = [_make_token(text, offset) for text, offset in scan(expression, convert_scientific_notation, scientific_literals)]
+    if not tokens:
+        problems.append(Problem(0, 'Empty expression.'))
+        return sorted(problems)
+
+    # Without variadic functions, the parser does not write the number of parameters after their name, which would create new tokens
+    parser = Parser(variables, frozenset())
+    parser.feed(_check_brackets(expression, tokens, variables, problems))
+    registry = as_registry(functions)
+
+    # Offset of the first character of the sub-expression of each value of the stack
+    stack: list[int] = []
+    for token in parser.finish():
+        if token[0] in NUMBER_CHARS:
+            try:
+                convert_number(token)
+            except ValueError:
+                problems.append(Problem(token.offset, f'Invalid number : {token}'))
+            stack.append(token.offset)
+            continue
+        if token in variables:
+            stack.append(token.offset)
+            continue
+
+        argument_count = token.argument_count
+        if not token in registry:
+            problems.append(Problem(token.offset, f'Unknown function : {token}'))
+            param_count = argument_count or 0
+        else:
+            param_count = registry[token][0]
+            if param_count == VARIADIC:
+                param_count = DEFAULT_VARIADIC_ARITY if argument_count is None else argument_count
+            elif argument_count is not None and argument_count != param_count:
+                problems.append(Problem(token.offset, f"Wrong number of parameters for function '{token}' : {argument_count} given, {param_count} expected."))
+                # The parameters in the brackets are the ones taken from the stack, so that the rest of the expression is checked as written
+                param_count = argument_count
+
+        if len(stack) < param_count:
+            problems.append(Problem(token.offset, f"Not enough parameters for function '{token}' : {len(stack)} found, {param_count} expected."))
+            param_count = len(stack)
+        start = min([token.offset, *stack[len(stack) - param_count:]])
+        del stack[len(stack) - param_count:]
+        stack.append(start)
+
+    if not stack:
+        problems.append(Problem(0, 'Expression does not give any result.'))
+    elif len(stack) > 1:
+        problems.append(Problem(stack[1], 'Expression does not give only one result.'))
+
+    return sorted(problems)
@@ -0,0 +1,110 @@
+from functools import reduce
+from typing import Any, Callable, Mapping, Optional, Union
+
+from shunting_yard.compiler import CompiledExpression
+from shunting_yard.program import RPNProgram
+from shunting_yard.registry import FunctionRegistry
+from shunting_yard.rpn import as_registry, BUILTIN_FUNCTIONS, FunctionDictionary, Functions
+
+
+def _import_numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError('NumPy is required for the vectorized evaluation (pip install numpy).') from None
+    return numpy
+
+
+def _reduce_with(ufunc: Callable) -> Callable:
+    return lambda *parameters: reduce(ufunc, parameters)
+
+
+def _mean_with(add: Callable) -> Callable:
+    return lambda *parameters: reduce(add, parameters) / len(parameters)
+
+
+def _ufunc_equivalents(np) -> dict[str, Callable]:
+    """Return the NumPy equivalent of each default function which is not a constant."""
+    return {
+        '+': np.add,
+        '+u': np.positive,
+        '-': np.subtract,
+        '-u': np.negative,
+        '*': np.multiply,
+        '/': np.true_divide,
+        # float_power because integer arrays cannot be raised to negative integer powers, contrary to Python numbers
+        '^': np.float_power,
+        'sqrt': np.sqrt,
+        'sin': np.sin,
+        'cos': np.cos,
+        'tan': np.tan,
+        # The variadic functions take any number of parameters, while the binary ufuncs would take the third one as their output
+        'min': _reduce_with(np.minimum),
+        'min3': _reduce_with(np.minimum),
+        'min4': _reduce_with(np.minimum),
+        'max': _reduce_with(np.maximum),
+        'max3': _reduce_with(np.maximum),
+        'max4': _reduce_with(np.maximum),
+        'sum': _reduce_with(np.add),
+        'mean': _mean_with(np.add),
+        'abs': np.abs,
+    }
+
+
+def vectorized_functions(additional_functions: Optional[Functions] = None) -> FunctionRegistry:
+    """Return a function registry whose functions accept NumPy arrays as parameters.
+    The default functions are replaced by their ufunc equivalent, and the additional functions which are not NumPy ufuncs are applied element by element.
+    Functions without parameters (constants) are kept as is.
+
+    Args:
+        additional_functions (FunctionDictionary | FunctionRegistry, optional): dictionary containing more functions, or registry of functions, as in compute_rpn.
+
+    Raises:
+        ImportError: raised if NumPy is not installed.
+
+    Returns:
+        FunctionRegistry: The vectorized functions.
+    """
+    np = _import_numpy()
+    equivalents = _ufunc_equivalents(np)
+
+    functions = as_registry(additional_functions)
+    vectorized: FunctionDictionary = {}
+
+    for name, (param_count, func) in functions.items():
+        if name in equivalents and func is BUILTIN_FUNCTIONS[name][1]:
+            vectorized[name] = (param_count, equivalents[name])
+        elif param_count == 0 or isinstance(func, np.ufunc):
+            vectorized[name] = (param_count, func)
+        else:
+            # Scalar fallback for the functions which do not handle arrays
+            vectorized[name] = (param_count, np.vectorize(func, otypes=[np.float64]))
+
+    return FunctionRegistry(vectorized, functions.impure)
+
+
+def compute_rpn_array(rpn: Union[str, RPNProgram], variables: Mapping[str, Any], additional_functions: Optional[Functions] = None) -> Any:
+    """Compute the value of an expression in the Reverse Polish Notation format for whole arrays of variable values at once.
+    The stack machine runs only once, with NumPy arrays as operands, instead of once per element.
+
+
+    >>> compute_rpn_array('x 2 * 1 +', {'x': [1, 2, 3]})
+    array([3, 5, 7])
+
+    Args:
+        rpn (str | RPNProgram): RPN expression or program.
+        variables (Mapping[str, ArrayLike]): value of each variable. Each value can be a NumPy array, a list, a buffer or a number.
+        additional_functions (FunctionDictionary | FunctionRegistry, optional): dictionary containing more functions, or registry of functions, as in
+        compute_rpn. Those which are not NumPy ufuncs are applied to each element separately.
+
+    Raises:
+        ImportError: raised if NumPy is not installed.
+        ValueError: raised if an unknown function is in the expression.
+        WrongExpressionError: raised if a function does not have enough parameters or if the expression does not give only one result.
+
+    Returns:
+        numpy.ndarray: The result for every element of the variables (broadcasted together).
+    """
+    np = _import_numpy()
+    expression = CompiledExpression(rpn, variables.keys(), vectorized_functions(additional_functions))
+    return expression.evaluate(**{name: np.asarray(value) for name, value in variables.items()})
@@ -0,0 +1,103 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import unittest
+
+from shunting_yard import AsyncExpression, build_tree, BUILTIN_FUNCTIONS, compute, compute_async, compute_rpn_async, shunting_yard, WrongExpressionError
+
+
+class Rates:
+
+    def __init__(self):
+        self.calls = 0
+        self.running = 0
+        self.max_running = 0
+
+    async def rate(self, currency):
+        self.calls += 1
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        return currency * 10
+
+
+class TestComputeAsync(unittest.IsolatedAsyncioTestCase):
+
+    async def test_synchronous_functions(self):
+        for expression in ('1 + 2 * 3', 'max(2, 3) ^ 2', '-sin(0) + sum(1, 2, 3)', '7 / 2'):
+            self.assertEqual(await compute_async(expression), compute(expression))
+
+    async def test_coroutine_function(self):
+        rates = Rates()
+        self.assertEqual(await compute_async('2 * rate(3) + 1', additional_functions={'rate': (1, rates.rate)}), 61)
+
+    async def test_concurrent_parameters(self):
+        rates = Rates()
+        self.assertEqual(await compute_async('max(rate(1), rate(2) * 2, rate(3))', additional_functions={'rate': (1, rates.rate)}), 40)
+        self.assertEqual(rates.max_running, 3)
+
+    async def test_shared_calls(self):
+        rates = Rates()
+        self.assertEqual(await compute_async('rate(1) + rate(1) * 2', additional_functions={'rate': (1, rates.rate)}), 30)
+        self.assertEqual(rates.calls, 1)
+
+        rates = Rates()
+        functions = BUILTIN_FUNCTIONS.overlay({'rate': (1, rates.rate)}, impure=('rate',))
+        self.assertEqual(await compute_rpn_async('1 rate 1 rate +', functions), 20)
+        self.assertEqual(rates.calls, 2)
+
+    async def test_variables(self):
+        rates = Rates()
+        functions = {'rate': (1, rates.rate)}
+        self.assertEqual(await compute_async('x * rate(y)', additional_functions=functions, variables={'x': 2, 'y': 1}), 20)
+        self.assertEqual(await compute_async('x * rate(y)', additional_functions=functions, variables=[{'x': 1, 'y': 1}, {'x': 2, 'y': 3}]), [10, 60])
+        self.assertEqual(await compute_async('X + 1', case_sensitive=False, variables={'x': 1}), 2)
+
+    async def test_offload(self):
+        threads = []
+
+        def slow(x):
+            threads.append(threading.get_ident())
+            return x + 1
+
+        with ThreadPoolExecutor(2) as executor:
+            result = await compute_async('slow(1) + slow(2)', additional_functions={'slow': (1, slow)}, executor=executor, offload=('slow',))
+        self.assertEqual(result, 5)
+        self.assertEqual(len(threads), 2)
+        self.assertNotIn(threading.get_ident(), threads)
+
+        threads.clear()
+        self.assertEqual(await compute_async('slow(1)', additional_functions={'slow': (1, slow)}), 2)
+        self.assertEqual(threads, [threading.get_ident()])
+
+    async def test_errors(self):
+        async def fail(x):
+            raise ArithmeticError('fail')
+
+        rates = Rates()
+        functions = {'rate': (1, rates.rate), 'fail': (1, fail)}
+        with self.assertRaises(ArithmeticError):
+            await compute_async('rate(1) + fail(2)', additional_functions=functions)
+        with self.assertRaises(ValueError):
+            await compute_async('x + rate(1)', additional_functions=functions)
+        with self.assertRaises(ValueError):
+            await compute_async('unknown(1)')
+        with self.assertRaises(WrongExpressionError):
+            await compute_rpn_async('1 2')
+
+
+class TestAsyncExpression(unittest.IsolatedAsyncioTestCase):
+
+    async def test_evaluate(self):
+        rates = Rates()
+        tree = build_tree(shunting_yard('x * rate(1) + y', variable=('x', 'y')), ('x', 'y'), {'rate': (1, rates.rate)})
+        expression = AsyncExpression(tree)
+        self.assertEqual(expression.variables, {'x', 'y'})
+        self.assertEqual(await expression.evaluate(x=2, y=1), 21)
+        self.assertEqual(await expression.evaluate(x=3, y=0), 30)
+        self.assertEqual(repr(expression), 'AsyncExpression(6 nodes, 3 asynchronous)')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import math
+import unittest
+
+from shunting_yard import BUILTIN_FUNCTIONS, build_tree, compute, DERIVATIVES, DifferentiableExpression, gradient, shunting_yard
+from shunting_yard.rpn import FUNCTIONS
+
+
+def numerical_gradient(expression, variables, additional_functions=None, step=1e-6):
+    result = {}
+    for name in variables:
+        above = dict(variables, **{name: variables[name] + step})
+        below = dict(variables, **{name: variables[name] - step})
+        result[name] = (compute(expression, additional_functions=additional_functions, variables=above)
+                        - compute(expression, additional_functions=additional_functions, variables=below)) / (2 * step)
+    return result
+
+
+class TestGradient(unittest.TestCase):
+
+    def assertGradient(self, expression, variables, additional_functions=None, derivatives=None):
+        expected = numerical_gradient(expression, variables, additional_functions)
+        for mode in ('forward', 'reverse'):
+            value, result = gradient(expression, variables, additional_functions, derivatives, mode=mode)
+            self.assertAlmostEqual(value, compute(expression, additional_functions=additional_functions, variables=variables))
+            self.assertEqual(result.keys(), expected.keys())
+            for name in expected:
+                self.assertAlmostEqual(result[name], expected[name], places=5, msg=f'{expression} ({mode}) d/d{name}')
+
+    def test_all_default_functions(self):
+        self.assertEqual(set(DERIVATIVES), set(FUNCTIONS))
+
+    def test_operators(self):
+        values = {'x': 1.5, 'y': -0.7}
+        for expression in ('x + y', '+x - y', '-x * y', 'x / y', 'x ^ 3', '2 ^ x', 'x ^ y', 'x * pi + e * y'):
+            self.assertGradient(expression, values)
+
+    def test_functions(self):
+        values = {'x': 0.8, 'y': 2.5, 'z': -1.2}
+        for expression in ('sqrt(x * y)', 'sin(x) * cos(y)', 'tan(x + z)', 'abs(z) + abs(x)', 'min(x, y)', 'max(x, y, z)', 'min3(y, z, x)',
+                           'min4(x, y, z, 3)', 'max3(x, y, z)', 'max4(x, y, z, 0)', 'sum(x, y, z, x)', 'mean(x, y, z)'):
+            self.assertGradient(expression, values)
+
+    def test_shared_subexpressions(self):
+        self.assertGradient('sin(x * y)^2 + sin(x * y) * x + x * x', {'x': 0.3, 'y': 1.7})
+
+    def test_unused_and_constant(self):
+        self.assertEqual(gradient('2 * 3 + sqrt(4)', {'x': 1}), (8.0, {'x': 0}))
+        self.assertEqual(gradient('2 * x', {'x': 1, 'y': 2}, mode='forward'), (2, {'x': 2, 'y': 0}))
+        self.assertEqual(gradient('X * Y', {'x': 2, 'y': 3}, case_sensitive=False), (6, {'x': 3, 'y': 2}))
+
+    def test_singular_points(self):
+        for mode in ('forward', 'reverse'):
+            self.assertEqual(gradient('x^0', {'x': 0}, mode=mode), (1, {'x': 0}))
+            self.assertEqual(gradient('0^x', {'x': 0.5}, mode=mode), (0.0, {'x': 0}))
+            self.assertEqual(gradient('x^2', {'x': 0}, mode=mode), (0, {'x': 0}))
+            self.assertEqual(gradient('x^0.5 + y', {'x': 0, 'y': 1}, mode=mode), (1.0, {'x': math.inf, 'y': 1}))
+            self.assertEqual(gradient('sqrt(x) * y', {'x': 0, 'y': 2}, mode=mode), (0.0, {'x': math.inf, 'y': 0.0}))
+
+    def test_user_derivative(self):
+        functions = {'square': (1, lambda x: x * x)}
+        derivatives = {'square': lambda value, x: (2 * x,)}
+        self.assertGradient('square(x) * y', {'x': 3, 'y': 2}, functions, derivatives)
+        # Called on constants only, the function needs no derivative
+        self.assertEqual(gradient('square(2) * x', {'x': 1}, functions), (4, {'x': 4}))
+        with self.assertRaises(ValueError):
+            gradient('square(x)', {'x': 1}, functions)
+
+    def test_replaced_default_function(self):
+        functions = {'sin': (1, lambda x: 2 * x)}
+        with self.assertRaises(ValueError):
+            gradient('sin(x)', {'x': 1}, functions)
+        self.assertEqual(gradient('sin(x)', {'x': 1}, functions, {'sin': lambda value, x: (2,)}), (2, {'x': 2}))
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            gradient('x', {'x': 1}, mode='symbolic')
+
+
+class TestDifferentiableExpression(unittest.TestCase):
+
+    def test_variables(self):
+        tree = build_tree(shunting_yard('x^2 * sin(y)', variable=('x', 'y')), ('x', 'y'))
+        self.assertEqual(DifferentiableExpression(tree).variables, ('x', 'y'))
+        # y is a constant
+        expression = DifferentiableExpression(tree, ('x',))
+        self.assertEqual(expression.reverse(x=3, y=math.pi / 2), (9.0, {'x': 6.0}))
+        self.assertEqual(expression.forward(x=3, y=math.pi / 2), (9.0, {'x': 6.0}))
+
+    def test_missing_variable(self):
+        tree = build_tree('x y +', ('x', 'y'), BUILTIN_FUNCTIONS)
+        with self.assertRaises(ValueError):
+            DifferentiableExpression(tree).reverse(x=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
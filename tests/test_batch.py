@@ -0,0 +1,64 @@
+import math
+import threading
+import unittest
+
+from shunting_yard import BatchResult, compute_many, MismatchedBracketsError, WorkerError, WrongExpressionError
+
+
+class UnpicklableError(Exception):
+
+    def __init__(self, message, lock):
+        super().__init__(message)
+        self.lock = lock
+
+
+def fail(value):
+    raise UnpicklableError(f'failed with {value}', threading.Lock())
+
+
+class TestComputeMany(unittest.TestCase):
+
+    def test_in_process(self):
+        results = compute_many(['1 + 2', ('2x', {'x': 3}), ('2x', {'x': 4}), ('x*y', {'x': 2, 'y': 5})], max_workers=0)
+        self.assertListEqual(results, [BatchResult(3, None), BatchResult(6, None), BatchResult(8, None), BatchResult(10, None)])
+
+    def test_errors_captured(self):
+        results = compute_many(['sin(1', '1 +', 'unknown(1)', '1/0', ('x', {}), '2'], max_workers=0)
+        self.assertIsInstance(results[0].error, MismatchedBracketsError)
+        self.assertIsInstance(results[1].error, WrongExpressionError)
+        self.assertIsInstance(results[2].error, ValueError)
+        self.assertIsInstance(results[3].error, ZeroDivisionError)
+        self.assertIsInstance(results[4].error, ValueError)
+        self.assertEqual(results[5], BatchResult(2, None))
+
+    def test_case_insensitive(self):
+        self.assertEqual(compute_many([('SQRT(X)', {'X': 4})], case_sensitive=False, max_workers=0), [BatchResult(2.0, None)])
+
+    def test_empty(self):
+        self.assertListEqual(compute_many([]), [])
+
+    def test_chunksize(self):
+        with self.assertRaises(ValueError):
+            compute_many(['1'], chunksize=0)
+
+    def test_processes(self):
+        items = [(f'x^2 + {i}', {'x': i}) for i in range(50)] + ['sin(1', '1 +']
+        results = compute_many(items, additional_functions={'gcd': (2, math.gcd)}, max_workers=2, chunksize=7)
+        self.assertListEqual([result.value for result in results[:50]], [i * i + i for i in range(50)])
+        self.assertIsInstance(results[50].error, MismatchedBracketsError)
+        self.assertIsInstance(results[51].error, WrongExpressionError)
+
+        self.assertEqual(compute_many(['gcd(12, 18)'], {'gcd': (2, math.gcd)}, max_workers=1), [BatchResult(6, None)])
+
+    def test_unpicklable_error(self):
+        results = compute_many([('fail(x)', {'x': 1}), '1 + 2'], {'fail': (1, fail)}, max_workers=1)
+        self.assertIsInstance(results[0].error, WorkerError)
+        self.assertEqual(results[0].error.type_name, 'UnpicklableError')
+        self.assertEqual(str(results[0].error), 'UnpicklableError : failed with 1')
+        self.assertEqual(results[1], BatchResult(3, None))
+
+        self.assertIsInstance(compute_many([('fail(x)', {'x': 1})], {'fail': (1, fail)}, max_workers=0)[0].error, UnpicklableError)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import io
+import os
+import random
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from shunting_yard import compute, parse_cache_info
+from shunting_yard.bench import (BENCHMARK_CORPORA, BENCHMARK_STAGES, compare_to_baseline, load_baseline, main, run_suite, save_baseline, scaling,
+                                 SCALING_CORPORA)
+
+
+class TestScalingBenchmark(unittest.TestCase):
+
+    def test_scaling(self):
+        results = scaling([10, 100])
+        self.assertEqual(len(results), 2 * len(SCALING_CORPORA))
+        for result in results:
+            self.assertGreater(result.tokens, 0)
+            self.assertGreaterEqual(result.shunting_yard_time, 0)
+            self.assertGreaterEqual(result.compute_rpn_time, 0)
+
+    def test_generated_expressions(self):
+        for generator in SCALING_CORPORA.values():
+            self.assertGreaterEqual(len(generator(5)), 9)
+
+    def test_main(self):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            main(['scaling', '--max-tokens', '1000'])
+        self.assertIn('tower', output.getvalue())
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+
+    def test_corpora(self):
+        for generator in BENCHMARK_CORPORA.values():
+            expressions = generator(random.Random(0))
+            self.assertListEqual(expressions, generator(random.Random(0)))
+            for expression in expressions:
+                # Every expression can be computed
+                compute(expression)
+
+    def test_run_suite(self):
+        cache_size = parse_cache_info().maxsize
+        results = run_suite(['short', 'nested'], repeat=2)
+        self.assertEqual(parse_cache_info().maxsize, cache_size)
+        self.assertEqual(len(results), 2 * len(BENCHMARK_STAGES))
+
+        for result in results:
+            self.assertEqual(result.calls, 2 * len(BENCHMARK_CORPORA[result.corpus](random.Random(0))))
+            self.assertGreater(result.tokens, 0)
+            self.assertLessEqual(result.p50, result.p90)
+            self.assertLessEqual(result.p90, result.p99)
+            self.assertGreater(result.tokens_per_second, 0)
+
+        with self.assertRaises(ValueError):
+            run_suite(['unknown'])
+
+    def test_baseline(self):
+        results = run_suite(['short'], ['tokenize', 'compute_rpn'], repeat=1)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'baseline.json')
+            save_baseline(results, path)
+            self.assertListEqual(load_baseline(path), results)
+
+        baseline = [result._replace(total_time=result.total_time / 2) for result in results]
+        comparisons = compare_to_baseline(results, baseline[:1], threshold=0.2)
+        self.assertEqual(len(comparisons), 1)
+        self.assertAlmostEqual(comparisons[0].ratio, 0.5)
+        self.assertTrue(comparisons[0].regression)
+
+        comparisons = compare_to_baseline(results, results)
+        self.assertFalse(any(comparison.regression for comparison in comparisons))
+
+    def test_main(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'baseline.json')
+            output = io.StringIO()
+            with redirect_stdout(output):
+                main(['suite', '--corpus', 'short', '--stage', 'tokenize', '--repeat', '1', '--save', path])
+            self.assertIn('tokenize', output.getvalue())
+
+            # A baseline much faster than the current results
+            slow = [result._replace(total_time=result.total_time / 1000) for result in load_baseline(path)]
+            save_baseline(slow, path)
+            with redirect_stdout(io.StringIO()), self.assertRaises(SystemExit) as context:
+                main(['suite', '--corpus', 'short', '--stage', 'tokenize', '--repeat', '1', '--compare', path])
+            self.assertEqual(context.exception.code, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
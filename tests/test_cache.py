@@ -0,0 +1,95 @@
+import unittest
+
+from shunting_yard import clear_parse_cache, compute, parse_cache_info, set_parse_cache_size, shunting_yard
+from shunting_yard.cache import LRUCache, PARSE_CACHE
+
+
+class TestLRUCache(unittest.TestCase):
+
+    def test_get_put(self):
+        cache = LRUCache(2)
+        self.assertIsNone(cache.get('a'))
+        cache.put('a', 1)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.info(), (1, 1, 0, 2, 1))
+
+    def test_eviction(self):
+        cache = LRUCache(2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('c'), 3)
+        self.assertEqual(cache.info().evictions, 1)
+
+    def test_resize(self):
+        cache = LRUCache(3)
+        for i in range(3):
+            cache.put(i, i)
+        cache.resize(1)
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.get(2), 2)
+        self.assertEqual(cache.info().evictions, 2)
+
+    def test_disabled(self):
+        cache = LRUCache(0)
+        cache.put('a', 1)
+        self.assertEqual(len(cache), 0)
+
+    def test_negative_size(self):
+        with self.assertRaises(ValueError):
+            LRUCache(-1)
+
+    def test_clear(self):
+        cache = LRUCache(2)
+        cache.put('a', 1)
+        cache.get('a')
+        cache.clear()
+        self.assertEqual(cache.info(), (0, 0, 0, 2, 0))
+
+
+class TestParseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.maxsize = parse_cache_info().maxsize
+        clear_parse_cache()
+
+    def tearDown(self):
+        set_parse_cache_size(self.maxsize)
+        clear_parse_cache()
+
+    def test_hits_and_misses(self):
+        self.assertEqual(shunting_yard('1 + 2'), '1 2 +')
+        self.assertEqual(shunting_yard('1 + 2'), '1 2 +')
+        self.assertEqual(compute('1 + 2'), 3)
+        self.assertEqual(compute('1 + 2'), 3)
+        info = parse_cache_info()
+        # compute uses the string form too, unless it computes the expression for several bindings
+        self.assertEqual((info.hits, info.misses, info.currsize), (3, 1, 1))
+        self.assertEqual(compute('x + 2', variables=[{'x': 1}, {'x': 2}]), [3, 4])
+        self.assertEqual(parse_cache_info().currsize, 2)
+
+    def test_options_in_key(self):
+        self.assertEqual(shunting_yard('MIN(1, 2)', case_sensitive=False), '1 2 min')
+        self.assertEqual(shunting_yard('MIN(1, 2)'), '1 2 MIN')
+        self.assertEqual(shunting_yard('1e3'), '1 10 3 ^ *')
+        self.assertEqual(shunting_yard('1e3', convert_scientific_notation=False), '1 e3 *')
+        self.assertEqual(parse_cache_info().currsize, 4)
+
+    def test_size(self):
+        set_parse_cache_size(1)
+        shunting_yard('1 + 2')
+        shunting_yard('1 + 3')
+        info = parse_cache_info()
+        self.assertEqual((info.evictions, info.currsize), (1, 1))
+
+    def test_disabled(self):
+        set_parse_cache_size(0)
+        self.assertEqual(shunting_yard('1 + 2'), '1 2 +')
+        self.assertEqual(len(PARSE_CACHE), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
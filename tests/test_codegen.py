@@ -0,0 +1,62 @@
+from decimal import Decimal
+from fractions import Fraction
+import math
+import unittest
+
+from shunting_yard import compute_rpn, shunting_yard, to_python_function, to_python_source, WrongExpressionError
+
+
+class TestCodeGeneration(unittest.TestCase):
+
+    def test_inline_operators(self):
+        self.assertEqual(to_python_source('1 2 + 3 *'), 'def _sy_expression():\n    return ((1 + 2) * 3)\n')
+        self.assertEqual(to_python_source('x 2 ^ -u', ('x',)), 'def _sy_expression(x):\n    return (-(x ** 2))\n')
+
+    def test_same_results_as_compute_rpn(self):
+        for expression in ('1+2*3', '3 + 4 * 2 / ( 1 - 5 ) ^ 2 ^ 3', '-3^2', 'sin(max(2, 3) / 3 * pi)', 'min4(1, 2, -3, 4)', '2^-1'):
+            rpn = shunting_yard(expression)
+            self.assertEqual(to_python_function(rpn)(), compute_rpn(rpn))
+
+    def test_variables(self):
+        f = to_python_function(shunting_yard('2x + sin(y)'), ('x', 'y'))
+        self.assertEqual(f(1, 0), 2.0)
+        self.assertEqual(f(y=0, x=2), 4.0)
+
+    def test_functions_called_directly(self):
+        f = to_python_function('x pi * sqrt', ('x',))
+        self.assertAlmostEqual(f(4 / math.pi), 2.0)
+
+    def test_additional_functions(self):
+        self.assertEqual(to_python_function('3 inc', additional_functions={'inc': (1, lambda x:x + 1)})(), 4)
+        # Overwritten operators are not inlined
+        self.assertEqual(to_python_function('3 2 +', additional_functions={'+': (2, lambda x, y:x * y)})(), 6)
+
+    def test_variadic_functions(self):
+        f = to_python_function(shunting_yard('max(x, 1, 2) + sum()', variable='x'), ('x',))
+        self.assertEqual(f(5), 5)
+        self.assertEqual(f(0), 2)
+
+    def test_exact_numbers(self):
+        program = shunting_yard('0.1 + 0.2 * x', variable='x', as_program=True, number_type=Decimal)
+        self.assertEqual(to_python_source(program, ('x',)), 'def _sy_expression(x):\n    return (_sy_c0 + (_sy_c1 * x))\n')
+        self.assertEqual(to_python_function(program, ('x',))(Decimal(1)), Decimal('0.3'))
+        program = shunting_yard('1.5 / 3', as_program=True, number_type=Fraction)
+        self.assertEqual(to_python_function(program)(), compute_rpn(program))
+
+    def test_long_expression(self):
+        f = to_python_function(shunting_yard(' + '.join(['x'] * 5000)), ('x',))
+        self.assertEqual(f(2), 10000)
+
+    def test_errors(self):
+        with self.assertRaises(WrongExpressionError):
+            to_python_function('1 +')
+        with self.assertRaises(WrongExpressionError):
+            to_python_function('1 1 1 +')
+        with self.assertRaises(ValueError):
+            to_python_function('1 unknown')
+        with self.assertRaises(ValueError):
+            to_python_function('lambda 1 +', ('lambda',))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,151 @@
+from decimal import Decimal
+import math
+import unittest
+
+from shunting_yard import BUILTIN_FUNCTIONS, compile, compile_many, CompiledBundle, CompiledExpression, compute, MismatchedBracketsError, WrongExpressionError
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class TestCompiledExpression(unittest.TestCase):
+
+    def test_no_variable(self):
+        self.assertEqual(compile('1 + 2 * 3').evaluate(), 7)
+        self.assertAlmostEqual(compile('sin(pi/2)').evaluate(), 1.0)
+        self.assertEqual(compile('max(2, 5)').evaluate(), 5)
+
+    def test_one_variable(self):
+        expr = compile('2x + 1', variables=('x',))
+        self.assertEqual(expr.evaluate(x=3), 7)
+        self.assertEqual(expr.evaluate(x=-1), -1)
+
+    def test_multiple_variables(self):
+        expr = compile('min(x, y) * z', variables=('x', 'y', 'z'))
+        self.assertEqual(expr.evaluate(x=1, y=2, z=3), 3)
+        self.assertEqual(expr.evaluate(x=5, y=2, z=3), 6)
+
+    def test_variable_shadows_function(self):
+        self.assertEqual(compile('e + 1', variables=('e',)).evaluate(e=1), 2)
+
+    def test_case_insensitive(self):
+        self.assertEqual(compile('X + SQRT(4)', variables=('X',), case_sensitive=False).evaluate(x=1), 3.0)
+        self.assertEqual(compile('2X+1', variables=['X'], case_sensitive=False).evaluate(X=1), 3)
+        with self.assertRaises(ValueError):
+            compile('2X+1', variables=['X']).evaluate(x=1)
+
+    def test_additional_functions(self):
+        self.assertEqual(compile('inc(x)', variables=('x',), functions={'inc': (1, lambda x:x + 1)}).evaluate(x=1), 2)
+        self.assertEqual(compile('clamp(x, 0, 1)', variables=('x',), functions={'clamp': (3, lambda x, a, b:max(a, min(x, b)))}).evaluate(x=2), 1)
+
+    def test_additional_functions_not_global(self):
+        compile('inc2(1)', functions={'inc2': (1, lambda x:x + 2)})
+        with self.assertRaises(ValueError):
+            compile('inc2(1)')
+
+    def test_variadic_functions(self):
+        expression = compile('max(x, y, 0) + sum(x, y)', variables=('x', 'y'))
+        self.assertEqual(expression.evaluate(x=-1, y=-2), -3)
+        self.assertEqual(expression.evaluate(x=3, y=1), 7)
+        with self.assertRaises(WrongExpressionError):
+            CompiledExpression('1 2 max3@2')
+
+    def test_numbers_converted(self):
+        self.assertIsInstance(compile('1').evaluate(), int)
+        self.assertIsInstance(compile('1.0').evaluate(), float)
+
+    def test_compile_errors(self):
+        with self.assertRaises(MismatchedBracketsError):
+            compile('sin(1')
+        with self.assertRaises(ValueError):
+            compile('unknown(1)')
+        with self.assertRaises(WrongExpressionError):
+            compile('1 +')
+        with self.assertRaises(WrongExpressionError):
+            CompiledExpression('1 1 1 +')
+
+    def test_missing_variable(self):
+        with self.assertRaises(ValueError):
+            compile('x + y', variables=('x', 'y')).evaluate(x=1)
+
+    def test_from_rpn(self):
+        self.assertAlmostEqual(CompiledExpression('x 2 / sin', variables=('x',)).evaluate(x=math.pi), 1.0)
+
+
+FORMULAS = {
+    'r': 'sqrt(a^2 + b^2)',
+    'ratio': 'sqrt(a^2 + b^2) / a',
+    'scaled': '2 * sqrt(a^2 + b^2) + c',
+    'angle': 'sin(a) * cos(b) + c',
+    'constant': '2 * pi',
+    'variable': 'c',
+}
+
+
+class TestCompiledBundle(unittest.TestCase):
+
+    def test_evaluate(self):
+        bundle = compile_many(FORMULAS, variables=('a', 'b', 'c'))
+        self.assertIsInstance(bundle, CompiledBundle)
+        values = {'a': 3, 'b': 4, 'c': -1.5}
+        results = bundle.evaluate(**values)
+        self.assertEqual(list(results), list(FORMULAS))
+        for name, expression in FORMULAS.items():
+            self.assertEqual(results[name], compute(expression, variables=values))
+
+    def test_shared_subexpressions(self):
+        bundle = compile_many(FORMULAS, variables=('a', 'b', 'c'))
+        separate = sum(len(compile_many({name: expression}, variables=('a', 'b', 'c'))) for name, expression in FORMULAS.items())
+        # a, 2, ^, b, ^, +, sqrt, /, *, c, +, sin, cos, *, +, pi, *
+        self.assertEqual(len(bundle), 17)
+        self.assertLess(len(bundle), separate)
+
+    def test_calls_once(self):
+        calls = []
+
+        def f(x):
+            calls.append(x)
+            return x + 1
+
+        bundle = compile_many({'a': 'f(x) * 2', 'b': 'f(x) + 1', 'c': 'g(x) + g(x)'}, ('x',), {'f': (1, f), 'g': (1, f)}, impure=('g',))
+        self.assertEqual(bundle.evaluate(x=1), {'a': 4, 'b': 3, 'c': 4})
+        self.assertEqual(len(calls), 3)
+
+    def test_options(self):
+        bundle = compile_many({'a': '2X + 1', 'b': '1.5e3 * x'}, variables=('X',), case_sensitive=False, optimize=True)
+        self.assertEqual(bundle.evaluate(x=2), {'a': 5, 'b': 3000.0})
+        self.assertEqual(bundle.evaluate(X=2), {'a': 5, 'b': 3000.0})
+        self.assertEqual(compile_many({'a': '1.5e-3'}, scientific_literals=True).evaluate(), {'a': 0.0015})
+        self.assertEqual(compile_many({'a': '0.5 * pi'}, number_type=Decimal).evaluate(), {'a': Decimal('1.5707963267948965')})
+        self.assertEqual(compile('0.5 * pi', number_type=Decimal, optimize=True).evaluate(), Decimal('1.5707963267948965'))
+
+    def test_rpn(self):
+        bundle = CompiledBundle({'a': 'x 1 +', 'b': 'x 1 + 2 *'}, ('x',), BUILTIN_FUNCTIONS)
+        self.assertEqual(bundle.evaluate(x=1), {'a': 2, 'b': 4})
+        self.assertEqual(repr(bundle), "CompiledBundle(2 expressions, 5 nodes, variables=['x'])")
+
+    def test_errors(self):
+        with self.assertRaises(MismatchedBracketsError):
+            compile_many({'a': '1 + 2', 'b': '(1 + 2'})
+        with self.assertRaises(ValueError):
+            compile_many({'a': 'unknown(1)'})
+        with self.assertRaises(WrongExpressionError):
+            CompiledBundle({'a': '1 2'})
+        with self.assertRaises(ValueError):
+            compile_many({'a': 'x + 1', 'b': 'y'}, variables=('x', 'y')).evaluate(x=1)
+
+    @unittest.skipIf(np is None, 'NumPy is not installed')
+    def test_evaluate_array(self):
+        bundle = compile_many(FORMULAS, variables=('a', 'b', 'c'))
+        a, b, c = np.array([3.0, 1.0]), np.array([4.0, 2.0]), np.array([0.5, -1.0])
+        results = bundle.evaluate_array(a=a, b=b, c=c)
+        for index in range(2):
+            expected = bundle.evaluate(a=a[index], b=b[index], c=c[index])
+            for name in FORMULAS:
+                self.assertAlmostEqual(float(np.broadcast_to(results[name], a.shape)[index]), expected[name])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,9 @@
+import math
 import unittest
+from decimal import Decimal
+from fractions import Fraction
 
-from shunting_yard import compute_rpn, shunting_yard
+from shunting_yard import compute, compute_rpn, shunting_yard, VARIADIC
 
 
 class TestComputation(unittest.TestCase):
@@ -24,6 +27,44 @@ class TestComputation(unittest.TestCase):
         self.assertAlmostEqual(compute_rpn(shunting_yard('+sin(+pi/2)')), 1)
         self.assertEqual(compute_rpn(shunting_yard('+(2*3)*(1+2)*(+5*2)')), 180)
 
+    def test_variables(self):
+        self.assertEqual(compute('2x + y', variables={'x': 3, 'y': 1}), 7)
+        self.assertEqual(compute('min(x, y)', variables={'x': 3, 'y': 1}), 1)
+        self.assertEqual(compute('2X', case_sensitive=False, variables={'X': 3}), 6)
+
+    def test_variadic_functions(self):
+        self.assertEqual(compute('max(1, 5, 3) - min(4, 2)'), 3)
+        self.assertEqual(compute('sum(x, 2x, 3x)', variables={'x': 2}), 12)
+        self.assertEqual(compute('mean(1, 2, 3, 6)'), 3)
+        self.assertEqual(compute('max(' + ', '.join(map(str, range(50))) + ')'), 49)
+        self.assertEqual(compute('product(1, 2, 3, 4)', additional_functions={'product': (VARIADIC, lambda *x:math.prod(x))}), 24)
+
+    def test_scientific_literals(self):
+        for literal in ('1.5e-3', '1.1e-5', '3.3e-7', '2.2e-308', '7e22', '1.7976931348623157e308', '3.14159e0'):
+            self.assertEqual(compute(literal, scientific_literals=True), float(literal))
+        # The conversion into a multiplication by a power of 10 is not always exact
+        self.assertNotEqual(compute('1.1e-5'), float('1.1e-5'))
+        self.assertEqual(compute('-2.5e-3x', variables={'x': 2}, scientific_literals=True), -0.005)
+
+    def test_exact_numbers(self):
+        self.assertEqual(compute('0.1 + 0.2', number_type=Decimal), Decimal('0.3'))
+        self.assertEqual(compute('1.5e-3 * 3', scientific_literals=True, number_type=Fraction), Fraction(9, 2000))
+        self.assertEqual(compute_rpn('0.1 0.2 +', number_type=Decimal), Decimal('0.3'))
+
+    def test_exact_constants(self):
+        # pi and e are converted into the type of the numbers, as the float written as a number
+        self.assertEqual(compute('1.5 + pi', number_type=Decimal), Decimal('4.641592653589793'))
+        self.assertEqual(compute('2.0 * e', number_type=Fraction), 2 * Fraction(repr(math.e)))
+        self.assertEqual(compute('x + pi', variables=[{'x': 1}], number_type=Decimal), [Decimal('4.141592653589793')])
+        self.assertEqual(compute_rpn(shunting_yard('0.5 * pi', as_program=True, number_type=Decimal), number_type=Decimal), Decimal('1.5707963267948965'))
+        # A constant replaced by another function is left as it is
+        self.assertEqual(compute('1.5 + pi', additional_functions={'pi': (0, lambda: 3)}, number_type=Decimal), Decimal('4.5'))
+        self.assertIsInstance(compute('1.5 + pi'), float)
+
+    def test_variables_rows(self):
+        self.assertListEqual(compute('x^2 - y', variables=[{'x': 1, 'y': 1}, {'x': 2, 'y': 1}, {'x': 3, 'y': 0}]), [0, 3, 9])
+        self.assertListEqual(compute('2X', case_sensitive=False, variables=[{'X': 1}, {'X': 2}]), [2, 4])
+
 
 
 if __name__ == '__main__':
@@ -0,0 +1,74 @@
+import os
+import subprocess
+import sys
+import unittest
+
+import shunting_yard
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Import time allowed for the package in microseconds, on top of the modules imported by the interpreter itself, as measured by -X importtime.
+# The timing depends on the machine, so it is only checked if this environment variable gives the budget
+IMPORT_TIME_BUDGET = os.environ.get('SHUNTING_YARD_IMPORT_TIME_BUDGET')
+
+# Modules which must not be imported by "import shunting_yard". This is what keeps the import fast, whatever the speed of the machine
+LAZY_MODULES = (
+    'asyncio', 'concurrent.futures', 'decimal', 'fractions', 'hashlib', 'mmap', 'numpy', 'statistics',
+    'shunting_yard.asynchronous', 'shunting_yard.autodiff', 'shunting_yard.batch', 'shunting_yard.codegen', 'shunting_yard.compiler', 'shunting_yard.incremental', 'shunting_yard.optimizer',
+    'shunting_yard.program_cache', 'shunting_yard.stream', 'shunting_yard.tree', 'shunting_yard.validation', 'shunting_yard.vectorize',
+)
+
+
+def run_python(*arguments):
+    environment = dict(os.environ, PYTHONPATH=ROOT)
+    return subprocess.run([sys.executable, *arguments], cwd=ROOT, env=environment, capture_output=True, text=True, check=True)
+
+
+def import_time(code):
+    # Sum of the cumulative times of the top-level imports, whose names are the only ones indented by a single space
+    total = 0
+    for line in run_python('-X', 'importtime', '-c', code).stderr.splitlines()[1:]:
+        _, cumulative, name = line.split('|')
+        if not name.startswith('  '):
+            total += int(cumulative)
+    return total
+
+
+class TestImport(unittest.TestCase):
+
+    @unittest.skipUnless(IMPORT_TIME_BUDGET, 'the import time is only checked if SHUNTING_YARD_IMPORT_TIME_BUDGET is set')
+    def test_import_time_budget(self):
+        # The best of a few measures, to ignore the ones slowed down by the rest of the system
+        package = min(import_time('import shunting_yard') for _ in range(5))
+        interpreter = min(import_time('pass') for _ in range(5))
+        self.assertLess(package - interpreter, int(IMPORT_TIME_BUDGET))
+
+    def test_lazy_modules(self):
+        code = f'import sys, shunting_yard; print(*(name for name in {LAZY_MODULES!r} if name in sys.modules))'
+        self.assertEqual(run_python('-c', code).stdout.split(), [])
+
+    def test_lazy_names(self):
+        code = 'import sys, shunting_yard; shunting_yard.compile; print(*sorted(name for name in sys.modules if name.startswith("shunting_yard.")))'
+        self.assertIn('shunting_yard.compiler', run_python('-c', code).stdout.split())
+        self.assertIs(shunting_yard.CompiledExpression, shunting_yard.compiler.CompiledExpression)
+        self.assertIn('compute_many', dir(shunting_yard))
+        with self.assertRaises(AttributeError):
+            shunting_yard.unknown
+
+    def test_star_import(self):
+        code = 'from shunting_yard import *; print(compile.__module__, compile_many.__module__, compute_rpn_array.__module__, compute_many.__module__, compute.__module__)'
+        self.assertEqual(run_python('-c', code).stdout.split(), ['builtins', 'shunting_yard.compiler', 'shunting_yard.vectorize', 'shunting_yard.batch', 'shunting_yard'])
+        self.assertNotIn('parse', shunting_yard.__all__)
+
+    def test_associativity(self):
+        from shunting_yard.shunting_yard import Associativity, OPERATORS_ASSOCIATIVITY
+        self.assertEqual(OPERATORS_ASSOCIATIVITY['-'], Associativity.LEFT)
+        self.assertEqual(OPERATORS_ASSOCIATIVITY['^'], Associativity.RIGHT)
+
+    def test_command_line(self):
+        self.assertEqual(run_python('-m', 'shunting_yard', '2 * (1 + 2)').stdout.strip(), '2 * (1 + 2) = 6')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+import random
+import unittest
+from unittest import mock
+
+from shunting_yard import MismatchedBracketsError, parse, ParseState, RPNProgram, shunting_yard, VARIADIC
+from shunting_yard import incremental
+
+
+def full_parse(expression, **kwargs):
+    """Result of a whole parsing of the expression, or the message of its error."""
+    try:
+        return shunting_yard(expression, single_pass=True, **kwargs)
+    except MismatchedBracketsError as error:
+        return str(error)
+
+
+def state_result(state):
+    try:
+        return state.rpn
+    except MismatchedBracketsError as error:
+        return str(error)
+
+
+class TestIncrementalParsing(unittest.TestCase):
+
+    def test_parse(self):
+        state = parse('2x + sin(max(1, 2, 3))', variable='x')
+        self.assertIsInstance(state, ParseState)
+        self.assertEqual(state.rpn, '2 x * 1 2 3 max@3 sin +')
+        self.assertIsInstance(state.program, RPNProgram)
+        self.assertEqual(str(state.program), state.rpn)
+        self.assertIsNone(state.error)
+
+    def test_edit(self):
+        state = parse('2 * sin(x) + 1', variable='x')
+        edited = state.edit(4, 3, 'cos')
+        self.assertEqual(edited.expression, '2 * cos(x) + 1')
+        self.assertEqual(edited.rpn, '2 x cos * 1 +')
+        # The previous state is not modified
+        self.assertEqual(state.expression, '2 * sin(x) + 1')
+        self.assertEqual(state.rpn, '2 x sin * 1 +')
+
+        self.assertEqual(edited.edit(14, 0, '2').rpn, '2 x cos * 12 +')
+        self.assertEqual(edited.edit(0, 0, '(').edit(11, 0, ')').rpn, '2 x cos * 1 +')
+        self.assertEqual(edited.edit(0, 14, '').rpn, '')
+
+    def test_brackets_errors(self):
+        state = parse('(1 + 2) * 3')
+        state = state.edit(7, 0, ')')
+        self.assertIsInstance(state.error, MismatchedBracketsError)
+        with self.assertRaisesRegex(MismatchedBracketsError, 'More right than left brackets.'):
+            state.rpn
+        with self.assertRaises(MismatchedBracketsError):
+            state.program
+
+        state = state.edit(7, 1, '')
+        self.assertEqual(state.rpn, '1 2 + 3 *')
+
+        state = state.edit(0, 0, '(')
+        with self.assertRaisesRegex(MismatchedBracketsError, 'More left than right brackets.'):
+            state.rpn
+
+    def test_scientific_notation(self):
+        # The exponent depends on the characters after the 'e'
+        state = parse('1e 2 + x', variable='x')
+        self.assertEqual(state.rpn, full_parse('1e 2 + x', variable='x'))
+        state = state.edit(3, 1, '')
+        self.assertEqual(state.rpn, full_parse('1e + x', variable='x'))
+        state = state.edit(3, 0, '-3')
+        self.assertEqual(state.rpn, full_parse('1e -3+ x', variable='x'))
+
+        state = parse('1e2', convert_scientific_notation=False)
+        self.assertEqual(state.edit(3, 0, '5').rpn, '1 e25 *')
+
+    def test_scientific_literals(self):
+        state = parse('1.5e-3 + x', variable='x', scientific_literals=True)
+        self.assertEqual(state.rpn, '1.5e-3 x +')
+        self.assertEqual(state.edit(5, 1, '12').rpn, '1.5e-12 x +')
+        self.assertEqual(state.edit(3, 1, '').rpn, '1.5 3 - x +')
+
+        random.seed(4)
+        pieces = ['1', '2', '.', 'e', 'e-', '+', '-', 'x', ' ', '(', ')']
+        expression = '1.5e-3 + x'
+        for _ in range(300):
+            offset = random.randint(0, len(expression))
+            deleted = random.randint(0, min(3, len(expression) - offset))
+            inserted = ''.join(random.choices(pieces, k=random.randint(0, 3)))
+            state = state.edit(offset, deleted, inserted)
+            expression = expression[:offset] + inserted + expression[offset + deleted:]
+            self.assertEqual(state_result(state), full_parse(expression, variable='x', scientific_literals=True), expression)
+
+    def test_options(self):
+        state = parse('X + MAX(1, 2, 3)', case_sensitive=False, variable='X')
+        self.assertEqual(state.edit(0, 1, 'X * 2').rpn, 'x 2 * 1 2 3 max@3 +')
+
+        state = parse('f(1, 2, 3)', functions={'f': (VARIADIC, sum)})
+        self.assertEqual(state.rpn, '1 2 3 f@3')
+        self.assertEqual(state.edit(6, 3, '').rpn, '1 2 f')
+
+    def test_wrong_edit(self):
+        state = parse('1 + 2')
+        for offset, deleted in ((-1, 0), (0, 6), (5, 1), (2, -1)):
+            with self.assertRaises(ValueError):
+                state.edit(offset, deleted, '')
+
+    def test_reuse(self):
+        # Only the tokens around the edit are scanned again, and the parser stops as soon as it is in the same state as before
+        expression = ' + '.join(f'sin(x * {i})' for i in range(1000))
+        state = parse(expression, variable='x')
+        offset = expression.index('500')
+
+        with mock.patch('shunting_yard.incremental.Parser.feed', autospec=True, side_effect=incremental.Parser.feed) as feed:
+            edited = state.edit(offset, 3, '7')
+            fed = sum(len(call.args[1]) for call in feed.call_args_list)
+
+        self.assertLess(fed, 2 * incremental.CHECKPOINT_INTERVAL)
+        self.assertEqual(edited.rpn, full_parse(expression.replace('500', '7'), variable='x'))
+        self.assertIs(edited.tokens[-1], state.tokens[-1])
+
+    def test_random_edits(self):
+        pieces = ['1', '2', '.', 'e', 'x', 'y', 'sin', 'max', '(', ')', ',', ';', '+', '-', '*', '/', '^', ' ', 'e-', 'é', '2.e3', 'pi']
+        random.seed(3)
+
+        for interval in (1, 3, 32):
+            with mock.patch('shunting_yard.incremental.CHECKPOINT_INTERVAL', interval):
+                for _ in range(200):
+                    expression = ''.join(random.choices(pieces, k=random.randint(0, 30)))
+                    state = parse(expression, variable=('x', 'y'))
+                    self.assertEqual(state_result(state), full_parse(expression, variable=('x', 'y')))
+
+                    for _ in range(10):
+                        offset = random.randint(0, len(expression))
+                        deleted = random.randint(0, min(5, len(expression) - offset))
+                        inserted = ''.join(random.choices(pieces, k=random.randint(0, 3)))
+
+                        state = state.edit(offset, deleted, inserted)
+                        expression = expression[:offset] + inserted + expression[offset + deleted:]
+                        self.assertEqual(state.expression, expression)
+                        self.assertEqual(state_result(state), full_parse(expression, variable=('x', 'y')), expression)
+                        self.assertListEqual(state.tokens, parse(expression, variable=('x', 'y')).tokens)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import math
+import random
+import unittest
+
+from shunting_yard import compile, compute_rpn, optimize, RPNProgram, shunting_yard
+from shunting_yard.program import FUNCTION, NUMBER
+
+
+class TestOptimize(unittest.TestCase):
+
+    def test_constant_folding(self):
+        self.assertEqual(optimize(shunting_yard('2 * pi')), '6.283185307179586')
+        self.assertEqual(optimize(shunting_yard('sqrt(4) + max(1, 3)')), '5.0')
+        self.assertEqual(optimize(shunting_yard('x + 2 * 3', variable='x'), variables=('x',)), 'x 6 +')
+        self.assertEqual(optimize('1 2 +'), '3')
+
+    def test_unary_minus(self):
+        self.assertEqual(optimize(shunting_yard('-x', variable='x'), variables=('x',)), 'x -u')
+        self.assertEqual(optimize(shunting_yard('--x', variable='x'), variables=('x',)), 'x')
+        self.assertEqual(optimize(shunting_yard('-2^x', variable='x'), variables=('x',)), '2 x ^ -u')
+        self.assertEqual(optimize(shunting_yard('-1')), '1 -u')
+        self.assertEqual(optimize(shunting_yard('x * (2 - 3)', variable='x'), variables=('x',)), 'x -u')
+
+    def test_scientific_notation(self):
+        self.assertEqual(optimize(shunting_yard('1.5e3')), '1500.0')
+        self.assertEqual(optimize(shunting_yard('2e-5')), '0.00002')
+        self.assertEqual(optimize(shunting_yard('1e-300')), '0.' + '0' * 299 + '1')
+        self.assertEqual(compute_rpn(optimize(shunting_yard('1e-300'))), 1e-300)
+        self.assertEqual(optimize(shunting_yard('1.0e20')), '100000000000000000000.')
+
+    def test_identities(self):
+        self.assertEqual(optimize(shunting_yard('(x - 0) * 1 ^ 1', variable='x'), variables=('x',)), 'x')
+        self.assertEqual(optimize(shunting_yard('1 * x ^ 1 * -1', variable='x'), variables=('x',)), 'x -u')
+        # These would change the type or the value of some results
+        self.assertEqual(optimize(shunting_yard('x / 1', variable='x'), variables=('x',)), 'x 1 /')
+        self.assertEqual(optimize(shunting_yard('x * 1.', variable='x'), variables=('x',)), 'x 1. *')
+        self.assertEqual(optimize(shunting_yard('x * 0', variable='x'), variables=('x',)), 'x 0 *')
+        # -0.0 + 0 and 0 - 0.0 are 0.0, whereas x and -x would be -0.0
+        for expression in ('x + 0', '0 + x', '0 - x'):
+            rpn = shunting_yard(expression, variable='x')
+            self.assertEqual(optimize(rpn, variables=('x',)), rpn)
+            for value in (0.0, -0.0):
+                self.assertEqual(math.copysign(1, compute_rpn(optimize(rpn, variables=('x',)), variables={'x': value})),
+                                 math.copysign(1, compute_rpn(rpn, variables={'x': value})))
+
+    def test_no_folding(self):
+        # Errors and non finite results are left to the computation
+        self.assertEqual(optimize('1 0 / x +', variables=('x',)), '1 0 / x +')
+        self.assertEqual(optimize(shunting_yard('sqrt(-1)')), '1 -u sqrt')
+        self.assertEqual(optimize('10. 400 ^'), '10. 400 ^')
+        self.assertEqual(optimize('9 9 9 ^ ^'), '9 387420489 ^')
+        # Wrong expressions are returned unchanged
+        self.assertEqual(optimize('1 2 3 +'), '1 2 3 +')
+        self.assertEqual(optimize('1 +'), '1 +')
+        self.assertEqual(optimize('1 2 unknown'), '1 2 unknown')
+
+    def test_functions(self):
+        calls = []
+        def counter():
+            calls.append(None)
+            return len(calls)
+
+        functions = {'counter': (0, counter), 'double': (1, lambda x:2 * x)}
+        self.assertEqual(optimize('counter 1 double +', functions, impure=('counter',)), 'counter 2 +')
+        self.assertEqual(optimize('counter 1 double +', functions), '3')
+        # Overwritten operators are neither simplified nor used for negative numbers
+        self.assertEqual(optimize('x 1 *', {'*': (2, lambda a, b:a + b)}, variables=('x',)), 'x 1 *')
+        self.assertEqual(optimize('0 1 -', {'-u': (1, abs)}), '0 1 -')
+        # Variables are not functions, even with the same name
+        self.assertEqual(optimize('e 2 *', variables=('e',)), 'e 2 *')
+
+    def test_variadic_functions(self):
+        self.assertEqual(optimize(shunting_yard('max(1, 2, 3) * x', variable='x'), variables=('x',)), '3 x *')
+        self.assertEqual(optimize(shunting_yard('max(1, x, 2 + 3)', variable='x'), variables=('x',)), '1 x 5 max@3')
+        self.assertEqual(optimize('sum@0'), '0')
+        self.assertEqual(optimize('1 2 max3@2'), '1 2 max3@2')
+
+    def test_program(self):
+        program = optimize(shunting_yard('-x + 2 * 3', variable='x', as_program=True))
+        self.assertIsInstance(program, RPNProgram)
+        self.assertEqual(str(program), 'x -u 6 +')
+        self.assertTupleEqual(program.opcodes, (1, FUNCTION, NUMBER, FUNCTION))
+        self.assertEqual(program, RPNProgram.parse('x -u 6 +', ('x',)))
+
+    def test_same_result(self):
+        expressions = ['-x + 2 * pi', '3x^2 - 2x + 1.5e2', '-(1 - x) * -2', 'max(x, -1) / 2 + 0', 'sin(-x) ^ 1 * cos(pi / 3)', '2^-x', '--x - -1']
+        for expression in expressions:
+            rpn = shunting_yard(expression, variable='x')
+            optimized = optimize(rpn, variables=('x',))
+            self.assertLessEqual(len(optimized.split()), len(rpn.split()))
+            for x in (-2, 0, 1, 2.5):
+                self.assertAlmostEqual(compute_rpn(optimized, variables={'x': x}), compute_rpn(rpn, variables={'x': x}), msg=expression)
+
+    def test_random_constants(self):
+        random.seed(0)
+        for _ in range(200):
+            expression = str(random.randint(0, 9)) + ''.join(random.choice('-+*/') + str(random.randint(0, 9)) for _ in range(6))
+            rpn = shunting_yard(expression)
+            try:
+                expected = compute_rpn(rpn)
+            except ZeroDivisionError:
+                self.assertRaises(ZeroDivisionError, compute_rpn, optimize(rpn))
+                continue
+            self.assertEqual(compute_rpn(optimize(rpn)), expected, msg=expression)
+
+    def test_deep_expression(self):
+        rpn = ' '.join(['x'] + ['1 *'] * 100000)
+        self.assertEqual(optimize(rpn, variables=('x',)), 'x')
+
+    def test_compile(self):
+        expression = compile('-x * 2 * pi', variables=('x',), optimize=True)
+        self.assertEqual(expression.rpn, 'x -u 2 * 3.141592653589793 *')
+        self.assertAlmostEqual(expression.evaluate(x=1), -6.283185307179586)
+        self.assertEqual(compile('counter() + 1', functions={'counter': (0, lambda:1)}, optimize=True, impure=('counter',)).rpn, 'counter 1 +')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+import threading
+import unittest
+
+from shunting_yard import (clear_parse_cache, compute, compute_rpn, profile, ProfileCollector, ProfileHook, set_profile_hook, shunting_yard)
+from shunting_yard import profiling
+
+
+class RecordingHook(ProfileHook):
+
+    def __init__(self):
+        self.events = []
+
+    def stage(self, name, elapsed, tokens):
+        self.events.append(('stage', name, tokens))
+
+    def stack_depth(self, depth):
+        self.events.append(('stack_depth', depth))
+
+    def function(self, name, calls, elapsed):
+        self.events.append(('function', name, calls))
+
+
+class TestProfiling(unittest.TestCase):
+
+    def setUp(self):
+        clear_parse_cache()
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(profiling.HOOK.get())
+
+    def test_hook(self):
+        with profile(RecordingHook()) as hook:
+            self.assertIs(profiling.HOOK.get(), hook)
+            self.assertEqual(shunting_yard('(1 + 2) * 3'), '1 2 + 3 *')
+            self.assertEqual(compute_rpn('1 2 + 3 *'), 9)
+        self.assertIsNone(profiling.HOOK.get())
+
+        self.assertListEqual(hook.events[:4], [
+            ('stage', 'tokenize', 7),
+            ('stage', 'parse', 7),
+            ('stack_depth', 2),
+            ('stage', 'compute', 5),
+        ])
+        self.assertCountEqual(hook.events[4:], [('function', '+', 1), ('function', '*', 1)])
+
+    def test_collector(self):
+        calls = []
+        def identity(x):
+            calls.append(x)
+            return x
+
+        with profile() as collector:
+            compute('identity(1) + identity(2) * sin(0)', additional_functions={'identity': (1, identity)})
+            compute_rpn('x 1 +', variables=[{'x': 1}, {'x': 2}])
+
+        self.assertIsInstance(collector, ProfileCollector)
+        self.assertListEqual(calls, [1, 2])
+        self.assertEqual(collector.stages['tokenize'].calls, 1)
+        self.assertEqual(collector.stages['parse'].tokens, collector.stages['tokenize'].tokens)
+        self.assertEqual(collector.stages['compute'].calls, 2)
+        self.assertEqual(collector.stages['compute'].tokens, 8 + 2 * 3)
+        self.assertEqual(collector.functions['identity'].calls, 2)
+        self.assertEqual(collector.functions['+'].calls, 3)
+        self.assertEqual(collector.functions['sin'].calls, 1)
+        self.assertGreaterEqual(collector.functions['identity'].total_time, 0)
+        self.assertEqual(collector.max_stack_depth, 4)
+
+        report = collector.report()
+        self.assertIn('identity', report)
+        self.assertIn('tokenize', report)
+
+        collector.reset()
+        self.assertDictEqual(collector.stages, {})
+        self.assertEqual(collector.max_stack_depth, 0)
+
+    def test_errors(self):
+        # The hook is disabled even if the computation fails
+        with self.assertRaises(ZeroDivisionError), profile() as collector:
+            compute_rpn('1 1 + 0 /')
+        self.assertIsNone(profiling.HOOK.get())
+        self.assertNotIn('compute', collector.stages)
+
+    def test_set_profile_hook(self):
+        hook = ProfileCollector()
+        self.assertIsNone(set_profile_hook(hook))
+        try:
+            shunting_yard('1 + 2')
+            # The expressions of the parsing cache are not parsed again
+            shunting_yard('1 + 2')
+        finally:
+            self.assertIs(set_profile_hook(None), hook)
+        self.assertEqual(hook.stages['parse'].calls, 1)
+
+    def test_nested(self):
+        with profile(RecordingHook()) as outer:
+            with profile(RecordingHook()) as inner:
+                compute_rpn('1 2 +')
+            self.assertIs(profiling.HOOK.get(), outer)
+            compute_rpn('1 2 *')
+        self.assertIsNone(profiling.HOOK.get())
+        self.assertIn(('function', '+', 1), inner.events)
+        self.assertNotIn(('function', '*', 1), inner.events)
+        self.assertIn(('function', '*', 1), outer.events)
+        self.assertNotIn(('function', '+', 1), outer.events)
+
+    def test_threads(self):
+        # The hook enabled by a thread does not measure the other threads, nor is disabled by them
+        started, stopped = threading.Event(), threading.Event()
+        def other():
+            compute_rpn('1 2 -')
+            with profile():
+                started.set()
+                stopped.wait(5)
+
+        thread = threading.Thread(target=other)
+        with profile(RecordingHook()) as hook:
+            thread.start()
+            started.wait(5)
+            compute_rpn('1 2 *')
+            stopped.set()
+            thread.join()
+            self.assertIs(profiling.HOOK.get(), hook)
+            compute_rpn('1 2 +')
+
+        self.assertNotIn(('function', '-', 1), hook.events)
+        self.assertIn(('function', '*', 1), hook.events)
+        self.assertIn(('function', '+', 1), hook.events)
+
+
+if __name__ == '__main__':
+    unittest.main()
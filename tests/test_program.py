@@ -0,0 +1,69 @@
+import unittest
+from decimal import Decimal
+from fractions import Fraction
+
+from shunting_yard import compile, compute_rpn, RPNProgram, shunting_yard
+from shunting_yard.program import FUNCTION, NUMBER, VARIABLE
+
+
+class TestRPNProgram(unittest.TestCase):
+
+    def test_from_tokens(self):
+        program = RPNProgram.from_tokens(['2', 'x', '*', '1.5', '+'], variables=('x',))
+        self.assertTupleEqual(program.opcodes, (NUMBER, VARIABLE, FUNCTION, NUMBER, FUNCTION))
+        self.assertTupleEqual(program.operands, (2, 'x', '*', 1.5, '+'))
+        self.assertIsInstance(program.operands[0], int)
+        self.assertEqual(len(program), 5)
+        self.assertListEqual(list(program), [(NUMBER, 2), (VARIABLE, 'x'), (FUNCTION, '*'), (NUMBER, 1.5), (FUNCTION, '+')])
+
+    def test_serialization(self):
+        program = RPNProgram.parse('1. 2 max pi *')
+        self.assertEqual(str(program), '1. 2 max pi *')
+        self.assertEqual(RPNProgram.parse(str(program)), program)
+        self.assertEqual(hash(RPNProgram.parse(str(program))), hash(program))
+        self.assertNotEqual(RPNProgram.parse('x', ('x',)), RPNProgram.parse('x'))
+
+    def test_arities(self):
+        program = RPNProgram.parse('1 2 3 max@3 2 max')
+        self.assertTupleEqual(program.operands, (1, 2, 3, 'max', 2, 'max'))
+        self.assertTupleEqual(program.arities, (None, None, None, 3, None, None))
+        self.assertEqual(str(program), '1 2 3 max@3 2 max')
+        self.assertNotEqual(program, RPNProgram.parse('1 2 3 max 2 max'))
+        self.assertTupleEqual(RPNProgram((), (), ()).arities, ())
+        with self.assertRaises(ValueError):
+            RPNProgram.parse('1 max@')
+        with self.assertRaises(ValueError):
+            RPNProgram.parse('1 @1')
+
+    def test_wrong_number(self):
+        with self.assertRaises(ValueError):
+            RPNProgram.parse('1.2.3 1 +')
+        with self.assertRaises(ValueError):
+            RPNProgram.parse('1e2e3')
+
+    def test_number_types(self):
+        self.assertTupleEqual(RPNProgram.parse('1 1.5 1.5e-3 .5e+2 1e3').operands, (1, 1.5, 0.0015, 50.0, 1000.0))
+        self.assertTupleEqual(RPNProgram.parse('1 1.5 1.5e-3', number_type=Decimal).operands, (1, Decimal('1.5'), Decimal('0.0015')))
+        self.assertTupleEqual(RPNProgram.parse('1 1.5 1.5e-3', number_type=Fraction).operands, (1, Fraction(3, 2), Fraction(3, 2000)))
+        self.assertIsInstance(shunting_yard('0.1 + 1', as_program=True, number_type=Decimal).operands[0], Decimal)
+
+    def test_shunting_yard(self):
+        program = shunting_yard('2 * sin(x)', variable='x', as_program=True)
+        self.assertIsInstance(program, RPNProgram)
+        self.assertEqual(str(program), shunting_yard('2 * sin(x)', variable='x'))
+        self.assertTupleEqual(program.opcodes, (NUMBER, VARIABLE, FUNCTION, FUNCTION))
+
+    def test_compute_rpn(self):
+        self.assertEqual(compute_rpn(shunting_yard('1 + 2 * 3', as_program=True)), 7)
+        self.assertEqual(compute_rpn(shunting_yard('2x', variable='x', as_program=True), variables={'x': 4}), 8)
+        self.assertListEqual(compute_rpn(shunting_yard('2x', variable='x', as_program=True), variables=[{'x': 1}, {'x': 2}]), [2, 4])
+        with self.assertRaises(ValueError):
+            compute_rpn(shunting_yard('2x', variable='x', as_program=True))
+
+    def test_compiled_expression(self):
+        self.assertEqual(compile('x^2', variables=('x',)).program, shunting_yard('x^2', variable='x', as_program=True))
+        self.assertEqual(compile('x^2', variables=('x',)).rpn, 'x 2 ^')
+
+
+if __name__ == '__main__':
+    unittest.main()
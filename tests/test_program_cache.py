@@ -0,0 +1,122 @@
+import os
+import tempfile
+import unittest
+from decimal import Decimal
+from unittest import mock
+
+from shunting_yard import BUILTIN_FUNCTIONS, CompiledExpression, FunctionRegistry, ProgramCache, ProgramCacheError, shunting_yard, VARIADIC
+from shunting_yard import program_cache
+
+
+class TestProgramCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'programs.cache')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_save_and_load(self):
+        expressions = [f'sin(x * {i}) + max({i}, y, 2) - 1.5' for i in range(100)]
+        with ProgramCache(self.path) as cache:
+            self.assertEqual(len(cache), 0)
+            for expression in expressions:
+                cache.shunting_yard(expression, ('x', 'y'))
+            self.assertEqual(len(cache), 100)
+            cache.save()
+            self.assertEqual(len(cache), 100)
+
+        with ProgramCache(self.path) as cache:
+            self.assertEqual(len(cache), 100)
+            with mock.patch.object(program_cache, 'shunting_yard') as parse:
+                for expression in expressions:
+                    program = cache.shunting_yard(expression, ('x', 'y'))
+                    self.assertEqual(program, shunting_yard(expression, variable=('x', 'y'), as_program=True))
+                    self.assertTupleEqual(program.operands, shunting_yard(expression, variable=('x', 'y'), as_program=True).operands)
+                parse.assert_not_called()
+
+    def test_get_and_put(self):
+        with ProgramCache(self.path) as cache:
+            self.assertIsNone(cache.get('1 + 2'))
+            cache.put(shunting_yard('1 + 2', as_program=True), '1 + 2')
+            self.assertEqual(str(cache.get('1 + 2')), '1 2 +')
+
+            # The options are part of the key
+            self.assertIsNone(cache.get('1 + 2', variables=('x',)))
+            self.assertIsNone(cache.get('1 + 2', case_sensitive=False))
+            self.assertIsNone(cache.get('1 + 2', scientific_literals=True))
+            self.assertIsNone(cache.get('1 + 2', functions={'f': (1, abs)}))
+
+            with self.assertRaises(ValueError):
+                cache.put(shunting_yard('0.5', as_program=True, number_type=Decimal), '0.5')
+
+    def test_incremental_save(self):
+        with ProgramCache(self.path) as cache:
+            cache.shunting_yard('1 + 2')
+            cache.save()
+        with ProgramCache(self.path) as cache:
+            cache.shunting_yard('1 + 2')
+            cache.shunting_yard('3 * 4')
+            self.assertEqual(len(cache), 2)
+            cache.save()
+        with ProgramCache(self.path) as cache:
+            self.assertEqual(len(cache), 2)
+            self.assertEqual(str(cache.get('1 + 2')), '1 2 +')
+            self.assertEqual(str(cache.get('3 * 4')), '3 4 *')
+
+    def test_compile(self):
+        functions = BUILTIN_FUNCTIONS.overlay({'f': (VARIADIC, lambda *values: sum(values))})
+        with ProgramCache(self.path) as cache:
+            compiled = cache.compile('f(X, 2, 3)', variables=('X',), functions=functions, case_sensitive=False)
+            self.assertIsInstance(compiled, CompiledExpression)
+            self.assertEqual(compiled.evaluate(x=1), 6)
+            self.assertEqual(compiled.evaluate(X=1), 6)
+            cache.save()
+
+        with ProgramCache(self.path) as cache:
+            self.assertEqual(str(cache.get('f(X, 2, 3)', ('x',), functions, case_sensitive=False)), 'x 2 3 f@3')
+            self.assertEqual(cache.compile('f(X, 2, 3)', variables=('X',), functions=functions, case_sensitive=False).evaluate(x=2), 7)
+
+    def test_registry_fingerprint(self):
+        registry = FunctionRegistry({'f': (1, abs)}, impure=('f',))
+        self.assertEqual(registry.fingerprint, FunctionRegistry({'f': (1, abs)}, impure=('f',)).fingerprint)
+        self.assertNotEqual(registry.fingerprint, FunctionRegistry({'f': (1, abs)}).fingerprint)
+        self.assertNotEqual(registry.fingerprint, FunctionRegistry({'f': (2, abs)}, impure=('f',)).fingerprint)
+        self.assertNotEqual(registry.fingerprint, FunctionRegistry({'f': (1, round)}, impure=('f',)).fingerprint)
+        self.assertEqual(BUILTIN_FUNCTIONS.overlay({}).fingerprint, BUILTIN_FUNCTIONS.fingerprint)
+
+    def test_wrong_file(self):
+        with open(self.path, 'wb') as file:
+            file.write(b'not a cache file at all')
+        with self.assertRaises(ProgramCacheError):
+            ProgramCache(self.path)
+
+    def test_other_python_version(self):
+        # marshal can change between Python versions, so a file written by another version is refused
+        with mock.patch.object(program_cache, '_PYTHON_VERSION', (2, 7)):
+            with ProgramCache(self.path) as cache:
+                cache.shunting_yard('1 + 2')
+                cache.save()
+        with self.assertRaises(ProgramCacheError):
+            ProgramCache(self.path)
+
+    def test_corrupt_record(self):
+        with ProgramCache(self.path) as cache:
+            cache.shunting_yard('1 + 2')
+            cache.save()
+
+        with open(self.path, 'r+b') as file:
+            _, _, _, _, _, _, index_offset = program_cache._HEADER.unpack(file.read(program_cache._HEADER.size))
+            file.seek(index_offset)
+            _, offset, length = program_cache._ENTRY.unpack(file.read(program_cache._ENTRY.size))
+            file.seek(offset)
+            file.write(b'\0' * length)
+
+        with ProgramCache(self.path) as cache:
+            with self.assertRaises(ProgramCacheError):
+                cache.get('1 + 2')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import pickle
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from shunting_yard import BUILTIN_FUNCTIONS, compile, compute, compute_many, compute_rpn, FunctionRegistry, optimize, to_python_function
+from shunting_yard.rpn import as_registry, BUILTIN_TABLE, FUNCTIONS, RPNProgram
+
+
+def double(x):
+    return 2 * x
+
+
+class TestFunctionRegistry(unittest.TestCase):
+
+    def test_mapping(self):
+        registry = FunctionRegistry({'double': (1, double)})
+        self.assertEqual(registry['double'], (1, double))
+        self.assertIn('double', registry)
+        self.assertNotIn('+', registry)
+        self.assertEqual(len(registry), 1)
+        self.assertListEqual(list(registry), ['double'])
+        with self.assertRaises(KeyError):
+            registry['+']
+
+    def test_overlay(self):
+        registry = BUILTIN_FUNCTIONS.overlay({'double': (1, double), 'abs': (1, double)})
+        self.assertIs(registry.parent, BUILTIN_FUNCTIONS)
+        self.assertEqual(registry['double'], (1, double))
+        self.assertEqual(registry['abs'], (1, double))
+        self.assertEqual(registry['+'], FUNCTIONS['+'])
+        self.assertEqual(len(registry), len(FUNCTIONS) + 1)
+        # The base registry is not modified
+        self.assertNotIn('double', BUILTIN_FUNCTIONS)
+        self.assertEqual(BUILTIN_FUNCTIONS['abs'], (1, abs))
+
+        self.assertEqual(registry.overlay({'abs': (1, abs)})['abs'], (1, abs))
+        self.assertEqual(registry.resolve(['double', 'x', '+', 'double']), {'double': (1, double), '+': FUNCTIONS['+']})
+
+    def test_impure(self):
+        registry = BUILTIN_FUNCTIONS.overlay({'f': (0, double), 'g': (0, double)}, impure=['f', 'g'])
+        self.assertEqual(registry.impure, {'f', 'g'})
+        self.assertEqual(registry.overlay({'f': (0, double)}).impure, {'g'})
+        self.assertEqual(registry.overlay(impure=['sin']).impure, {'f', 'g', 'sin'})
+
+    def test_hash(self):
+        first = BUILTIN_FUNCTIONS.overlay({'double': (1, double)})
+        second = FunctionRegistry(FUNCTIONS).overlay({'double': (1, double)})
+        self.assertEqual(first, second)
+        self.assertEqual(hash(first), hash(second))
+        self.assertEqual(first, FunctionRegistry({**FUNCTIONS, 'double': (1, double)}))
+        self.assertNotEqual(first, BUILTIN_FUNCTIONS)
+        self.assertNotEqual(first, first.overlay(impure=['double']))
+        self.assertEqual(len({first: 1, second: 2}), 1)
+
+    def test_pickle(self):
+        registry = BUILTIN_FUNCTIONS.overlay({'double': (1, double)}, impure=['double'])
+        copy = pickle.loads(pickle.dumps(registry))
+        self.assertEqual(copy, registry)
+        self.assertEqual(copy.impure, {'double'})
+
+    def test_as_registry(self):
+        self.assertIs(as_registry(None), BUILTIN_FUNCTIONS)
+        registry = FunctionRegistry({'double': (1, double)})
+        self.assertIs(as_registry(registry), registry)
+        self.assertEqual(as_registry({'double': (1, double)}), BUILTIN_FUNCTIONS.overlay({'double': (1, double)}))
+
+
+class TestIsolation(unittest.TestCase):
+
+    def test_no_mutation(self):
+        functions = dict(FUNCTIONS)
+        self.assertEqual(compute_rpn('1 double', {'double': (1, double)}), 2)
+        self.assertEqual(compute_rpn('1 abs', {'abs': (1, double)}), 2)
+        self.assertEqual(compute_rpn(RPNProgram.parse('1 abs'), {'abs': (1, double)}), 2)
+        self.assertDictEqual(FUNCTIONS, functions)
+        self.assertDictEqual(BUILTIN_TABLE, functions)
+        self.assertEqual(compute_rpn('1 abs'), 1)
+        with self.assertRaises(ValueError):
+            compute_rpn('1 double')
+
+    def test_registry(self):
+        registry = FunctionRegistry({'+': (2, lambda a, b:a * b)})
+        self.assertEqual(compute_rpn('2 3 +', registry), 6)
+        self.assertEqual(compute('2 + 3', additional_functions=registry), 6)
+        self.assertEqual(compile('2 + 3', functions=registry).evaluate(), 6)
+        self.assertEqual(to_python_function('2 3 +', additional_functions=registry)(), 6)
+        self.assertListEqual([result.value for result in compute_many(['2 + 3'], registry, max_workers=0)], [6])
+        with self.assertRaises(ValueError):
+            compute_rpn('2 3 -', registry)
+
+    def test_optimize(self):
+        calls = []
+        registry = BUILTIN_FUNCTIONS.overlay({'counter': (0, lambda:len(calls))}, impure=['counter'])
+        self.assertEqual(optimize('counter 1 2 + +', registry), 'counter 3 +')
+
+    def test_threads(self):
+        def compute_with(factor):
+            return [compute_rpn('x scale', {'scale': (1, lambda x:factor * x)}, {'x': x}) for x in range(200)]
+
+        with ThreadPoolExecutor(8) as executor:
+            results = list(executor.map(compute_with, range(16)))
+
+        for factor, result in enumerate(results):
+            self.assertListEqual(result, [factor * x for x in range(200)])
+        self.assertNotIn('scale', FUNCTIONS)
+
+
+if __name__ == '__main__':
+    unittest.main()
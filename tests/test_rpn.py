@@ -1,7 +1,7 @@
 import math
 import unittest
 
-from shunting_yard import compute_rpn, WrongExpressionError
+from shunting_yard import compute_rpn, RPNProgram, VARIADIC, WrongExpressionError
 
 
 class TestReversePolishNotation(unittest.TestCase):
@@ -36,12 +36,57 @@ class TestReversePolishNotation(unittest.TestCase):
     def test_function_two_argument(self):
         self.assertEqual(compute_rpn('2 5 max'), 5)
 
+    def test_variadic_functions(self):
+        self.assertEqual(compute_rpn('1 5 3 max@3'), 5)
+        self.assertEqual(compute_rpn('4 min@1'), 4)
+        self.assertEqual(compute_rpn(' '.join(map(str, range(50))) + ' sum@50'), 1225)
+        self.assertEqual(compute_rpn('sum@0'), 0)
+        self.assertEqual(compute_rpn('1 2 3 mean@3'), 2)
+        self.assertEqual(compute_rpn('1 2 3 4 max@3 max'), 4)
+        self.assertEqual(compute_rpn('1 2 3 f@3', {'f': (VARIADIC, lambda *x:x[0] * len(x))}), 3)
+        # Without a number of parameters, a variadic function takes two of them
+        self.assertEqual(compute_rpn('1 2 sum'), 3)
+        with self.assertRaises(WrongExpressionError):
+            compute_rpn('1 2 3 sum')
+        # The number of parameters of the other functions must be the right one
+        self.assertEqual(compute_rpn('1 2 3 max3@3'), 3)
+        with self.assertRaises(WrongExpressionError):
+            compute_rpn('1 2 max3@2')
+        with self.assertRaises(ValueError):
+            compute_rpn('1 2 max@x')
+
+    def test_variadic_functions_program(self):
+        program = RPNProgram.parse('x 5 3 max@3 1 2 sum +', ('x',))
+        self.assertEqual(compute_rpn(program, variables=[{'x': 1}, {'x': 9}]), [8, 12])
+        # The number of parameters is checked once, before computing the bindings
+        calls = []
+        functions = {'f': (1, lambda x:calls.append(x) or x)}
+        with self.assertRaises(WrongExpressionError):
+            compute_rpn(RPNProgram.parse('x f 1 2 max3@2 +', ('x',)), functions, [{'x': 1}, {'x': 2}])
+        self.assertEqual(calls, [])
+
     def test_function_additional_function(self):
         self.assertEqual(compute_rpn('3 inc', {'inc': (1, lambda x:x + 1)}), 4)
 
     def test_function_overwriting_function(self):
         self.assertEqual(compute_rpn('3 2 add', {'add': (2, lambda x, y:x + 2 * y)}), 7)
 
+    def test_variables(self):
+        self.assertEqual(compute_rpn('x 1 +', variables={'x': 2}), 3)
+        self.assertEqual(compute_rpn('x y * z +', variables={'x': 2, 'y': 3, 'z': 4}), 10)
+        self.assertEqual(compute_rpn('e 1 +', variables={'e': 1}), 2)
+
+    def test_variables_rows(self):
+        self.assertListEqual(compute_rpn('x y -', variables=[{'x': 1, 'y': 2}, {'x': 5, 'y': 3}]), [-1, 2])
+        self.assertListEqual(compute_rpn('1 2 +', variables=[]), [])
+
+    def test_high_arity_function(self):
+        self.assertEqual(compute_rpn(' '.join(['1'] * 1000) + ' sum1000', {'sum1000': (1000, lambda *x:sum(x))}), 1000)
+        self.assertEqual(compute_rpn('2 ' + ' '.join(['1'] * 999) + ' sum1000 3 *', {'sum1000': (1000, lambda *x:sum(x))}), 3003)
+
+    def test_deep_stack(self):
+        self.assertEqual(compute_rpn(' '.join(['1'] * 100000) + ' ^' * 99999), 1)
+
     def test_errors(self):
         with self.assertRaises(WrongExpressionError):
             compute_rpn('1 +')
@@ -0,0 +1,66 @@
+import math
+import random
+import unittest
+
+from shunting_yard import compute, shunting_yard, tokenize
+from shunting_yard.scanner import scan
+
+
+class TestScanner(unittest.TestCase):
+
+    def assertSameTokens(self, expression: str):
+        for convert_scientific_notation in (True, False):
+            self.assertListEqual(list(tokenize(expression, convert_scientific_notation, single_pass=True)),
+                                 list(tokenize(expression, convert_scientific_notation)), expression)
+
+    def test_offsets(self):
+        self.assertListEqual(list(scan('2x - 1')), [('2', 0), ('*', 1), ('x', 1), ('-', 3), ('1', 5)])
+        self.assertListEqual(list(scan('-a')), [('(', 0), ('0', 0), ('-', 0), ('1', 0), (')', 0), ('*', 0), ('a', 1)])
+        self.assertListEqual(list(scan('(1)(2)')), [('(', 0), ('1', 1), (')', 2), ('*', 3), ('(', 3), ('2', 4), (')', 5)])
+        self.assertListEqual(list(scan('1e3')), [('1', 0), ('*', 1), ('10', 1), ('^', 1), ('(', 1), ('3', 2), (')', 2)])
+
+    def test_spaces(self):
+        self.assertListEqual(list(scan(' s in ( 1 2 ) ')), [('sin', 1), ('(', 6), ('12', 8), (')', 12)])
+        self.assertSameTokens('1    + 2             - 3')
+        self.assertSameTokens('\t1 .5 e 3 x\n')
+
+    def test_base_cases(self):
+        for expression in ('', '1+2', '1+(2 * 3) - 4 * (2 / 3)', '-3/2*pi', 'max(1; 2, 3)', 'arc_cos(0)', '-(-1)', '2*-1', '+-+1', 'sin(x)(1+2)',
+                           '(1+2)sin(1)', 'sin(1).5', '3_func(0)', '1(2(3(4(5))))', '1+200x', '0.5', '1.x', '1.2.3', '2!3', '1+'):
+            self.assertSameTokens(expression)
+
+    def test_scientific_notation(self):
+        for expression in ('12e3', '+12e3', '-12e3', '1.2e3', '1.e3', '.2e3', '12e-3', '12e+3', '12e34', '12e3+45e-6', '123exp(4)', '123e +1',
+                           '2e', '2e3x', '2e3(1)', '2e3.5', 'a1e5', 'x1.e5', 'ab.5e3', '1e2e3', '1e2e3e4', '1.e2e3', '1.e2.5e3', '1e2.e3', '1.e-2e3'):
+            self.assertSameTokens(expression)
+
+    def test_scientific_literals(self):
+        self.assertListEqual(list(scan('1.5e-3', scientific_literals=True)), [('1.5e-3', 0)])
+        self.assertListEqual(list(scan('2 . 5 e + 3x', scientific_literals=True)), [('2.5e+3', 0), ('*', 11), ('x', 11)])
+        self.assertListEqual(list(scan('x.5e3', scientific_literals=True)), [('x.5', 0), ('*', 3), ('1e3', 3)])
+        self.assertListEqual(list(scan('1.e2e3', scientific_literals=True)), [('1.e2', 0), ('*', 4), ('1e3', 4)])
+        self.assertListEqual(list(scan('1e3', convert_scientific_notation=False, scientific_literals=True)), [('1', 0), ('*', 1), ('e3', 1)])
+        self.assertListEqual(list(tokenize('-1.5e-3', scientific_literals=True)), ['(', '0', '-', '1', ')', '*', '1.5e-3'])
+
+        # The literals give the same numbers as the conversion into multiplications
+        for expression in ('12e3', '-12e3', '1.2e3', '1.e3', '.2e3', '12e-3', '12e+3', '123e +1', '2e3(1)', '2e3.5', '1.e2e3',
+                           '1.e2.5e3', '1.e-2e3', '2e3+45e-6'):
+            self.assertTrue(math.isclose(compute(expression, scientific_literals=True), compute(expression)), expression)
+
+    def test_implicit_multiplication(self):
+        for expression in ('2x', '3cos(5)', '(1+2)(3+4)', '(1+2)3', '(1+2)x', 'x2y', '2x3y', 'a.5x', 'a.5(1)', 'x2(1)', '1.5x', 'é2x', '2é', ')!'):
+            self.assertSameTokens(expression)
+
+    def test_random_expressions(self):
+        alphabet = list('0123456789') + ['.'] * 3 + ['e'] * 6 + list('xa_E+-*/^(),;!') + [' '] * 2
+        generator = random.Random(0)
+        for _ in range(2000):
+            self.assertSameTokens(''.join(generator.choice(alphabet) for _ in range(generator.randint(0, 20))))
+
+    def test_shunting_yard(self):
+        for expression in ('3 + 4 * 2 / ( 1 - 5 ) ^ 2 ^ 3', 'sin ( max ( 2, 3 ) / 3 * pi )', 'min(1, -min(3, 4))', '2x^2 + 1.5e-3y'):
+            self.assertEqual(shunting_yard(expression, single_pass=True), shunting_yard(expression))
+
+
+if __name__ == '__main__':
+    unittest.main()
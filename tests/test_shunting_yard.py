@@ -1,6 +1,7 @@
 import unittest
 
-from shunting_yard import MismatchedBracketsError, shunting_yard
+from shunting_yard import MismatchedBracketsError, shunting_yard, VARIADIC
+from shunting_yard.shunting_yard import bound_names, lowercase_bindings, variable_names
 
 
 class TestShuntingYard(unittest.TestCase):
@@ -65,7 +66,33 @@ class TestShuntingYard(unittest.TestCase):
         self.assertEqual(shunting_yard('min(x, 1)', variable='x'), 'x 1 min')
         self.assertEqual(shunting_yard('min(1, x)', variable='x'), '1 x min')
         self.assertEqual(shunting_yard('min(ab, 1)', variable='ab'), 'ab 1 min')
-        self.assertEqual(shunting_yard('min(1, x, 2)', variable='x'), '1 x 2 min')
+        self.assertEqual(shunting_yard('min(1, x, 2)', variable='x'), '1 x 2 min@3')
+
+    def test_multiple_variables(self):
+        self.assertEqual(shunting_yard('min(x, y)', variable=('x', 'y')), 'x y min')
+        self.assertEqual(shunting_yard('x*y + z', variable={'x', 'y', 'z'}), 'x y * z +')
+        self.assertEqual(shunting_yard('X*Y', case_sensitive=False, variable=['X', 'Y']), 'x y *')
+
+    def test_variable_names(self):
+        self.assertEqual(variable_names(None), frozenset())
+        self.assertEqual(variable_names('xy'), frozenset(('xy',)))
+        self.assertEqual(variable_names(['X', 'y'], case_sensitive=False), frozenset(('x', 'y')))
+        self.assertEqual(bound_names({'X': 1}, case_sensitive=False), frozenset(('x',)))
+        self.assertEqual(bound_names([{'x': 1}, {'y': 2}]), frozenset(('x', 'y')))
+        self.assertEqual(lowercase_bindings([{'X': 1}]), [{'x': 1}])
+        self.assertIsNone(lowercase_bindings(None))
+
+    def test_variadic_functions(self):
+        self.assertEqual(shunting_yard('max(1, 2, 3) + max(4, 5)'), '1 2 3 max@3 4 5 max +')
+        self.assertEqual(shunting_yard('sum((1), 2, (3 + 4); 5)'), '1 2 3 4 + 5 sum@4')
+        self.assertEqual(shunting_yard('mean(x)', variable='x'), 'x mean@1')
+        self.assertEqual(shunting_yard('sum()'), 'sum@0')
+        self.assertEqual(shunting_yard('2max(1, min(2, 3, 4))^2'), '2 1 2 3 4 min@3 max 2 ^ *')
+        self.assertEqual(shunting_yard('max(1, 2, 3)', single_pass=True), '1 2 3 max@3')
+        # Only the variadic functions have their number of parameters written
+        self.assertEqual(shunting_yard('max3(1, 2, 3)'), '1 2 3 max3')
+        self.assertEqual(shunting_yard('f(1, 2, 3)', functions={'f': (3, max)}), '1 2 3 f')
+        self.assertEqual(shunting_yard('f(1, 2, 3)', functions={'f': (VARIADIC, max)}), '1 2 3 f@3')
 
     def test_multiple_argument_functions(self):
         self.assertEqual(shunting_yard('min(1 - 2, 3)'), '1 2 - 3 min')
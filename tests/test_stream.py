@@ -0,0 +1,90 @@
+import io
+import mmap
+import os
+import random
+import tempfile
+import unittest
+
+from shunting_yard import MismatchedBracketsError, shunting_yard, shunting_yard_stream, tokenize, tokenize_stream, VARIADIC
+
+
+def full_parse(expression, **kwargs):
+    """Result of a whole parsing of the expression, or the message of its error."""
+    try:
+        return shunting_yard(expression, single_pass=True, **kwargs)
+    except MismatchedBracketsError as error:
+        return str(error)
+
+
+def stream_parse(expression, chunk_size, **kwargs):
+    try:
+        return ' '.join(shunting_yard_stream(io.StringIO(expression), chunk_size=chunk_size, **kwargs))
+    except MismatchedBracketsError as error:
+        return str(error)
+
+
+class TestStream(unittest.TestCase):
+
+    def test_tokenize_stream(self):
+        expression = '2x + sin(1.5e-3)(x + 1)'
+        expected = list(tokenize(expression, single_pass=True))
+        for chunk_size in (1, 2, 3, 100):
+            self.assertListEqual(list(tokenize_stream(io.StringIO(expression), chunk_size=chunk_size)), expected)
+        self.assertListEqual(list(tokenize_stream(io.StringIO(''))), [])
+
+    def test_shunting_yard_stream(self):
+        rpn = shunting_yard_stream(io.StringIO('2x + max(1, 2, 3)'), variable='x', chunk_size=4)
+        self.assertNotIsInstance(rpn, str)
+        self.assertEqual(' '.join(rpn), '2 x * 1 2 3 max@3 +')
+
+        rpn = shunting_yard_stream(io.StringIO('X + F(1, 2, 3)'), case_sensitive=False, variable='X', functions={'f': (VARIADIC, sum)}, chunk_size=1)
+        self.assertEqual(' '.join(rpn), 'x 1 2 3 f@3 +')
+
+    def test_binary_files(self):
+        # The characters encoded in several bytes may be split between chunks
+        expression = 'x é 2 + 1e3 ×(4)'
+        expected = list(tokenize(expression, single_pass=True))
+        for chunk_size in (1, 2, 5):
+            self.assertListEqual(list(tokenize_stream(io.BytesIO(expression.encode()), chunk_size=chunk_size)), expected)
+
+    def test_memory_mapped_file(self):
+        expression = ' + '.join(f'sin(x * {i}) * 2.5e-3' for i in range(1000))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'expression.txt')
+            with open(path, 'w') as file:
+                file.write(expression)
+
+            with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                self.assertEqual(' '.join(shunting_yard_stream(mapped, variable='x', chunk_size=100)), shunting_yard(expression, variable='x'))
+
+    def test_incremental_output(self):
+        # The RPN tokens are yielded before the whole file is read
+        file = io.StringIO('1 + 2 + 3 + 4 + 5 + 6')
+        rpn = shunting_yard_stream(file, chunk_size=4)
+        self.assertListEqual([next(rpn) for _ in range(3)], ['1', '2', '+'])
+        self.assertLess(file.tell(), 21)
+        self.assertListEqual(list(rpn), ['3', '+', '4', '+', '5', '+', '6', '+'])
+
+    def test_brackets_errors(self):
+        with self.assertRaisesRegex(MismatchedBracketsError, 'More right than left brackets.'):
+            list(shunting_yard_stream(io.StringIO('(1 + 2)) + 3'), chunk_size=2))
+        with self.assertRaisesRegex(MismatchedBracketsError, 'More left than right brackets.'):
+            list(shunting_yard_stream(io.StringIO('((1 + 2) + 3'), chunk_size=2))
+
+    def test_random_expressions(self):
+        pieces = ['1', '2', '.', 'e', 'E', 'x', 'sin', 'max', '(', ')', ',', ';', '+', '-', '*', '/', '^', ' ', '   ', 'e-', 'é', '2.e3', 'pi']
+        random.seed(5)
+
+        for _ in range(500):
+            expression = ''.join(random.choices(pieces, k=random.randint(0, 40)))
+            chunk_size = random.randint(1, 8)
+            self.assertListEqual(list(tokenize_stream(io.StringIO(expression), chunk_size=chunk_size)), list(tokenize(expression, single_pass=True)))
+            self.assertEqual(stream_parse(expression, chunk_size, variable='x'), full_parse(expression, variable='x'), expression)
+            self.assertEqual(stream_parse(expression, chunk_size, variable='X', case_sensitive=False),
+                             full_parse(expression, variable='X', case_sensitive=False), expression)
+            self.assertListEqual(list(tokenize_stream(io.StringIO(expression), chunk_size=chunk_size, scientific_literals=True)),
+                                 list(tokenize(expression, scientific_literals=True)))
+
+
+if __name__ == '__main__':
+    unittest.main()
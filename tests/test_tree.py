@@ -0,0 +1,161 @@
+import math
+import random
+import unittest
+
+from shunting_yard import build_tree, BUILTIN_FUNCTIONS, compute, compute_rpn, ExpressionTree, ReactiveExpression, shunting_yard, TreeBuilder, WrongExpressionError
+from shunting_yard.program import FUNCTION, NUMBER, VARIABLE
+
+
+class TestExpressionTree(unittest.TestCase):
+
+    def test_shared_subexpressions(self):
+        tree = build_tree(shunting_yard('sin(x)^2 + sin(x) * 2', variable='x'), variables=('x',))
+        self.assertIsInstance(tree, ExpressionTree)
+        # x, sin, 2, ^, *, +
+        self.assertEqual(len(tree), 6)
+        self.assertListEqual([node.token for node in tree.nodes], ['x', 'sin', '2', '^', '*', '+'])
+        self.assertIs(tree.nodes[3].children[0], tree.nodes[4].children[0])
+        self.assertIs(tree.root, tree.nodes[-1])
+        self.assertEqual(tree.variables, {'x'})
+
+    def test_topological_order(self):
+        tree = build_tree(shunting_yard('(x + y) * (x + y) - max(x + y, x, 3)', variable=('x', 'y')), variables=('x', 'y'))
+        for node in tree.nodes:
+            for child in node.children:
+                self.assertLess(child.index, node.index)
+        self.assertEqual(len(tree), 7)
+        self.assertListEqual([node.opcode for node in tree.nodes[:3]], [VARIABLE, VARIABLE, FUNCTION])
+
+    def test_numbers(self):
+        tree = build_tree('1 1.0 + 1 +')
+        self.assertListEqual([node.token for node in tree.nodes if node.opcode == NUMBER], ['1', '1.0'])
+        self.assertEqual(tree.evaluate(), 3.0)
+
+    def test_each_node_computed_once(self):
+        calls = []
+        def traced(x):
+            calls.append(x)
+            return 2 * x
+
+        tree = build_tree(shunting_yard('f(x) + f(x) * f(x) - f(f(x))', variable='x'), variables=('x',), functions={'f': (1, traced)})
+        self.assertEqual(tree.evaluate(x=1), 2)
+        self.assertListEqual(calls, [1, 2])
+
+    def test_impure_functions(self):
+        values = iter(range(10))
+        functions = {'next': (0, lambda:next(values))}
+        self.assertEqual(build_tree('next next -', functions=functions).evaluate(), 0)
+        tree = build_tree('next next -', functions=functions, impure=('next',))
+        self.assertEqual(len(tree), 3)
+        self.assertEqual(tree.evaluate(), -1)
+
+    def test_same_results(self):
+        random.seed(1)
+        for _ in range(100):
+            expression = ''.join(random.choice(['x', 'y', '2', 'sin(x)', '(x+y)']) + random.choice('+-*') for _ in range(8)) + 'x'
+            rpn = shunting_yard(expression, variable=('x', 'y'))
+            tree = build_tree(rpn, variables=('x', 'y'))
+            self.assertLessEqual(len(tree), len(rpn.split()))
+            self.assertAlmostEqual(tree.evaluate(x=0.5, y=3), compute_rpn(rpn, variables={'x': 0.5, 'y': 3}), msg=expression)
+
+    def test_large_generated_expression(self):
+        # The same terms repeated many times only create their nodes once
+        expression = ' + '.join(f'sin({i % 10} * x)' for i in range(10000))
+        tree = build_tree(shunting_yard(expression, variable='x'), variables=('x',))
+        self.assertEqual(len(tree), 1 + 10 + 10 + 10 + 9999)
+        self.assertAlmostEqual(tree.evaluate(x=1), compute_rpn(shunting_yard(expression, variable='x'), variables={'x': 1}))
+
+    def test_builder(self):
+        builder = TreeBuilder()
+        first = builder.add('x 2 * 1 +', ('x',))
+        second = builder.add('x 2 * 3 -', ('x',))
+        self.assertIs(first.children[0], second.children[0])
+        self.assertEqual(len(builder.nodes), 7)
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            build_tree('1 unknown')
+        with self.assertRaises(WrongExpressionError):
+            build_tree('1 +')
+        with self.assertRaises(WrongExpressionError):
+            build_tree('1 2')
+        with self.assertRaises(ValueError):
+            build_tree('x 1 +', variables=('x',)).evaluate()
+
+
+def reactive(expression, functions=None, **values):
+    return build_tree(shunting_yard(expression, variable=tuple(values), functions=functions), tuple(values), functions).reactive(**values)
+
+
+class TestReactiveExpression(unittest.TestCase):
+
+    def test_value(self):
+        expression = reactive('sin(x) * 2 + y', x=0, y=1)
+        self.assertIsInstance(expression, ReactiveExpression)
+        self.assertEqual(expression.value, 1.0)
+        self.assertEqual(expression.recomputed, 6)
+        self.assertEqual(expression.variables, {'x': 0, 'y': 1})
+
+    def test_update_recomputes_path(self):
+        expression = reactive('(a + b) * (c + d) + sqrt(e)', a=1, b=2, c=3, d=4, e=16)
+        self.assertEqual(expression.update(c=5), 31.0)
+        # c + d, the product and the sum
+        self.assertEqual(expression.recomputed, 3)
+        self.assertEqual(expression.update(a=2, e=25), 41.0)
+        self.assertEqual(expression.recomputed, 4)
+        self.assertEqual(expression.variables['a'], 2)
+
+    def test_update_unchanged(self):
+        expression = reactive('abs(x) * 2 + y', x=1, y=1)
+        self.assertEqual(expression.update(x=1, z=3), 3)
+        self.assertEqual(expression.recomputed, 0)
+        # abs(-1) is still 1, so the nodes using it are not computed again
+        self.assertEqual(expression.update(x=-1), 3)
+        self.assertEqual(expression.recomputed, 1)
+        self.assertEqual(expression.update(x=1.0), 3.0)
+        self.assertEqual(expression.recomputed, 3)
+
+    def test_signed_zero(self):
+        expression = reactive('sign(x)', {'sign': (1, lambda x: math.copysign(1, x))}, x=0.0)
+        self.assertEqual(expression.value, 1.0)
+        self.assertEqual(expression.update(x=-0.0), -1.0)
+
+    def test_failed_update(self):
+        # A failed update changes nothing, so the next updates are computed from the previous values
+        expression = reactive('1/x + y', x=1, y=0)
+        with self.assertRaises(ZeroDivisionError):
+            expression.update(x=0)
+        self.assertEqual(expression.value, 1.0)
+        self.assertEqual(expression.variables, {'x': 1, 'y': 0})
+        with self.assertRaises(ZeroDivisionError):
+            expression.update(x=0)
+        self.assertEqual(expression.update(y=5), 6.0)
+        self.assertEqual(expression.update(x=2), 5.5)
+
+    def test_impure(self):
+        calls = []
+
+        def counter():
+            calls.append(None)
+            return len(calls)
+
+        functions = BUILTIN_FUNCTIONS.overlay({'counter': (0, counter)}, impure=('counter',))
+        expression = reactive('counter + x * 2', functions, x=1)
+        self.assertEqual(expression.value, 3)
+        self.assertEqual(expression.update(), 4)
+        self.assertEqual(expression.recomputed, 2)
+
+    def test_same_as_compute(self):
+        random.seed(0)
+        expression = reactive('x^2 + max(x, y) * sin(y) - x / (y + 3)', x=1, y=2)
+        for _ in range(20):
+            values = {name: random.uniform(-2, 2) for name in random.sample(['x', 'y'], random.randint(1, 2))}
+            self.assertAlmostEqual(expression.update(**values), compute('x^2 + max(x, y) * sin(y) - x / (y + 3)', variables=expression.variables))
+
+    def test_missing_variable(self):
+        with self.assertRaises(ValueError):
+            build_tree('x 1 +', variables=('x',)).reactive()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import random
+import unittest
+
+from shunting_yard import compute, Problem, validate, VARIADIC
+
+
+class TestValidate(unittest.TestCase):
+
+    def test_valid(self):
+        for expression in ('1 + 2 * 3', '2x + sin(x)^2', 'max(1, 2, 3) + sum()', 'pi * 2 + e()', '-2^3 + 1e5', '(1 + 2)(3 - x)', 'min4(1; 2; 3; 4)'):
+            self.assertEqual(validate(expression, variable='x'), [], expression)
+
+    def test_all_problems(self):
+        self.assertEqual(validate('max(1, 2) + sin(1, 2) * foo(3'), [
+            Problem(12, "Wrong number of parameters for function 'sin' : 2 given, 1 expected."),
+            Problem(24, 'Unknown function : foo'),
+            Problem(27, 'Bracket not closed.'),
+        ])
+
+    def test_brackets(self):
+        self.assertEqual(validate(')1 + 2'), [Problem(0, 'Closing bracket without opening bracket.')])
+        self.assertEqual(validate('1, 2'), [Problem(1, 'Separator outside of brackets.'), Problem(3, 'Expression does not give only one result.')])
+        self.assertEqual(validate('((1 + 2)'), [Problem(0, 'Bracket not closed.')])
+        self.assertEqual(validate('()'), [Problem(0, 'Expression does not give any result.')])
+
+    def test_parameters(self):
+        self.assertEqual(validate('1 +'), [Problem(2, "Not enough parameters for function '+' : 1 found, 2 expected.")])
+        self.assertEqual(validate('2 * (1, 2)'), [Problem(2, 'Expression does not give only one result.')])
+        self.assertEqual(validate('sqrt(1) * sqrt()'), [Problem(10, "Wrong number of parameters for function 'sqrt' : 0 given, 1 expected.")])
+
+    def test_tokens(self):
+        self.assertEqual(validate('1.2.3 + 4 # 2'), [Problem(0, 'Invalid number : 1.2.3'), Problem(10, "Unexpected character : '#'")])
+        self.assertEqual(validate(''), [Problem(0, 'Empty expression.')])
+        self.assertEqual(validate('X + y', variable='x'), [Problem(0, 'Unknown function : X'), Problem(4, 'Unknown function : y')])
+        self.assertEqual(validate('X + Y', case_sensitive=False, variable=('x', 'y')), [])
+
+    def test_never_calls_functions(self):
+        def fail(*parameters):
+            raise AssertionError('called')
+
+        functions = {'f': (2, fail), 'g': (VARIADIC, fail), 'sin': (1, fail)}
+        self.assertEqual(validate('f(1, g(2, 3, 4)) + sin(g())', functions=functions), [])
+        self.assertEqual(validate('f(1)', functions=functions), [Problem(0, "Wrong number of parameters for function 'f' : 1 given, 2 expected.")])
+
+    def test_same_as_compute(self):
+        # The expressions without problems are computed without errors, except the ones raised by the functions themselves, which validate
+        # cannot predict : divisions by zero and math domain errors
+        random.seed(0)
+        parts = ['1', '2', '0.5', 'x', '+', '-', '*', '/', '(', ')', ',', 'sin', 'sqrt', 'max', 'pi', 'foo', ' ']
+        computed = 0
+        for _ in range(2000):
+            expression = ''.join(random.choice(parts) for _ in range(random.randint(1, 8)))
+            if not validate(expression, variable='x'):
+                try:
+                    compute(expression, variables={'x': 1.5})
+                    computed += 1
+                except ZeroDivisionError:
+                    pass
+                except ValueError as error:
+                    if str(error) != 'math domain error':
+                        self.fail(f'{expression!r} : {error!r}')
+                except Exception as error:
+                    self.fail(f'{expression!r} : {error!r}')
+        self.assertGreater(computed, 50)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import math
+import unittest
+
+from shunting_yard import compile, compute_rpn_array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+@unittest.skipIf(np is None, 'NumPy is not installed')
+class TestVectorizedEvaluation(unittest.TestCase):
+
+    def test_base_operators(self):
+        x = np.array([1.0, 2.0, 4.0])
+        np.testing.assert_allclose(compute_rpn_array('x 1 +', {'x': x}), [2, 3, 5])
+        np.testing.assert_allclose(compute_rpn_array('x 1 -', {'x': x}), [0, 1, 3])
+        np.testing.assert_allclose(compute_rpn_array('x 2 *', {'x': x}), [2, 4, 8])
+        np.testing.assert_allclose(compute_rpn_array('x 2 /', {'x': x}), [0.5, 1, 2])
+        np.testing.assert_allclose(compute_rpn_array('x 2 ^', {'x': x}), [1, 4, 16])
+        np.testing.assert_allclose(compute_rpn_array('x -u', {'x': x}), [-1, -2, -4])
+
+    def test_integer_negative_power(self):
+        np.testing.assert_allclose(compute_rpn_array('x 0 1 - ^', {'x': [1, 2, 4]}), [1, 0.5, 0.25])
+
+    def test_functions(self):
+        x = np.array([0.0, math.pi / 2])
+        np.testing.assert_allclose(compute_rpn_array('x sin', {'x': x}), [0, 1], atol=1e-12)
+        np.testing.assert_allclose(compute_rpn_array('x cos abs', {'x': x}), [1, 0], atol=1e-12)
+        np.testing.assert_allclose(compute_rpn_array('x x * sqrt', {'x': x}), x)
+        np.testing.assert_allclose(compute_rpn_array('x pi +', {'x': x}), x + math.pi)
+
+    def test_min_max(self):
+        x = np.array([1, 5, 3])
+        y = np.array([4, 2, 3])
+        np.testing.assert_array_equal(compute_rpn_array('x y min', {'x': x, 'y': y}), [1, 2, 3])
+        np.testing.assert_array_equal(compute_rpn_array('x y max', {'x': x, 'y': y}), [4, 5, 3])
+        np.testing.assert_array_equal(compute_rpn_array('x y 2 max3', {'x': x, 'y': y}), [4, 5, 3])
+        np.testing.assert_array_equal(compute_rpn_array('x y 2 0 min4', {'x': x, 'y': y}), [0, 0, 0])
+        np.testing.assert_array_equal(compute_rpn_array('x y 2 max@3', {'x': x, 'y': y}), [4, 5, 3])
+        np.testing.assert_array_equal(compute_rpn_array('x min@1', {'x': x}), x)
+        np.testing.assert_array_equal(compute_rpn_array('x y 1 sum@3', {'x': x, 'y': y}), [6, 8, 7])
+        np.testing.assert_allclose(compute_rpn_array('x y mean', {'x': x, 'y': y}), [2.5, 3.5, 3])
+
+    def test_buffer_and_list_inputs(self):
+        np.testing.assert_allclose(compute_rpn_array('x 2 *', {'x': [1, 2]}), [2, 4])
+        np.testing.assert_allclose(compute_rpn_array('x 2 *', {'x': memoryview(np.array([1.0, 2.0]))}), [2, 4])
+
+    def test_scalar_fallback(self):
+        result = compute_rpn_array('x inc', {'x': [1, 2, 3]}, {'inc': (1, lambda x:x + 1 if x > 1 else 0)})
+        np.testing.assert_allclose(result, [0, 3, 4])
+
+    def test_ufunc_additional_function(self):
+        np.testing.assert_allclose(compute_rpn_array('x exp', {'x': [0, 1]}, {'exp': (1, np.exp)}), [1, math.e])
+
+    def test_compiled_expression(self):
+        expr = compile('2x + sin(y)', variables=('x', 'y'))
+        np.testing.assert_allclose(expr.evaluate_array(x=[1, 2], y=[0, 0]), [2, 4])
+        self.assertEqual(expr.evaluate(x=1, y=0), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()